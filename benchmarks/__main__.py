@@ -0,0 +1,59 @@
+# Copyright (C) 2023, Steven Cooper
+#
+# This file is part of Jiig.
+#
+# Jiig is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Jiig is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Jiig.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Run performance benchmarks.
+
+Usage:
+    python -m benchmarks [NAME ...]
+
+Run from the repository root. Runs all benchmarks if no names are given.
+
+Benchmarks compare current implementations against copies of the ones they
+replaced. Timings are only displayed, not checked, because they depend on the
+machine and its load. They are kept out of the unit tests for the same reason,
+and because they take a while.
+"""
+
+import importlib
+import sys
+
+BENCHMARK_NAMES = [
+    'cli_parser',
+    'field_conversion',
+    'adapter_caching',
+    'context',
+    'expansion',
+    'attribute_dictionary',
+    'configuration',
+]
+
+
+def main():
+    """Benchmark runner main."""
+    names = sys.argv[1:] or BENCHMARK_NAMES
+    bad_names = [name for name in names if name not in BENCHMARK_NAMES]
+    if bad_names:
+        sys.stderr.write(f'Unknown benchmarks: {" ".join(bad_names)}\n'
+                         f'Available benchmarks: {" ".join(BENCHMARK_NAMES)}\n')
+        sys.exit(2)
+    for name in names:
+        print(f'== {name}')
+        importlib.import_module(f'benchmarks.{name}').main()
+
+
+if __name__ == '__main__':
+    main()
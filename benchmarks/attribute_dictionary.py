@@ -0,0 +1,81 @@
+# Copyright (C) 2023, Steven Cooper
+#
+# This file is part of Jiig.
+#
+# Jiig is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Jiig is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Jiig.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Nested configuration access benchmark: kept vs. copied sub-dictionaries."""
+
+import time
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from jiig.util.configuration import load_configuration
+
+# Configuration depth, settings per table and nested attribute accesses.
+NESTING_DEPTH = 8
+TABLE_WIDTH = 20
+ACCESS_COUNT = 100000
+
+
+class _CopyingDictionary(dict):
+    # Emulates the old behavior of copying sub-dictionaries on every access.
+
+    def __getattr__(self, name):
+        value = self[name]
+        if isinstance(value, dict):
+            sub_dict = _CopyingDictionary(value)
+            parent_key_stack = getattr(value, '__key_stack__', [])
+            object.__setattr__(sub_dict, '__key_stack__', parent_key_stack + [name])
+            return sub_dict
+        return value
+
+
+def _write_nested_toml(path: Path, depth: int):
+    # Each level also has some scalar settings to make copies realistic.
+    lines: list[str] = []
+    for level in range(depth):
+        lines.append(f'[{".".join(f"level{idx}" for idx in range(level + 1))}]')
+        lines.extend(f'setting{idx} = {idx}' for idx in range(TABLE_WIDTH))
+    lines.append('value = 42')
+    path.write_text('\n'.join(lines), encoding='utf-8')
+
+
+def _access(root: dict, names: list[str]) -> float:
+    start_time = time.perf_counter()
+    for _idx in range(ACCESS_COUNT // len(names)):
+        value = root
+        for name in names:
+            value = getattr(value, name)
+        assert value.value == 42
+    return time.perf_counter() - start_time
+
+
+def main():
+    """Run benchmark and display results."""
+    with TemporaryDirectory() as temporary_folder:
+        config_path = Path(temporary_folder) / 'config.toml'
+        _write_nested_toml(config_path, NESTING_DEPTH)
+        config = load_configuration(config_path)
+        copying_config = _CopyingDictionary(load_configuration(config_path))
+    names = [f'level{level}' for level in range(NESTING_DEPTH)]
+    copying_elapsed = _access(copying_config, names)
+    cached_elapsed = _access(config, names)
+    print(f'{ACCESS_COUNT} nested attribute accesses at depth {NESTING_DEPTH}:')
+    print(f'  copying: {copying_elapsed * 1000:.1f} ms')
+    print(f'  cached: {cached_elapsed * 1000:.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+# Copyright (C) 2023, Steven Cooper
+#
+# This file is part of Jiig.
+#
+# Jiig is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Jiig is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Jiig.  If not, see <https://www.gnu.org/licenses/>.
+
+"""CLI parser benchmark: full vs. lazy and fresh vs. reused parsers."""
+
+import time
+
+from jiig.driver.cli.cli_parser import Parser
+from jiig.driver.cli.cli_types import (
+    CLICommand,
+    CLIOptionArgument,
+    CLIPositionalArgument,
+)
+from jiig.util.repetition import Repetition
+
+# Synthetic tree size is GROUP_COUNT * COMMANDS_PER_GROUP.
+GROUP_COUNT = 40
+COMMANDS_PER_GROUP = 50
+
+
+def _make_root_command(group_count: int, commands_per_group: int) -> CLICommand:
+    root_command = CLICommand('tool', 'tool', 0)
+    root_command.options.append(CLIOptionArgument('verbose', 'verbose', ['-v'], is_boolean=True))
+    for group_idx in range(group_count):
+        group_command = CLICommand(f'group{group_idx}', f'group {group_idx}', 0)
+        root_command.sub_commands.append(group_command)
+        for command_idx in range(commands_per_group):
+            command = CLICommand(f'command{command_idx}', f'command {command_idx}', 0)
+            command.options.append(CLIOptionArgument('count', 'count', ['-c', '--count']))
+            command.options.append(CLIOptionArgument('force', 'force', ['-f'], is_boolean=True))
+            command.positionals.append(CLIPositionalArgument('items', 'items', repeat=Repetition(1, None)))
+            group_command.sub_commands.append(command)
+    return root_command
+
+
+def _parse(parser: Parser, root_command: CLICommand, arguments: list[str]):
+    return parser.parse(arguments, 'tool', 'tool', root_command, raise_exceptions=True)
+
+
+def main():
+    """Run benchmark and display results."""
+    root_command = _make_root_command(GROUP_COUNT, COMMANDS_PER_GROUP)
+    arguments = ['-v', f'group{GROUP_COUNT - 1}', f'command{COMMANDS_PER_GROUP - 1}', '-c', '3', 'a']
+    timings: dict[str, float] = {}
+    for label, parser in (('full', Parser('TASK')), ('lazy', Parser('TASK', lazy=True))):
+        start_time = time.perf_counter()
+        _parse(parser, root_command, arguments)
+        timings[label] = time.perf_counter() - start_time
+    for label, parser in (('full (reused)', Parser('TASK')), ('lazy (reused)', Parser('TASK', lazy=True))):
+        _parse(parser, root_command, arguments)
+        start_time = time.perf_counter()
+        _parse(parser, root_command, arguments)
+        timings[label] = time.perf_counter() - start_time
+    print(f'Parse time for {GROUP_COUNT * COMMANDS_PER_GROUP} commands:')
+    for label, timing in timings.items():
+        print(f'  {label}: {timing * 1000:.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
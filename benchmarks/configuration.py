@@ -0,0 +1,68 @@
+# Copyright (C) 2023, Steven Cooper
+#
+# This file is part of Jiig.
+#
+# Jiig is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Jiig is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Jiig.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Dotted configuration name lookup benchmark: snapshot vs. splitting."""
+
+import time
+
+from jiig.util.configuration import ConfigurationSnapshot
+
+# Number of dotted name lookups.
+LOOKUP_COUNT = 200000
+
+
+def _get_by_splitting(raw_data: dict, name: str):
+    # The old dotted name lookup, which split and walked the name every time.
+    name_parts = name.split('.')
+    for name_part in name_parts[:-1]:
+        if name_part not in raw_data:
+            return None
+        raw_data = raw_data[name_part]
+        if not isinstance(raw_data, dict):
+            return None
+    return raw_data.get(name_parts[-1])
+
+
+def main():
+    """Run benchmark and display results."""
+    data = {
+        'tool': {f'setting{idx}': idx for idx in range(20)},
+        'options': {f'enable_option{idx}': True for idx in range(20)},
+    }
+    data['tool']['nested'] = {'deeper': {'deepest': {'value': 42}}}
+    names = ([f'tool.setting{idx}' for idx in range(20)]
+             + [f'options.enable_option{idx}' for idx in range(20)]
+             + ['tool.nested.deeper.deepest.value', 'options.missing'])
+    config = ConfigurationSnapshot(data)
+    repeat_count = LOOKUP_COUNT // len(names)
+    start_time = time.perf_counter()
+    for _idx in range(repeat_count):
+        for name in names:
+            _get_by_splitting(data, name)
+    splitting_elapsed = time.perf_counter() - start_time
+    start_time = time.perf_counter()
+    for _idx in range(repeat_count):
+        for name in names:
+            config.get(name)
+    snapshot_elapsed = time.perf_counter() - start_time
+    print(f'{repeat_count * len(names)} dotted name lookups:')
+    print(f'  splitting: {splitting_elapsed * 1000:.1f} ms')
+    print(f'  snapshot: {snapshot_elapsed * 1000:.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
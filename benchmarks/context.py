@@ -0,0 +1,54 @@
+# Copyright (C) 2023, Steven Cooper
+#
+# This file is part of Jiig.
+#
+# Jiig is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Jiig is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Jiig.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Nested sub-context creation benchmark: chained vs. copied symbols."""
+
+import time
+
+from jiig.context import Context
+from jiig.util.collections import AttributeDictionary
+
+# Benchmark sizes. Copying is much slower, so it uses fewer contexts.
+SYMBOL_COUNT = 300
+CONTEXT_COUNT = 100000
+COPY_CONTEXT_COUNT = 5000
+
+
+def main():
+    """Run benchmark and display results."""
+    root = Context(None)
+    root.copy_symbols(**{f'symbol{idx}': f'value{idx}' for idx in range(SYMBOL_COUNT)})
+    # Previous implementation, which copied parent symbols.
+    symbols = root.s
+    start_time = time.perf_counter()
+    for _idx in range(COPY_CONTEXT_COUNT):
+        parent_symbols = symbols
+        symbols = AttributeDictionary.new(no_defaults=True)
+        symbols.update(parent_symbols)
+    copy_time = (time.perf_counter() - start_time) / COPY_CONTEXT_COUNT
+    context = root
+    start_time = time.perf_counter()
+    for _idx in range(CONTEXT_COUNT):
+        context = context.context()
+    chain_time = (time.perf_counter() - start_time) / CONTEXT_COUNT
+    print(f'Nested sub-context creation with {SYMBOL_COUNT} symbols:')
+    print(f'  copy: {copy_time * 1000000:.2f} us')
+    print(f'  chain: {chain_time * 1000000:.2f} us ({CONTEXT_COUNT} contexts in {chain_time * CONTEXT_COUNT:.2f} s)')
+
+
+if __name__ == '__main__':
+    main()
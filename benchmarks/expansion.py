@@ -0,0 +1,49 @@
+# Copyright (C) 2023, Steven Cooper
+#
+# This file is part of Jiig.
+#
+# Jiig is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Jiig is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Jiig.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Text expansion benchmark: compiled templates vs. str.format()."""
+
+import time
+
+from jiig.util.text.expansion import format_template
+
+EXPANSION_COUNT = 1000000
+TEMPLATE = '{source_folder}/{name} -> {target_folder}/{name}.{suffix} ({tool_name} {version})'
+
+
+def main():
+    """Run benchmark and display results."""
+    symbols = {f'symbol{idx}': f'value{idx}' for idx in range(30)}
+    symbols.update(source_folder='/source', target_folder='/target', name='file',
+                   suffix='bak', tool_name='tool', version='1.0')
+    timings: dict[str, float] = {}
+    # Previous implementation, which splatted the symbols as keyword arguments.
+    start_time = time.perf_counter()
+    for _idx in range(EXPANSION_COUNT):
+        TEMPLATE.format(**symbols)
+    timings['format'] = time.perf_counter() - start_time
+    start_time = time.perf_counter()
+    for _idx in range(EXPANSION_COUNT):
+        format_template(TEMPLATE, symbols)
+    timings['compiled'] = time.perf_counter() - start_time
+    print(f'Expansion time for {EXPANSION_COUNT} templates:')
+    for label, timing in timings.items():
+        print(f'  {label}: {timing:.2f} s')
+
+
+if __name__ == '__main__':
+    main()
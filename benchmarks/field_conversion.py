@@ -0,0 +1,150 @@
+# Copyright (C) 2023, Steven Cooper
+#
+# This file is part of Jiig.
+#
+# Jiig is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Jiig is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Jiig.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Argument preparation benchmark: compiled converters vs. the original code."""
+
+import timeit
+from argparse import Namespace
+
+from jiig.adapters import num_limit, path_expand_user, to_int
+from jiig.internal.execution import _ArgumentDataPreparer
+from jiig.task import RuntimeTask
+from jiig.types import TaskField
+from jiig.util.default import DefaultValue
+from jiig.util.exceptions import format_exception
+from jiig.util.options import OPTIONS
+from jiig.util.repetition import Repetition
+
+# Benchmark size is FIELD_COUNT fields with VALUE_COUNT values each.
+FIELD_COUNT = 20
+VALUE_COUNT = 5000
+# Timings are the best of REPEAT_COUNT runs.
+REPEAT_COUNT = 5
+
+
+def _make_task(field_count: int) -> RuntimeTask:
+    fields: list[TaskField] = []
+    for field_idx in range(field_count):
+        if field_idx % 4 == 0:
+            adapters = [to_int, num_limit(0, None)]
+        elif field_idx % 4 == 1:
+            adapters = [path_expand_user]
+        elif field_idx % 4 == 2:
+            adapters = [int, str]
+        else:
+            adapters = None
+        fields.append(TaskField(f'field{field_idx}', 'field', str, list, None,
+                                Repetition(None, None), None, adapters))
+    fields.append(TaskField('count', 'count', int, int, DefaultValue(3), None, None, [to_int]))
+    fields.append(TaskField('name', 'name', str, str, None, None, None, None))
+    return RuntimeTask('task', 'task', 0, 'task', fields=fields)
+
+
+def _make_data(field_count: int, value_count: int) -> Namespace:
+    data = Namespace(COUNT=None, name='x')
+    for field_idx in range(field_count):
+        setattr(data, f'FIELD{field_idx}', [str(value_idx) for value_idx in range(value_count)])
+    return data
+
+
+class _BaselineArgumentDataPreparer:
+    # Copy of the argument preparation used before converters were compiled.
+
+    def __init__(self, raw_data: object):
+        self.raw_data = raw_data
+        self.prepared_data = {}
+        self.errors: list[str] = []
+
+    def prepare_argument_data(self, task: RuntimeTask):
+        # Convert raw argument data to prepared data.
+        # Handle lower and upper case attribute names in raw data.
+        for registered_field in task.fields:
+            value = None
+            has_attribute = hasattr(self.raw_data, registered_field.name)
+            if has_attribute:
+                value = getattr(self.raw_data, registered_field.name)
+            else:
+                dest_name = registered_field.name.upper()
+                has_attribute = hasattr(self.raw_data, dest_name)
+                if has_attribute:
+                    value = getattr(self.raw_data, dest_name)
+            if has_attribute:
+                adapter_name = '???'
+                try:
+                    # Call all adapters to validate and convert as appropriate.
+                    if value is not None:
+                        if registered_field.adapters is not None:
+                            for adapter in registered_field.adapters:
+                                adapter_name = adapter.__name__
+                                if registered_field.repeat is not None:
+                                    value = [adapter(value_item) for value_item in value]
+                                else:
+                                    value = adapter(value)
+                    else:
+                        if registered_field.default is not None:
+                            value = registered_field.default.value
+                        else:
+                            value = None
+                    self.prepared_data[registered_field.name] = value
+                except (TypeError, ValueError) as exc:
+                    arg_name = registered_field.name.upper()
+                    if OPTIONS.debug:
+                        label = ':'.join(
+                            [
+                                task.full_name,
+                                arg_name,
+                                f'adapter={adapter_name}',
+                            ],
+                        )
+                        error = format_exception(exc, label=label, skip_frame_count=1)
+                        self.errors.append(error)
+                    else:
+                        self.errors.append(f'{arg_name}: {str(exc)}')
+
+
+def _prepare_baseline(task: RuntimeTask, raw_data: object) -> _BaselineArgumentDataPreparer:
+    preparer = _BaselineArgumentDataPreparer(raw_data)
+    preparer.prepare_argument_data(task)
+    return preparer
+
+
+def _prepare(task: RuntimeTask, raw_data: object) -> _ArgumentDataPreparer:
+    preparer = _ArgumentDataPreparer(raw_data)
+    preparer.prepare_argument_data(task)
+    return preparer
+
+
+def main():
+    """Run benchmark and display results."""
+    print('Argument preparation:')
+    for field_count, value_count in ((FIELD_COUNT, VALUE_COUNT), (FIELD_COUNT * 50, 1)):
+        task = _make_task(field_count)
+        raw_data = _make_data(field_count, value_count)
+        # Compile converters up front, as for a previously-executed task.
+        _prepare(task, raw_data)
+        assert _prepare(task, raw_data).prepared_data == _prepare_baseline(task, raw_data).prepared_data
+        baseline_time = min(timeit.repeat(lambda: _prepare_baseline(task, raw_data),
+                                          number=1, repeat=REPEAT_COUNT))
+        compiled_time = min(timeit.repeat(lambda: _prepare(task, raw_data),
+                                          number=1, repeat=REPEAT_COUNT))
+        print(f'  {field_count} fields x {value_count} values:'
+              f' baseline={baseline_time * 1000:.2f} ms'
+              f' compiled={compiled_time * 1000:.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
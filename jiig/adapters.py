@@ -25,10 +25,85 @@ import binascii
 import os
 from pathlib import Path
 from time import mktime
-from typing import Any
+from typing import Any, Callable, Sequence
 
 from .types import ArgumentAdapter
 from .util.date_time import parse_date_time, parse_time_interval, apply_date_time_delta_string
+from .util.filesystem import check_paths
+
+# Function attributes for adapter declarations.
+_CACHEABLE_ATTRIBUTE = '_jiig_cacheable'
+_BATCH_ADAPTER_ATTRIBUTE = '_jiig_batch_adapter'
+
+
+def cacheable(adapter: ArgumentAdapter) -> ArgumentAdapter:
+    """Adapter decorator that declares results reusable for equal values.
+
+    Results for repeated string or path values are cached during argument
+    preparation. Only use for adapters that return the same result for the
+    same value during a command invocation, and that cost more than a
+    dictionary lookup, e.g. because they access the file system or do heavy
+    parsing. Caching cheap adapters, e.g. simple string manipulation, is
+    slower than calling them.
+
+    Args:
+        adapter: adapter function
+
+    Returns:
+        unchanged adapter function
+    """
+    setattr(adapter, _CACHEABLE_ATTRIBUTE, True)
+    return adapter
+
+
+def batched(batch_adapter: Callable[[Sequence], list]) -> Callable[[ArgumentAdapter], ArgumentAdapter]:
+    """Adapter decorator factory that declares a batch variant for repeated values.
+
+    The batch variant receives all values for a repeated field and must
+    return the same results and raise the same exceptions as calling the
+    adapter for each value.
+
+    Args:
+        batch_adapter: function that adapts a value list
+
+    Returns:
+        adapter decorator
+    """
+    def _batched_inner(adapter: ArgumentAdapter) -> ArgumentAdapter:
+        setattr(adapter, _BATCH_ADAPTER_ATTRIBUTE, batch_adapter)
+        return adapter
+    return _batched_inner
+
+
+def is_cacheable(adapter: ArgumentAdapter) -> bool:
+    """Check if an adapter was declared cacheable.
+
+    Args:
+        adapter: adapter function
+
+    Returns:
+        True if adapter results may be cached
+    """
+    return getattr(adapter, _CACHEABLE_ATTRIBUTE, False)
+
+
+def get_batch_adapter(adapter: ArgumentAdapter) -> Callable[[Sequence], list] | None:
+    """Get the batch variant declared for an adapter.
+
+    Args:
+        adapter: adapter function
+
+    Returns:
+        batch adapter function or None if there is none
+    """
+    return getattr(adapter, _BATCH_ADAPTER_ATTRIBUTE, None)
+
+
+def _check_paths(values: Sequence[str | Path], check: str, error_format: str) -> list:
+    for value, result in zip(values, check_paths([str(value) for value in values], check)):
+        if not result:
+            raise ValueError(error_format.format(value=value))
+    return list(values)
 
 
 def b64_decode(value: str) -> str:
@@ -106,6 +181,44 @@ def num_limit(minimum: float | None,
     return _number_range_inner
 
 
+def paths_exist(values: Sequence[str | Path]) -> list:
+    """Batch variant of path_exists() with one folder listing per parent folder.
+
+    Args:
+        values: file or folder paths
+
+    Returns:
+        unchanged paths
+    """
+    return _check_paths(values, 'exists', 'path "{value}" does not exist')
+
+
+def paths_are_files(values: Sequence[str | Path]) -> list:
+    """Batch variant of path_is_file() with one folder listing per parent folder.
+
+    Args:
+        values: path strings
+
+    Returns:
+        unchanged paths
+    """
+    return _check_paths(values, 'file', '"{value}" is not a file')
+
+
+def paths_are_folders(values: Sequence[str | Path]) -> list:
+    """Batch variant of path_is_folder() with one folder listing per parent folder.
+
+    Args:
+        values: path strings
+
+    Returns:
+        unchanged paths
+    """
+    return _check_paths(values, 'folder', '"{value}" is not a folder')
+
+
+@cacheable
+@batched(paths_exist)
 def path_exists(value: str | Path) -> str:
     """Adapter that checks if a path exists.
 
@@ -149,6 +262,8 @@ def path_expand_environment(value: str | Path) -> str | Path:
     return expanded
 
 
+@cacheable
+@batched(paths_are_files)
 def path_is_file(value: str | Path) -> str | Path:
     """Adapter that checks if a path is a file.
 
@@ -163,6 +278,8 @@ def path_is_file(value: str | Path) -> str | Path:
     return value
 
 
+@cacheable
+@batched(paths_are_folders)
 def path_is_folder(value: str | Path) -> str | Path:
     """Adapter that checks if a path is a folder.
 
@@ -278,6 +395,7 @@ def to_interval(value: str) -> int:
     return parse_time_interval(value)
 
 
+@cacheable
 def to_timestamp(value: str) -> float:
     """Adapter for string to timestamp float conversion.
 
@@ -43,10 +43,38 @@ CLI_OPTIONS_VERBOSE = ['-v', '--verbose']
 CLI_OPTIONS_PAUSE = ['--pause']
 #: Jiig debug command line option.
 CLI_OPTION_KEEP_FILES = ['--keep-files']
+#: Parallel jobs command line options.
+CLI_OPTIONS_JOBS = ['--jobs']
+#: Chrome trace event output command line options.
+CLI_OPTIONS_TRACE = ['--trace']
+#: Startup profiling command line options.
+CLI_OPTIONS_PROFILE_STARTUP = ['--profile-startup']
+#: Environment variable that enables startup profiling.
+PROFILE_STARTUP_ENV_VAR = 'JIIG_PROFILE_STARTUP'
+#: Environment variable with a path for saving startup profiling JSON results.
+PROFILE_STARTUP_JSON_ENV_VAR = 'JIIG_PROFILE_STARTUP_JSON'
+#: Environment variable with comma-separated startup phases to capture with cProfile.
+PROFILE_STARTUP_PHASES_ENV_VAR = 'JIIG_PROFILE_STARTUP_PHASES'
+#: Environment variable that runs a tool as a warm worker (zygote) server.
+ZYGOTE_SERVE_ENV_VAR = 'JIIG_ZYGOTE_SERVE'
+#: Folder name under the Jiig configuration root for zygote server sockets.
+ZYGOTE_FOLDER_NAME = 'zygote'
+#: Seconds without requests before a zygote server exits.
+ZYGOTE_IDLE_TIMEOUT = 3600
+#: Maximum cached pre-parsed text expansion templates.
+FORMAT_TEMPLATE_CACHE_SIZE = 1024
+#: Folder name under the tool build folder for task result cache entries.
+TASK_CACHE_FOLDER_NAME = 'task_cache'
+#: Maximum task result cache entries kept, with least-recently-used entries pruned first.
+TASK_CACHE_MAXIMUM_ENTRIES = 500
 #: Aliases catalog file name.
 ALIASES_CATALOG_FILE_NAME = 'aliases.json'
 #: Parameters catalog file name.
 PARAMS_CATALOG_FILE_NAME = 'params.json'
+#: Compiled task tree manifest file name.
+TASKS_MANIFEST_FILE_NAME = 'tasks_manifest.json'
+#: Folder name under the tool configuration folder for command history.
+HISTORY_FOLDER_NAME = 'history'
 #: Virtual environment folder name.
 VENV_FOLDER_NAME = 'venv'
 #: Default tool author string.
@@ -21,13 +21,15 @@ import os
 import sys
 from pathlib import Path
 from pprint import pformat
-from typing import Any, Iterable, Self
+from typing import Any, Callable, Iterable, Self
 
-from .util.collections import AttributeDictionary
+from .util.collections import AttributeChainMap
+from .util.concurrency import is_concurrent
 from .util.log import log_heading, log_warning, log_error, log_message, abort
 from .util.options import OPTIONS
 from .util.prompt import text_prompt, boolean_prompt
 from .util.text.blocks import trim_text_blocks
+from .util.text.expansion import format_template
 
 
 class Context:
@@ -35,6 +37,9 @@ class Context:
 
     Public data members:
     - s: Dictionary and attribute style access to expansion symbols.
+
+    Sub-context symbols are layered over the parent symbols, rather than copied.
+    Symbols set in a sub-context are local to it.
     """
 
     def __init__(self, parent: Self | None, **symbols):
@@ -45,10 +50,9 @@ class Context:
             **symbols: initial symbols
         """
         if parent is not None:
-            self.s = AttributeDictionary.new(no_defaults=True)
-            self.copy_symbols(**parent.s)
+            self.s = parent.s.new_child()
         else:
-            self.s = AttributeDictionary.new(no_defaults=True)
+            self.s = AttributeChainMap()
         self.update(**symbols)
         # Give useful symbols for free, e.g. newline.
         if 'nl' not in self.s:
@@ -128,6 +132,24 @@ class Context:
         self.s.update(symbols)
         return self
 
+    def provide_symbols(self, **providers: Callable[[], Any]) -> Self:
+        """Register symbol providers that are called on first reference.
+
+        Provided values are not expanded. They are memoized for the lifetime
+        of this context and shared with its sub-contexts. This allows defining
+        expensive symbols, e.g. ones that run commands, that are only computed
+        if used.
+
+        This is chainable to allow use in the same `with` statement that creates
+        the context.
+
+        Args:
+            **providers: keyword symbol providers, callables accepting no arguments
+        """
+        for name, provider in providers.items():
+            self.s.provide(name, provider)
+        return self
+
     def format(self, text: str | list | tuple | None) -> str | list[str] | None:
         """Format text with context symbol expansion.
 
@@ -140,9 +162,9 @@ class Context:
         if text is None:
             return None
         if isinstance(text, (list, tuple)):
-            return [str(item).format(**self.s) for item in text]
+            return [format_template(str(item), self.s) for item in text]
         try:
-            return str(text).format(**self.s)
+            return format_template(str(text), self.s)
         except KeyError as key_error:
             if OPTIONS.debug:
                 sys.stderr.write(
@@ -150,7 +172,7 @@ class Context:
                         '====== text for expansion ======',
                         text,
                         '====== symbols for expansion ======',
-                        pformat(self.s, indent=2),
+                        pformat(dict(self.s), indent=2),
                         '======',
                         '',
                     ])
@@ -342,12 +364,19 @@ class ActionContext(Context):
         Original working folder is restored by the contextmanager wrapped around
         the sub_context creation.
 
+        Aborts while tasks run concurrently, e.g. for fan-out items, because the
+        working folder is shared by the whole process. Pass working folders to
+        run() or run_async() instead.
+
         Args:
             folder: new working folder
 
         Returns:
             previous working folder as pathlib.Path
         """
+        if is_concurrent():
+            abort('Working folder changes are not allowed while tasks run concurrently.',
+                  folder=folder)
         os.chdir(folder)
         self.working_folder_changed = True
         return Path(os.getcwd())
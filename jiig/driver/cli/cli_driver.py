@@ -24,7 +24,10 @@ from jiig.constants import (
     CLI_OPTIONS_DEBUG,
     CLI_OPTIONS_DRY_RUN,
     CLI_OPTION_KEEP_FILES,
+    CLI_OPTIONS_JOBS,
+    CLI_OPTIONS_TRACE,
     CLI_OPTIONS_PAUSE,
+    CLI_OPTIONS_PROFILE_STARTUP,
     CLI_OPTIONS_VERBOSE,
 )
 from jiig.task import (
@@ -94,6 +97,22 @@ CLI_GLOBAL_OPTIONS = [
         CLI_OPTION_KEEP_FILES,
         is_boolean=True,
     ),
+    CLIOptionArgument(
+        'jobs',
+        'maximum number of parallel jobs (default: based on CPU count)',
+        CLI_OPTIONS_JOBS,
+    ),
+    CLIOptionArgument(
+        'trace',
+        'write a Chrome trace event timeline to a file',
+        CLI_OPTIONS_TRACE,
+    ),
+    CLIOptionArgument(
+        'profile_startup',
+        'report startup phase timings and import counts',
+        CLI_OPTIONS_PROFILE_STARTUP,
+        is_boolean=True,
+    ),
 ]
 
 
@@ -118,7 +137,8 @@ class CLIDriver(Driver):
         super().__init__(name=name,
                          description=description,
                          options=options)
-        self.cli_parser = Parser(self.options.top_task_dest_name)
+        self.cli_parser = Parser(self.options.top_task_dest_name,
+                                 lazy=self.options.lazy_parsing)
         self.global_options = [
             global_option
             for global_option in CLI_GLOBAL_OPTIONS
@@ -128,6 +148,9 @@ class CLIDriver(Driver):
         self.trailing_by_task: dict[str, str] = {}
         self.options_by_task: dict[str, dict[str, list[str]]] = {}
         self.root_command: CLICommand | None = None
+        self.root_task: RuntimeTask | None = None
+        # Commands for unresolved (stub) tasks, with fields added on demand.
+        self.unpopulated_commands: dict[str, tuple[CLICommand, RuntimeTask]] = {}
 
     def on_initialize_driver(self,
                              command_line_arguments: Sequence[str],
@@ -158,6 +181,7 @@ class CLIDriver(Driver):
         Returns:
             preliminary app data
         """
+        self._populate_command_path(command_line_arguments)
         try:
             data, names, trailing_arguments = self.cli_parser.parse(
                 command_line_arguments,
@@ -186,14 +210,19 @@ class CLIDriver(Driver):
         Returns:
              driver application data
         """
-        self.root_command = CLICommand(root_task.name,
-                                       root_task.description,
-                                       root_task.visibility)
-        self._add_task_tree([], self.root_command, root_task)
-        option_names = [option.name for option in self.root_command.options]
-        for global_option in self.global_options:
-            if global_option.name not in option_names:
-                self.root_command.options.append(global_option)
+        # Keep the command tree, and with it the cached parsers, when running
+        # additional commands for the same task tree, e.g. in batch mode.
+        if self.root_command is None or root_task is not self.root_task:
+            self.root_task = root_task
+            self.root_command = CLICommand(root_task.name,
+                                           root_task.description,
+                                           root_task.visibility)
+            self._add_task_tree([], self.root_command, root_task)
+            option_names = [option.name for option in self.root_command.options]
+            for global_option in self.global_options:
+                if global_option.name not in option_names:
+                    self.root_command.options.append(global_option)
+        self._populate_command_path(arguments)
         data, names, additional_arguments = self.cli_parser.parse(
             arguments,
             self.name,
@@ -280,6 +309,29 @@ class CLIDriver(Driver):
             trailing_field = task.driver_hints.get(CLI_HINT_TRAILING)
             if trailing_field:
                 self.trailing_by_task[full_name] = trailing_field
+        # Defer adding fields for stub tasks to avoid importing task modules
+        # for commands that are not used.
+        if task.is_resolved('fields'):
+            self._add_task_fields(full_name, command, task)
+        else:
+            self.unpopulated_commands[full_name] = (command, task)
+        for sub_task in task.sub_tasks:
+            # Argparse help text is not used, so don't resolve stubs for it.
+            if sub_task.is_resolved('description'):
+                sub_description = sub_task.description
+            else:
+                sub_description = ''
+            sub_command = CLICommand(sub_task.name,
+                                     sub_description,
+                                     sub_task.visibility)
+            command.sub_commands.append(sub_command)
+            self._add_task_tree(names + [sub_task.name], sub_command, sub_task)
+
+    def _add_task_fields(self,
+                         full_name: str,
+                         command: CLICommand,
+                         task: RuntimeTask,
+                         ):
         option_names: set[str] = set()
         options_by_field = self.options_by_task.get(full_name, {})
         for field in task.fields:
@@ -309,9 +361,32 @@ class CLIDriver(Driver):
                         choices=field.choices,
                     )
                     command.positionals.append(positional)
-        for sub_task in task.sub_tasks:
-            sub_command = CLICommand(sub_task.name,
-                                     sub_task.description,
-                                     sub_task.visibility)
-            command.sub_commands.append(sub_command)
-            self._add_task_tree(names + [sub_task.name], sub_command, sub_task)
+
+    def _populate_command_path(self, arguments: Sequence[str]):
+        # Add fields for unpopulated commands on the command path identified by
+        # leading non-option arguments. Only global options, which are removed
+        # by pre-parsing, may precede or separate command names.
+        if not self.unpopulated_commands:
+            return
+        names: list[str] = []
+        task = self.root_task
+        for argument in arguments:
+            if argument == '--':
+                break
+            if argument.startswith('-'):
+                continue
+            for sub_task in task.sub_tasks:
+                if sub_task.name == argument:
+                    task = sub_task
+                    break
+            else:
+                break
+            names.append(task.name)
+            full_name = '.'.join(names)
+            if full_name in self.unpopulated_commands:
+                command, _task = self.unpopulated_commands.pop(full_name)
+                self._add_task_fields(full_name, command, task)
+                # Parser trees built without the new fields are obsolete.
+                self.cli_parser.invalidate()
+            if not task.sub_tasks:
+                break
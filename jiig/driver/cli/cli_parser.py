@@ -216,9 +216,27 @@ class _ArgumentParser(argparse.ArgumentParser):
 
 class Parser:
 
-    def __init__(self, top_task_dest_name: str):
+    def __init__(self, top_task_dest_name: str, lazy: bool = False):
+        """Parser constructor.
+
+        Args:
+            top_task_dest_name: top task destination name
+            lazy: only build sub-parsers for the active command path if True
+        """
         self.top_task_dest_name = top_task_dest_name
+        self.lazy = lazy
         self.parsers: dict[str, argparse.ArgumentParser] = {}
+        # Parser trees built for the cached root command, keyed by command path
+        # name tuple, or by None for the full tree.
+        self._cached_parsers: dict[tuple[str, ...] | None, _ArgumentParser] = {}
+        self._cached_root_command: CLICommand | None = None
+        self._cached_name: str | None = None
+
+    def invalidate(self):
+        """Discard cached parser trees, e.g. after commands are modified."""
+        self._cached_parsers.clear()
+        self._cached_root_command = None
+        self._cached_name = None
 
     @classmethod
     def pre_parse(cls,
@@ -236,15 +254,68 @@ class Parser:
         Returns:
             (argument data attributes, trailing argument list) tuple
         """
-        # Don't use the primary argparse parser, since it may be initialized later.
-        pre_parser = _ArgumentParser()
-        cls._prepare_global_options(pre_parser, options)
-        data, trailing_arguments = pre_parser.parse_known_args(
-            command_line_arguments, raise_exceptions=raise_exceptions)
+        fast_results = cls._fast_pre_parse(command_line_arguments, options)
+        if fast_results is not None:
+            data, trailing_arguments = fast_results
+        else:
+            # Don't use the primary argparse parser, since it may be initialized later.
+            pre_parser = _ArgumentParser()
+            cls._prepare_global_options(pre_parser, options)
+            data, trailing_arguments = pre_parser.parse_known_args(
+                command_line_arguments, raise_exceptions=raise_exceptions)
         if getattr(data, 'DEBUG', False):
             _ArgumentParser.debug = True
         return data, trailing_arguments
 
+    @staticmethod
+    def _fast_pre_parse(command_line_arguments: Sequence[str],
+                        options: Sequence[CLIOptionArgument] | None,
+                        ) -> tuple[argparse.Namespace, list[str]] | None:
+        # Scan for exact global option flags without building an argparse
+        # parser. Return None for anything argparse might interpret
+        # differently, e.g. abbreviated or combined flags, "=" values, "--",
+        # or a missing or option-like value.
+        flag_dests: dict[str, str] = {}
+        value_dests: set[str] = set()
+        data = argparse.Namespace()
+        for option in options or []:
+            dest = option.name.upper()
+            if option.is_boolean:
+                setattr(data, dest, False)
+            else:
+                setattr(data, dest, None)
+                value_dests.add(dest)
+            for flag in option.flags:
+                flag_dests[flag] = dest
+        trailing_arguments: list[str] = []
+        value_dest: str | None = None
+        for argument in command_line_arguments:
+            if value_dest is not None:
+                if argument.startswith('-'):
+                    return None
+                setattr(data, value_dest, argument)
+                value_dest = None
+                continue
+            dest = flag_dests.get(argument)
+            if dest is not None:
+                if dest in value_dests:
+                    value_dest = dest
+                else:
+                    setattr(data, dest, True)
+                continue
+            if argument.startswith('-') and argument != '-':
+                if argument == '--' or '=' in argument:
+                    return None
+                if not argument.startswith('--') and argument[:2] in flag_dests:
+                    return None
+                for flag in flag_dests.keys():
+                    if flag.startswith(argument):
+                        return None
+            trailing_arguments.append(argument)
+        if value_dest is not None:
+            return None
+        return data, trailing_arguments
+
     def parse(self,
               command_line_arguments: Sequence[str],
               name: str,
@@ -255,6 +326,11 @@ class Parser:
               ) -> tuple[object, list[str], list[str]]:
         """Parse the command line.
 
+        In lazy mode only the sub-parsers for the command path identified by
+        leading non-option arguments are built. The full parser tree is still
+        used when the path can't be identified or lazy parsing fails, so that
+        error output is the same as in non-lazy mode.
+
         Args:
             command_line_arguments: command line argument list
             name: program name
@@ -266,23 +342,90 @@ class Parser:
         Returns:
             (argument data attributes, command names, trailing arguments) tuple
         """
-        parser = _ArgumentParser(name, description)
-        parser.dump('parse ArgumentParser', name=name, description=description)
-        self._prepare_fields(root_command, root_command.name, parser)
-        self.parsers[self.top_task_dest_name] = parser
+        if self.lazy:
+            command_path = self.get_command_path(root_command, command_line_arguments)
+            if command_path is not None:
+                try:
+                    return self._parse(command_line_arguments,
+                                       name,
+                                       description,
+                                       root_command,
+                                       command_path,
+                                       capture_trailing,
+                                       True)
+                except ValueError as exc:
+                    if _ArgumentParser.debug:
+                        logger.message(f'Lazy parsing failed, using full parser: {exc}')
+        return self._parse(command_line_arguments,
+                           name,
+                           description,
+                           root_command,
+                           None,
+                           capture_trailing,
+                           raise_exceptions)
+
+    @staticmethod
+    def get_command_path(root_command: CLICommand,
+                         command_line_arguments: Sequence[str],
+                         ) -> list[CLICommand] | None:
+        """Identify command path from leading non-option arguments.
 
+        Args:
+            root_command: root command
+            command_line_arguments: command line argument list
+
+        Returns:
+            command list from top level to leaf command or None if not identified
+        """
+        command_path: list[CLICommand] = []
+        command = root_command
+        skip_next = False
+        for argument in command_line_arguments:
+            if skip_next:
+                skip_next = False
+                continue
+            if argument == '--':
+                break
+            if argument.startswith('-') and argument != '-':
+                # Skip the value of a known option that requires one.
+                for option in command.options:
+                    if not option.is_boolean and argument in option.flags:
+                        skip_next = True
+                        break
+                continue
+            # Positionals would be consumed before a sub-command name.
+            if command.positionals:
+                return None
+            for sub_command in command.sub_commands:
+                if sub_command.name == argument:
+                    command = sub_command
+                    break
+            else:
+                return None
+            command_path.append(command)
+            if not command.sub_commands:
+                return command_path
+        return None
+
+    def _parse(self,
+               command_line_arguments: Sequence[str],
+               name: str,
+               description: str,
+               root_command: CLICommand,
+               command_path: list[CLICommand] | None,
+               capture_trailing: bool,
+               raise_exceptions: bool,
+               ) -> tuple[object, list[str], list[str]]:
+        parser = self._get_parser(name, description, root_command, command_path)
+        self.parsers[self.top_task_dest_name] = parser
         app_commands = list(filter(lambda c: c.visibility == 0, root_command.sub_commands))
-        top_group = parser.add_subparsers(dest=self.top_task_dest_name,
-                                          required=bool(app_commands))
-        for command in root_command.sub_commands:
-            sub_parser = top_group.add_parser(command.name,
-                                              help=command.description,
-                                              add_help=False)
-            self._prepare_recursive(command, sub_parser, self.top_task_dest_name, [command.name])
 
         # Parse the command line arguments.
         if capture_trailing:
-            args, trailing_args = parser.parse_known_args(command_line_arguments)
+            # Only lazy parsing raises exceptions here, for falling back to the
+            # full parser, which reports errors and exits, as it always has.
+            args, trailing_args = parser.parse_known_args(command_line_arguments,
+                                                          raise_exceptions=command_path is not None)
         else:
             args = parser.parse_args(command_line_arguments,
                                      raise_exceptions=raise_exceptions)
@@ -304,6 +447,47 @@ class Parser:
             names.append(getattr(args, command_dest))
         return args, names, trailing_args
 
+    def _get_parser(self,
+                    name: str,
+                    description: str,
+                    root_command: CLICommand,
+                    command_path: list[CLICommand] | None,
+                    ) -> _ArgumentParser:
+        # Reuse a parser tree previously built for the same commands.
+        if root_command is not self._cached_root_command or name != self._cached_name:
+            self.invalidate()
+            self._cached_root_command = root_command
+            self._cached_name = name
+        if command_path is None:
+            cache_key = None
+        else:
+            cache_key = tuple(command.name for command in command_path)
+        parser = self._cached_parsers.get(cache_key)
+        if parser is not None:
+            parser.description = description
+            return parser
+        parser = _ArgumentParser(name, description)
+        parser.dump('parse ArgumentParser', name=name, description=description)
+        self._prepare_fields(root_command, root_command.name, parser)
+        app_commands = list(filter(lambda c: c.visibility == 0, root_command.sub_commands))
+        top_group = parser.add_subparsers(dest=self.top_task_dest_name,
+                                          required=bool(app_commands))
+        if command_path is None:
+            for command in root_command.sub_commands:
+                sub_parser = top_group.add_parser(command.name,
+                                                  help=command.description,
+                                                  add_help=False)
+                self._prepare_recursive(command, sub_parser, self.top_task_dest_name,
+                                        [command.name])
+        else:
+            command = command_path[0]
+            sub_parser = top_group.add_parser(command.name,
+                                              help=command.description,
+                                              add_help=False)
+            self._prepare_path(command_path, sub_parser, self.top_task_dest_name)
+        self._cached_parsers[cache_key] = parser
+        return parser
+
     @classmethod
     def _add_option_or_positional(cls,
                                   parser: argparse.ArgumentParser,
@@ -395,6 +579,27 @@ class Parser:
                 cls._prepare_recursive(sub_command, sub_parser, dest_name,
                                        command_names=(command_names + [sub_command.name]))
 
+    @classmethod
+    def _prepare_path(cls,
+                      command_path: list[CLICommand],
+                      parser: argparse.ArgumentParser,
+                      parent_dest_name: str,
+                      ):
+        # Same as _prepare_recursive(), but only for commands on the path.
+        command_names: list[str] = []
+        for command_idx, command in enumerate(command_path):
+            command_names.append(command.name)
+            cls._prepare_fields(command, ' '.join(command_names), parser)
+            if command_idx + 1 < len(command_path):
+                dest_name = DEST_NAME_SEPARATOR.join([parent_dest_name, command.name.upper()])
+                sub_group = parser.add_subparsers(dest=dest_name,
+                                                  required=True)
+                sub_command = command_path[command_idx + 1]
+                parser = sub_group.add_parser(sub_command.name,
+                                              help=sub_command.description,
+                                              add_help=False)
+                parent_dest_name = dest_name
+
     @staticmethod
     def _prepare_global_options(parser: argparse.ArgumentParser,
                                 options: Sequence[CLIOptionArgument],
@@ -33,3 +33,5 @@ class DriverOptions:
     """Top task destination name"""
     global_option_names: list[str] = field(default_factory=list)
     """Supported global option names."""
+    lazy_parsing: bool = False
+    """Only build parsers for the active command path if True."""
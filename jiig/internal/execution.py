@@ -29,15 +29,34 @@ Write-only modules return no data.
 """
 
 import os
+import shlex
 import sys
-from inspect import isfunction
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from inspect import iscoroutine, iscoroutinefunction, isfunction
+from typing import Any, Callable, Coroutine
 
 from jiig.runtime import Runtime
-from jiig.task import RuntimeTask
+from jiig.task import TASKS_BY_FUNCTION_ID, RegisteredTask, RuntimeTask
+from jiig.util.concurrency import concurrent_section, gather_limited
 from jiig.util.exceptions import format_exception
 from jiig.util.log import abort, log_error, log_message
 from jiig.util.options import OPTIONS
-from jiig.util.text.expansion import StringExpansionError
+from jiig.util.text.expansion import StringExpansionError, expand_values
+from jiig.util.text.table import format_table
+from jiig.util.tracing import trace_span
+
+from .field_conversion import MISSING
+from .initialization.arguments import prepare_arguments
+from .task_cache import (
+    TaskCache,
+    get_input_paths,
+    get_input_signatures,
+    get_task_cache_folder,
+    get_task_fingerprint,
+)
+from .task_graph import TaskGraphCycleError, TaskGraphNode, run_task_graph
 
 
 class ArgumentNameError(RuntimeError):
@@ -48,48 +67,44 @@ class _ArgumentDataPreparer:
 
     def __init__(self, raw_data: object):
         self.raw_data = raw_data
+        # Use the attribute dictionary for fast lookups when available.
+        self.raw_values: dict | None = getattr(raw_data, '__dict__', None)
         self.prepared_data = {}
         self.errors: list[str] = []
 
     def prepare_argument_data(self, task: RuntimeTask):
-        # Convert raw argument data to prepared data.
+        # Convert raw argument data to prepared data using compiled converters.
         # Handle lower and upper case attribute names in raw data.
-        for registered_field in task.fields:
-            value = None
-            has_attribute = hasattr(self.raw_data, registered_field.name)
-            if has_attribute:
-                value = getattr(self.raw_data, registered_field.name)
+        raw_values = self.raw_values
+        prepared_data = self.prepared_data
+        for converter in task.field_converters:
+            if raw_values is not None:
+                value = raw_values.get(converter.name, MISSING)
+                if value is MISSING:
+                    value = raw_values.get(converter.dest_name, MISSING)
+            else:
+                value = MISSING
+            if value is MISSING:
+                # Fall back to attribute access, e.g. for class attributes.
+                value = converter.get_attribute_value(self.raw_data)
+                if value is MISSING:
+                    continue
+            if value is None:
+                prepared_data[converter.name] = converter.default_value
+            elif converter.convert is None:
+                prepared_data[converter.name] = value
             else:
-                dest_name = registered_field.name.upper()
-                has_attribute = hasattr(self.raw_data, dest_name)
-                if has_attribute:
-                    value = getattr(self.raw_data, dest_name)
-            if has_attribute:
-                adapter_name = '???'
                 try:
                     # Call all adapters to validate and convert as appropriate.
-                    if value is not None:
-                        if registered_field.adapters is not None:
-                            for adapter in registered_field.adapters:
-                                adapter_name = adapter.__name__
-                                if registered_field.repeat is not None:
-                                    value = [adapter(value_item) for value_item in value]
-                                else:
-                                    value = adapter(value)
-                    else:
-                        if registered_field.default is not None:
-                            value = registered_field.default.value
-                        else:
-                            value = None
-                    self.prepared_data[registered_field.name] = value
+                    prepared_data[converter.name] = converter.convert(value)
                 except (TypeError, ValueError) as exc:
-                    arg_name = registered_field.name.upper()
+                    arg_name = converter.dest_name
                     if OPTIONS.debug:
                         label = ':'.join(
                             [
                                 task.full_name,
                                 arg_name,
-                                f'adapter={adapter_name}',
+                                f'adapter={converter.get_failed_adapter_name(value)}',
                             ],
                         )
                         error = format_exception(exc, label=label, skip_frame_count=1)
@@ -98,6 +113,231 @@ class _ArgumentDataPreparer:
                         self.errors.append(f'{arg_name}: {str(exc)}')
 
 
+class _EventLoopRunner:
+
+    def __init__(self):
+        # The asyncio event loop is created on demand, so that synchronous
+        # tasks don't pay for importing asyncio. One loop serves the whole task
+        # stack and when-done call-backs.
+        self.event_loop = None
+
+    def run(self, coroutine: Coroutine) -> Any:
+        if self.event_loop is None:
+            import asyncio
+            self.event_loop = asyncio.new_event_loop()
+        return self.event_loop.run_until_complete(coroutine)
+
+    def close(self):
+        if self.event_loop is not None:
+            try:
+                self.event_loop.run_until_complete(self.event_loop.shutdown_asyncgens())
+            finally:
+                self.event_loop.close()
+                self.event_loop = None
+
+
+def _run_coroutine(coroutine: Coroutine) -> Any:
+    # Run a coroutine on its own event loop, e.g. in a worker thread.
+    import asyncio
+    return asyncio.run(coroutine)
+
+
+def _call_fan_out(task: RuntimeTask,
+                  runtime: Runtime,
+                  task_field_data: dict[str, Any],
+                  fan_out_field_name: str,
+                  event_loop_runner: _EventLoopRunner,
+                  ) -> list[tuple[Any, BaseException]]:
+    # Call the task function concurrently for each item of a repeated field.
+    # Return (item, exception) pairs for failed calls, including aborts.
+    for field in task.fields:
+        if field.name == fan_out_field_name:
+            if field.repeat is None:
+                abort('Fan-out field is not repeated.', task=task.full_name, field=field.name)
+            break
+    else:
+        abort('Fan-out field does not exist.', task=task.full_name, field=fan_out_field_name)
+    items = task_field_data[fan_out_field_name]
+    item_data_list = [
+        {**task_field_data, fan_out_field_name: [item]}
+        for item in items
+    ]
+    if iscoroutinefunction(task.task_function):
+        async def _call_item(item_data: dict[str, Any]) -> BaseException | None:
+            try:
+                await task.task_function(runtime, **item_data)
+                return None
+            except (Exception, SystemExit) as item_exc:
+                return item_exc
+
+        async def _call_all() -> list[BaseException | None]:
+            return await gather_limited(*[_call_item(item_data) for item_data in item_data_list],
+                                        limit=OPTIONS.jobs)
+
+        with concurrent_section():
+            exceptions = event_loop_runner.run(_call_all())
+    else:
+        # Items get their own pool, since the runtime pool may be needed by
+        # item calls, e.g. for parallel_map(), and would deadlock when full.
+        with concurrent_section(), ThreadPoolExecutor(max_workers=OPTIONS.jobs) as executor:
+            futures = [executor.submit(task.task_function, runtime, **item_data)
+                       for item_data in item_data_list]
+            exceptions = [future.exception() for future in futures]
+    return [(item, exc) for item, exc in zip(items, exceptions) if exc is not None]
+
+
+class _TaskCacheCheck:
+
+    def __init__(self,
+                 task: RuntimeTask,
+                 registered_task: RegisteredTask,
+                 runtime: Runtime,
+                 task_field_data: dict[str, Any],
+                 ):
+        # Symbols in input and output paths are expanded here, so that
+        # failures are reported like other missing symbols.
+        self.task_cache = TaskCache(get_task_cache_folder(runtime.paths.build))
+        self.task_name = task.full_name
+        input_patterns = registered_task.cache_inputs or []
+        expanded_paths = expand_values(input_patterns + (registered_task.cache_outputs or []), runtime.s)
+        input_paths = get_input_paths(expanded_paths[:len(input_patterns)])
+        self.input_count = len(input_paths)
+        self.fingerprint = get_task_fingerprint(
+            task.full_name,
+            task_field_data,
+            get_input_signatures(input_paths, hash_content=registered_task.cache_content))
+        self.output_paths = expanded_paths[len(input_patterns):]
+
+    def is_current(self) -> bool:
+        if not all(os.path.exists(output_path) for output_path in self.output_paths):
+            return False
+        return self.task_cache.check(self.fingerprint)
+
+    def record(self, command: str):
+        self.task_cache.record(self.fingerprint, self.task_name, command, self.input_count)
+
+
+def _invoke_task_function(task: RuntimeTask,
+                          registered_task: RegisteredTask | None,
+                          runtime: Runtime,
+                          task_field_data: dict[str, Any],
+                          command_string: str,
+                          run_coroutine: Callable[[Coroutine], Any],
+                          ) -> bool:
+    # Call a task function, unless it has current cached results. Return False
+    # if the call was skipped.
+    with trace_span(task.full_name, 'task', command=command_string) as span_args:
+        cache_check: _TaskCacheCheck | None = None
+        if registered_task is not None and registered_task.cache and not OPTIONS.dry_run:
+            cache_check = _TaskCacheCheck(task, registered_task, runtime, task_field_data)
+            if cache_check.is_current():
+                span_args['cached'] = True
+                return False
+        log_message(f'Invoking command "{command_string}"...', debug=True)
+        result = task.task_function(runtime, **task_field_data)
+        if iscoroutine(result):
+            run_coroutine(result)
+        if cache_check is not None:
+            cache_check.record(command_string)
+        return True
+
+
+def _resolve_dependencies(task_stack: list[RuntimeTask],
+                          runtime: Runtime,
+                          ) -> dict[str, TaskGraphNode]:
+    # Build dependency graph nodes for the tasks in the stack. Dependency
+    # arguments are parsed here, up front, because the driver is not thread-safe.
+    driver = runtime.internal.driver
+    root_task = runtime.internal.root_task
+    nodes: dict[str, TaskGraphNode] = {}
+
+    def _add_node(full_name: str, arguments: list[str]) -> str:
+        key = ' '.join([full_name] + [shlex.quote(argument) for argument in arguments])
+        if key in nodes:
+            return key
+        log_message(f'Resolving task dependency "{key}"...', debug=True)
+        driver.initialize_application(full_name.split('.') + arguments, root_task)
+        task = driver.app_data.task_stack[-1]
+        if not isfunction(task.task_function):
+            abort('Task dependency has no task function.', dependency=key)
+        data_preparer = _ArgumentDataPreparer(driver.app_data.data)
+        data_preparer.prepare_argument_data(task)
+        if data_preparer.errors:
+            abort(f'Task dependency argument failures: {len(data_preparer.errors)}',
+                  *data_preparer.errors,
+                  dependency=key)
+        registered_task = TASKS_BY_FUNCTION_ID.get(id(task.task_function))
+        # Add the node before resolving its dependencies, so that cycles
+        # terminate here and get reported when the graph is ordered.
+        node = TaskGraphNode(
+            key=key,
+            dependencies=[],
+            run=partial(_invoke_task_function,
+                        task,
+                        registered_task,
+                        runtime,
+                        data_preparer.prepared_data,
+                        f'{runtime.meta.tool_name} {" ".join(task.full_name.split("."))}',
+                        _run_coroutine),
+        )
+        nodes[key] = node
+        if registered_task is not None and registered_task.depends:
+            for dependency_name, dependency_arguments in registered_task.depends:
+                node.dependencies.append(_add_node(dependency_name, dependency_arguments))
+        return key
+
+    saved_app_data = driver.app_data
+    saved_help_generator = driver.help_generator
+    try:
+        for task in task_stack:
+            registered_task = TASKS_BY_FUNCTION_ID.get(id(task.task_function))
+            if registered_task is not None and registered_task.depends:
+                for dependency_name, dependency_arguments in registered_task.depends:
+                    _add_node(dependency_name, dependency_arguments)
+    finally:
+        driver.app_data = saved_app_data
+        driver.help_generator = saved_help_generator
+    return nodes
+
+
+def _run_dependencies(task_stack: list[RuntimeTask], runtime: Runtime):
+    # Run task dependencies concurrently, display timings, and abort on failure.
+    nodes = _resolve_dependencies(task_stack, runtime)
+    if not nodes:
+        return
+    start_time = time.perf_counter()
+    try:
+        with trace_span('dependencies', 'task', count=len(nodes)):
+            with concurrent_section(), ThreadPoolExecutor(max_workers=OPTIONS.jobs) as executor:
+                results = run_task_graph(nodes, executor.submit)
+    except TaskGraphCycleError as exc:
+        abort(str(exc))
+    rows: list[list[str]] = []
+    failure_lines: list[str] = []
+    for result in results:
+        if not result.started:
+            status = 'skipped'
+        elif isinstance(result.exception, StringExpansionError):
+            status = 'failed'
+            failure_lines.append(f'{result.key}: missing symbols: {" ".join(result.exception.missing)}')
+        elif isinstance(result.exception, SystemExit):
+            # Aborted calls have already displayed their errors.
+            status = 'failed'
+            failure_lines.append(f'{result.key}: aborted')
+        elif result.exception is not None:
+            status = 'failed'
+            failure_lines.append(format_exception(result.exception, label=result.key))
+        else:
+            status = 'ran' if result.value else 'cached'
+        rows.append([result.key, status, f'{result.elapsed * 1000:.1f} ms'])
+    log_message(f'Task dependencies: {len(results)}'
+                f' ({(time.perf_counter() - start_time) * 1000:.1f} ms)')
+    for line in format_table(*rows, headers=['dependency', 'status', 'time'], border_left='  '):
+        log_message(line)
+    if failure_lines:
+        abort(f'Task dependencies failed: {len(failure_lines)}', *failure_lines)
+
+
 def execute_application(task_stack: list[RuntimeTask],
                         runtime: Runtime,
                         ):
@@ -115,7 +355,9 @@ def execute_application(task_stack: list[RuntimeTask],
     if len(data_preparer.errors) > 0:
         abort(f'Argument failures: {len(data_preparer.errors)}',
               *data_preparer.errors)
+    event_loop_runner = _EventLoopRunner()
     try:
+        _run_dependencies(task_stack, runtime)
         # Run functions are invoked outer to inner, and done functions, if
         # added, are invoked in reverse, inner to outer order. The string is the
         # name used for errors. The dict is for keyword call arguments (task
@@ -134,14 +376,47 @@ def execute_application(task_stack: list[RuntimeTask],
                 for field in task.fields
                 if field.name in data_preparer.prepared_data
             }
-            if isfunction(task.task_function):
+            registered_task = TASKS_BY_FUNCTION_ID.get(id(task.task_function))
+            fan_out_field_name = registered_task.fan_out if registered_task is not None else None
+            if fan_out_field_name is not None and task_field_data.get(fan_out_field_name):
+                log_message(f'Invoking command "{command_string}" per'
+                            f' {fan_out_field_name} item...', debug=True)
+                with trace_span(task.full_name, 'task',
+                                command=command_string,
+                                items=len(task_field_data[fan_out_field_name])):
+                    failures = _call_fan_out(task,
+                                             runtime,
+                                             task_field_data,
+                                             fan_out_field_name,
+                                             event_loop_runner)
+                failure_lines: list[str] = []
+                for item, exc in failures:
+                    if isinstance(exc, StringExpansionError):
+                        for missing_symbol, references in exc.references.items():
+                            missing_symbols.setdefault(missing_symbol, []).extend(references)
+                    elif isinstance(exc, SystemExit):
+                        # Aborted calls have already displayed their errors.
+                        failure_lines.append(f'{item}: aborted')
+                    else:
+                        failure_lines.append(format_exception(exc, label=str(item)))
+                if failure_lines:
+                    abort(f'Command failed for {len(failure_lines)} of'
+                          f' {len(task_field_data[fan_out_field_name])} items.',
+                          *failure_lines,
+                          command=command_string)
+            elif isfunction(task.task_function):
                 # noinspection PyBroadException
                 try:
-                    log_message(f'Invoking command "{command_string}"...', debug=True)
-                    task.task_function(runtime, **task_field_data)
+                    if not _invoke_task_function(task,
+                                                 registered_task,
+                                                 runtime,
+                                                 task_field_data,
+                                                 command_string,
+                                                 event_loop_runner.run):
+                        log_message(f'Command "{command_string}" results are cached.')
                 except StringExpansionError as exc:
-                    for missing_symbol in exc.missing:
-                        missing_symbols.setdefault(missing_symbol, []).append(exc.value)
+                    for missing_symbol, references in exc.references.items():
+                        missing_symbols.setdefault(missing_symbol, []).extend(references)
                 except Exception as exc:
                     abort(f'Command failed due to an exception.',
                           commmand=command_string,
@@ -160,7 +435,10 @@ def execute_application(task_stack: list[RuntimeTask],
                 try:
                     # Takes no arguments, because callable supplier should
                     # capture necessary data in a closure or callable object.
-                    done_call()
+                    with trace_span(getattr(done_call, '__name__', 'when_done'), 'when_done'):
+                        done_result = done_call()
+                        if iscoroutine(done_result):
+                            event_loop_runner.run(done_result)
                 except Exception as exc:
                     abort(f'Exception invoking clean-up call-back {done_call.__name__}.',
                           exc,
@@ -178,3 +456,71 @@ def execute_application(task_stack: list[RuntimeTask],
               ' '.join(active_names),
               exc,
               exception_traceback_skip=1)
+    finally:
+        event_loop_runner.close()
+        # Stop worker pools that were left running by a failure.
+        runtime.shutdown_workers(cancel=True)
+
+
+def execute_command(arguments: list[str],
+                    runtime: Runtime,
+                    ) -> int:
+    """Run an additional command in the current process, e.g. for batches.
+
+    Reuses the runtime task tree, catalogs and driver, but gives the command
+    its own argument data and when_done() call-backs by creating a new runtime
+    object of the same class. Driver application data is restored afterwards.
+
+    Global options, e.g. --dry-run, are rejected, because they would not apply
+    to just the one command.
+
+    Args:
+        arguments: command arguments, without the tool name
+        runtime: runtime interface of the invoking task
+
+    Returns:
+        command exit status
+    """
+    driver = runtime.internal.driver
+    root_task = runtime.internal.root_task
+    saved_app_data = driver.app_data
+    saved_help_generator = driver.help_generator
+    try:
+        # Global options are removed by preliminary parsing.
+        try:
+            preliminary_app_data = driver.on_initialize_driver(arguments)
+        except ValueError as exc:
+            abort(str(exc))
+        if len(preliminary_app_data.additional_arguments) != len(arguments):
+            global_arguments = list(arguments)
+            for argument in preliminary_app_data.additional_arguments:
+                global_arguments.remove(argument)
+            abort('Global options are not supported in additional commands.', *global_arguments)
+        arguments = prepare_arguments(arguments,
+                                      runtime.internal.aliases_catalog,
+                                      root_task)
+        driver.initialize_application(arguments, root_task)
+        command_runtime = runtime.__class__(
+            None,
+            help_generator=driver.help_generator,
+            data=driver.app_data.data,
+            meta=runtime.meta,
+            paths=runtime.paths,
+            aliases_catalog=runtime.internal.aliases_catalog,
+            params_catalog=runtime.internal.params_catalog,
+            driver=driver,
+            root_task=root_task,
+            config=runtime.config,
+        )
+        execute_application(driver.app_data.task_stack, command_runtime)
+        return 0
+    except SystemExit as exc:
+        if exc.code is None:
+            return 0
+        if isinstance(exc.code, int):
+            return exc.code
+        log_error(exc.code)
+        return 1
+    finally:
+        driver.app_data = saved_app_data
+        driver.help_generator = saved_help_generator
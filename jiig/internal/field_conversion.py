@@ -0,0 +1,169 @@
+# Copyright (C) 2020-2023, Steven Cooper
+#
+# This file is part of Jiig.
+#
+# Jiig is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Jiig is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Jiig.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Compiled task field argument conversion.
+
+Converters are compiled once per task field, so that preparing argument data
+for each command is a tight loop over the fields, with attribute names, the
+adapter chain, and repeat handling resolved in advance.
+
+Repeated field values use an adapter's batch variant, if declared, or a
+result cache for adapters declared cacheable. Caches only live for a single
+conversion, so that results, e.g. file system checks, are never stale.
+"""
+
+from pathlib import Path
+from types import BuiltinFunctionType
+from typing import Any, Callable
+
+from jiig.adapters import get_batch_adapter, is_cacheable
+from jiig.types import ArgumentAdapter, TaskField
+
+# Value types with results that may be cached for cacheable adapters. Equal
+# values of these types are interchangeable, unlike e.g. 1, 1.0 and True.
+_CACHEABLE_VALUE_TYPES = (str, Path)
+
+#: Placeholder for missing raw argument data attributes.
+MISSING = object()
+
+
+class FieldConverter:
+    """Compiled argument conversion for a task field."""
+
+    __slots__ = ('field', 'name', 'dest_name', 'default_value', 'convert')
+
+    def __init__(self, field: TaskField):
+        """Field converter constructor.
+
+        Args:
+            field: task field
+        """
+        #: Task field.
+        self.field = field
+        #: Field name, also the preferred raw data attribute name.
+        self.name = field.name
+        #: Upper case raw data attribute name, e.g. for argparse destinations.
+        self.dest_name = field.name.upper()
+        #: Value to use when the raw value is None.
+        self.default_value = field.default.value if field.default is not None else None
+        #: Fused adapter chain with repeat handling or None if there are no adapters.
+        self.convert: Callable[[Any], Any] | None = _compile_adapters(
+            field.adapters or [], field.repeat is not None)
+
+    def get_attribute_value(self, raw_data: object) -> Any:
+        """Get the field's raw value using attribute access (slow path).
+
+        Args:
+            raw_data: raw argument data object
+
+        Returns:
+            raw value or MISSING if the attribute doesn't exist
+        """
+        value = getattr(raw_data, self.name, MISSING)
+        if value is MISSING:
+            value = getattr(raw_data, self.dest_name, MISSING)
+        return value
+
+    def get_failed_adapter_name(self, value: Any) -> str:
+        """Identify the adapter that fails for a value (slow path for errors).
+
+        Args:
+            value: raw value that failed conversion
+
+        Returns:
+            adapter name or '???' if no adapter fails
+        """
+        values = value if self.field.repeat is not None else [value]
+        for item in values:
+            for adapter in self.field.adapters or []:
+                try:
+                    item = adapter(item)
+                except (TypeError, ValueError):
+                    return adapter.__name__
+        return '???'
+
+
+def compile_field_converters(fields: list[TaskField]) -> list[FieldConverter]:
+    """Compile converters for task fields.
+
+    Args:
+        fields: task fields
+
+    Returns:
+        field converters
+    """
+    return [FieldConverter(field) for field in fields]
+
+
+def _compile_items_adapter(adapter: ArgumentAdapter) -> Callable[[Any], list]:
+    batch_adapter = get_batch_adapter(adapter)
+    if batch_adapter is not None:
+        def adapt_batch(items: Any) -> list:
+            return batch_adapter(items if isinstance(items, list) else list(items))
+        return adapt_batch
+    if is_cacheable(adapter):
+        def adapt_cached_items(items: Any) -> list:
+            # A plain dictionary, since its size is limited by the item count.
+            results: dict[str | Path, Any] = {}
+            adapted_items: list = []
+            for item in items:
+                if isinstance(item, _CACHEABLE_VALUE_TYPES):
+                    result = results.get(item, MISSING)
+                    if result is MISSING:
+                        result = results[item] = adapter(item)
+                else:
+                    result = adapter(item)
+                adapted_items.append(result)
+            return adapted_items
+        return adapt_cached_items
+    # map() is fastest for built-in functions and types, e.g. int, but a list
+    # comprehension is faster for Python functions.
+    if isinstance(adapter, (BuiltinFunctionType, type)):
+        def adapt_items(items: Any) -> list:
+            return list(map(adapter, items))
+    else:
+        def adapt_items(items: Any) -> list:
+            return [adapter(item) for item in items]
+    return adapt_items
+
+
+def _compile_adapters(adapters: list[ArgumentAdapter],
+                      is_repeated: bool,
+                      ) -> Callable[[Any], Any] | None:
+    if not adapters:
+        return None
+    if is_repeated:
+        items_adapters = tuple(_compile_items_adapter(adapter) for adapter in adapters)
+        if len(items_adapters) == 1:
+            return items_adapters[0]
+
+        def convert_items(items: Any) -> list:
+            for items_adapter in items_adapters:
+                items = items_adapter(items)
+            return items
+
+        return convert_items
+    if len(adapters) == 1:
+        return adapters[0]
+    adapter_tuple = tuple(adapters)
+
+    def convert_item(item: Any) -> Any:
+        for item_adapter in adapter_tuple:
+            item = item_adapter(item)
+        return item
+
+    return convert_item
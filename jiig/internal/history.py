@@ -0,0 +1,545 @@
+# Copyright (C) 2023, Steven Cooper
+#
+# This file is part of Jiig.
+#
+# Jiig is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Jiig is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Jiig.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Command history with per-command resource accounting.
+
+Each tool invocation appends one JSON line with wall time, CPU times for the
+process and its children, peak resident set sizes, subprocess count and exit
+status. Lines go to monthly segment files, e.g. "2023-06.jsonl", using a single
+append-mode write, so that concurrent invocations don't interleave records.
+
+An index file holds per-segment and per-command summaries. Wall and CPU times
+are counted in logarithmic histogram buckets, rather than kept as samples, so
+that the index size does not grow with the number of records. Percentiles are
+accurate to about 1%. The index is brought up to date lazily, by reading only
+the segment bytes appended since the last update. Queries use the index to skip
+segments that can't match, and statistics only read records from segments that
+straddle the time filter boundary, or when limited to failures. Listings read
+segments backwards, newest first, and stop at the record limit.
+"""
+
+import json
+import math
+import os
+import sys
+import time
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+from typing import Iterator
+
+from jiig.util.log import log_error, log_message
+from jiig.util.process import get_subprocess_count
+
+try:
+    import resource
+except ImportError:
+    # Resource usage is unavailable on Windows.
+    resource = None
+
+HISTORY_FORMAT_VERSION = 2
+_SEGMENT_SUFFIX = '.jsonl'
+_SEGMENT_TIME_FORMAT = '%Y-%m'
+_INDEX_FILE_NAME = 'index.json'
+# Histogram buckets grow by _HISTOGRAM_RATIO, starting at _HISTOGRAM_MINIMUM
+# seconds. Smaller times go in bucket 0.
+_HISTOGRAM_MINIMUM = 0.000001
+_HISTOGRAM_RATIO = 1.02
+# Block size for reading segments backwards.
+_REVERSE_READ_SIZE = 65536
+# ru_maxrss is in kilobytes, except on macOS, where it is in bytes.
+_MAX_RSS_MULTIPLIER = 1 if sys.platform == 'darwin' else 1024
+
+
+@dataclass
+class ResourceUsage:
+    """Resource usage snapshot for the process and its waited-for children."""
+    #: User CPU time in seconds.
+    user: float
+    #: System CPU time in seconds.
+    system: float
+    #: Children user CPU time in seconds.
+    child_user: float
+    #: Children system CPU time in seconds.
+    child_system: float
+    #: Peak resident set size in bytes.
+    max_rss: int
+    #: Largest child peak resident set size in bytes.
+    child_max_rss: int
+
+
+@dataclass
+class HistoryRecord:
+    """Command history record."""
+    #: Start time in seconds since the epoch.
+    time: float
+    #: Command name, i.e. space-separated task names.
+    command: str
+    #: Command line arguments.
+    arguments: list[str]
+    #: Exit status.
+    exit_status: int
+    #: Elapsed wall time in seconds.
+    wall: float
+    #: User CPU time in seconds.
+    user: float
+    #: System CPU time in seconds.
+    system: float
+    #: Children user CPU time in seconds.
+    child_user: float
+    #: Children system CPU time in seconds.
+    child_system: float
+    #: Peak resident set size in bytes.
+    max_rss: int
+    #: Largest child peak resident set size in bytes.
+    child_max_rss: int
+    #: Number of subprocesses started.
+    subprocesses: int
+
+    @property
+    def cpu(self) -> float:
+        """
+        Provide total CPU time, including children.
+
+        Returns:
+            CPU time in seconds
+        """
+        return self.user + self.system + self.child_user + self.child_system
+
+
+@dataclass
+class HistoryStatistics:
+    """Aggregated history statistics for a command."""
+    #: Command name.
+    command: str
+    #: Number of invocations.
+    count: int
+    #: Number of invocations with a non-zero exit status.
+    failures: int
+    #: Median wall time in seconds.
+    wall_p50: float
+    #: 95th percentile wall time in seconds.
+    wall_p95: float
+    #: Median CPU time in seconds, including children.
+    cpu_p50: float
+    #: 95th percentile CPU time in seconds, including children.
+    cpu_p95: float
+    #: Largest peak resident set size in bytes, including children.
+    max_rss: int
+    #: Last invocation time in seconds since the epoch.
+    last: float
+
+
+_RECORD_FIELD_NAMES = [field.name for field in fields(HistoryRecord)]
+
+
+def get_resource_usage() -> ResourceUsage:
+    """Get resource usage for the process and its waited-for children.
+
+    Returns:
+        resource usage snapshot, all zeros if unsupported by the platform
+    """
+    if resource is None:
+        return ResourceUsage(0.0, 0.0, 0.0, 0.0, 0, 0)
+    self_usage = resource.getrusage(resource.RUSAGE_SELF)
+    child_usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return ResourceUsage(user=self_usage.ru_utime,
+                         system=self_usage.ru_stime,
+                         child_user=child_usage.ru_utime,
+                         child_system=child_usage.ru_stime,
+                         max_rss=self_usage.ru_maxrss * _MAX_RSS_MULTIPLIER,
+                         child_max_rss=child_usage.ru_maxrss * _MAX_RSS_MULTIPLIER)
+
+
+def get_histogram_bucket(seconds: float) -> str:
+    """Get the histogram bucket for a time.
+
+    Args:
+        seconds: time in seconds
+
+    Returns:
+        bucket key, a numeric string usable as a JSON object key
+    """
+    if seconds < _HISTOGRAM_MINIMUM:
+        return '0'
+    return str(math.floor(math.log(seconds / _HISTOGRAM_MINIMUM) / math.log(_HISTOGRAM_RATIO)) + 1)
+
+
+def get_histogram_percentile(histogram: dict[str, int], percent: float) -> float:
+    """Get a nearest-rank percentile from a time histogram.
+
+    Args:
+        histogram: counts keyed by get_histogram_bucket() bucket
+        percent: percentile, from 0 to 100
+
+    Returns:
+        percentile time, the geometric middle of its bucket, or 0.0 if the
+        histogram is empty
+    """
+    total_count = sum(histogram.values())
+    if total_count == 0:
+        return 0.0
+    rank = max(math.ceil(percent / 100 * total_count), 1)
+    count = 0
+    for bucket in sorted(histogram.keys(), key=int):
+        count += histogram[bucket]
+        if count >= rank:
+            break
+    bucket_number = int(bucket)
+    if bucket_number == 0:
+        return 0.0
+    return round(_HISTOGRAM_MINIMUM * _HISTOGRAM_RATIO ** (bucket_number - 0.5), 6)
+
+
+class CommandAccounting:
+    """Measures resource usage from construction until a record is created."""
+
+    def __init__(self,
+                 start_time: float = None,
+                 start_usage: ResourceUsage = None,
+                 start_subprocess_count: int = None,
+                 ):
+        """Command accounting constructor.
+
+        Args:
+            start_time: optional time.perf_counter() start time, e.g. from a
+                startup profiler, default: now
+            start_usage: optional starting resource usage, default: current usage
+            start_subprocess_count: optional starting subprocess count,
+                default: current count
+        """
+        self.start_time = start_time if start_time is not None else time.perf_counter()
+        self.start_epoch_time = time.time() - (time.perf_counter() - self.start_time)
+        self.start_usage = start_usage if start_usage is not None else get_resource_usage()
+        self.start_subprocess_count = (start_subprocess_count
+                                       if start_subprocess_count is not None
+                                       else get_subprocess_count())
+
+    def create_record(self, command: str, arguments: list[str], exit_status: int) -> HistoryRecord:
+        """Create a history record for resources used since construction.
+
+        Peak resident set sizes are process-wide peaks, not differences.
+
+        Args:
+            command: command name
+            arguments: command line arguments
+            exit_status: exit status
+
+        Returns:
+            history record
+        """
+        usage = get_resource_usage()
+        return HistoryRecord(
+            time=self.start_epoch_time,
+            command=command,
+            arguments=arguments,
+            exit_status=exit_status,
+            wall=time.perf_counter() - self.start_time,
+            user=usage.user - self.start_usage.user,
+            system=usage.system - self.start_usage.system,
+            child_user=usage.child_user - self.start_usage.child_user,
+            child_system=usage.child_system - self.start_usage.child_system,
+            max_rss=usage.max_rss,
+            child_max_rss=usage.child_max_rss,
+            subprocesses=get_subprocess_count() - self.start_subprocess_count,
+        )
+
+
+def _matches_command(record_command: str, command: str | None) -> bool:
+    # A command filter also matches sub-commands, e.g. "cache" matches "cache list".
+    return (command is None
+            or record_command == command
+            or record_command.startswith(f'{command} '))
+
+
+def _new_command_summary() -> dict:
+    return {'count': 0, 'failures': 0, 'wall': {}, 'cpu': {}, 'max_rss': 0, 'last': 0.0}
+
+
+def _add_to_command_summary(summary: dict, record: HistoryRecord):
+    summary['count'] += 1
+    if record.exit_status != 0:
+        summary['failures'] += 1
+    for histogram, seconds in ((summary['wall'], record.wall), (summary['cpu'], record.cpu)):
+        bucket = get_histogram_bucket(seconds)
+        histogram[bucket] = histogram.get(bucket, 0) + 1
+    summary['max_rss'] = max(summary['max_rss'], record.max_rss, record.child_max_rss)
+    summary['last'] = max(summary['last'], record.time)
+
+
+def _merge_command_summary(summary: dict, other_summary: dict):
+    summary['count'] += other_summary['count']
+    summary['failures'] += other_summary['failures']
+    for name in ('wall', 'cpu'):
+        histogram = summary[name]
+        for bucket, count in other_summary[name].items():
+            histogram[bucket] = histogram.get(bucket, 0) + count
+    summary['max_rss'] = max(summary['max_rss'], other_summary['max_rss'])
+    summary['last'] = max(summary['last'], other_summary['last'])
+
+
+class HistoryStore:
+    """Command history records and index in a folder."""
+
+    def __init__(self, folder: str | Path):
+        """History store constructor.
+
+        Args:
+            folder: history folder
+        """
+        self.folder = Path(folder)
+        self.index_path = self.folder / _INDEX_FILE_NAME
+
+    def _segment_path(self, record_time: float) -> Path:
+        segment_name = time.strftime(_SEGMENT_TIME_FORMAT, time.localtime(record_time))
+        return self.folder / f'{segment_name}{_SEGMENT_SUFFIX}'
+
+    def append(self, record: HistoryRecord):
+        """Append a record.
+
+        Failures are reported, but are not fatal, since history is not
+        essential to running commands.
+
+        Args:
+            record: history record
+        """
+        line = json.dumps(asdict(record), separators=(',', ':')) + '\n'
+        segment_path = self._segment_path(record.time)
+        try:
+            self.folder.mkdir(parents=True, exist_ok=True)
+            fd = os.open(segment_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+            try:
+                os.write(fd, line.encode('utf-8'))
+            finally:
+                os.close(fd)
+        except OSError as exc:
+            log_error('Unable to record command history.', path=segment_path, exception=exc)
+
+    def _segment_paths(self) -> list[Path]:
+        try:
+            return sorted(self.folder.glob(f'*{_SEGMENT_SUFFIX}'))
+        except OSError:
+            return []
+
+    @staticmethod
+    def _parse_record(line: bytes, segment_path: Path) -> HistoryRecord | None:
+        try:
+            record_data = json.loads(line)
+            return HistoryRecord(**{name: record_data[name] for name in _RECORD_FIELD_NAMES})
+        except (ValueError, KeyError, TypeError) as exc:
+            log_message('Ignoring bad command history record.',
+                        path=segment_path, exception=exc, debug=True)
+            return None
+
+    @classmethod
+    def _read_records(cls, segment_path: Path, offset: int = 0) -> Iterator[tuple[HistoryRecord, int]]:
+        # Yields records with end offsets. Stops before an incomplete last line.
+        try:
+            with open(segment_path, 'rb') as segment_file:
+                segment_file.seek(offset)
+                data = segment_file.read()
+        except OSError as exc:
+            log_error('Unable to read command history.', path=segment_path, exception=exc)
+            return
+        line_start = 0
+        while True:
+            line_end = data.find(b'\n', line_start)
+            if line_end < 0:
+                break
+            line = data[line_start:line_end]
+            line_start = line_end + 1
+            record = cls._parse_record(line, segment_path)
+            if record is not None:
+                yield record, offset + line_start
+
+    @classmethod
+    def _read_records_reversed(cls, segment_path: Path, end_offset: int) -> Iterator[HistoryRecord]:
+        # Yields records before end_offset, last first, reading blocks backwards.
+        try:
+            with open(segment_path, 'rb') as segment_file:
+                position = end_offset
+                partial_line = b''
+                while position > 0:
+                    read_size = min(_REVERSE_READ_SIZE, position)
+                    position -= read_size
+                    segment_file.seek(position)
+                    lines = (segment_file.read(read_size) + partial_line).split(b'\n')
+                    # The first line may continue in the preceding block.
+                    partial_line = lines[0]
+                    for line in reversed(lines[1:]):
+                        if line:
+                            record = cls._parse_record(line, segment_path)
+                            if record is not None:
+                                yield record
+                if partial_line:
+                    record = cls._parse_record(partial_line, segment_path)
+                    if record is not None:
+                        yield record
+        except OSError as exc:
+            log_error('Unable to read command history.', path=segment_path, exception=exc)
+
+    def _load_index(self) -> dict:
+        try:
+            with open(self.index_path, encoding='utf-8') as index_file:
+                index_data = json.load(index_file)
+            if index_data.get('version') == HISTORY_FORMAT_VERSION:
+                return index_data
+        except (OSError, ValueError, AttributeError):
+            pass
+        return {'version': HISTORY_FORMAT_VERSION, 'segments': {}}
+
+    def _save_index(self, index_data: dict):
+        temporary_path = self.index_path.with_name(f'{self.index_path.name}.{os.getpid()}.tmp')
+        try:
+            with open(temporary_path, 'w', encoding='utf-8') as index_file:
+                json.dump(index_data, index_file, separators=(',', ':'))
+            os.replace(temporary_path, self.index_path)
+        except OSError as exc:
+            log_message('Unable to save command history index.',
+                        path=self.index_path, exception=exc, debug=True)
+
+    def get_index(self) -> dict:
+        """Get the index, after indexing records appended since the last update.
+
+        Returns:
+            index data with a "segments" dictionary keyed by segment file name
+        """
+        index_data = self._load_index()
+        segments: dict[str, dict] = index_data['segments']
+        segment_paths = self._segment_paths()
+        changed = False
+        segment_names = {segment_path.name for segment_path in segment_paths}
+        for segment_name in list(segments.keys()):
+            if segment_name not in segment_names:
+                del segments[segment_name]
+                changed = True
+        for segment_path in segment_paths:
+            try:
+                segment_size = segment_path.stat().st_size
+            except OSError:
+                continue
+            segment = segments.get(segment_path.name)
+            # Rebuild the segment summary if the file shrank, e.g. was edited.
+            if segment is None or segment_size < segment['size']:
+                segment = {'size': 0, 'first': None, 'last': None, 'commands': {}}
+                segments[segment_path.name] = segment
+            if segment_size == segment['size']:
+                continue
+            for record, end_offset in self._read_records(segment_path, segment['size']):
+                summary = segment['commands'].setdefault(record.command, _new_command_summary())
+                _add_to_command_summary(summary, record)
+                if segment['first'] is None or record.time < segment['first']:
+                    segment['first'] = record.time
+                if segment['last'] is None or record.time > segment['last']:
+                    segment['last'] = record.time
+                segment['size'] = end_offset
+            changed = True
+        if changed:
+            self._save_index(index_data)
+        return index_data
+
+    def list_records(self,
+                     command: str = None,
+                     since: float = None,
+                     failed: bool = False,
+                     limit: int = None,
+                     ) -> list[HistoryRecord]:
+        """List records, most recently recorded first.
+
+        Args:
+            command: optional command name, which also matches sub-commands
+            since: optional minimum time in seconds since the epoch
+            failed: only list records with a non-zero exit status if True
+            limit: optional maximum number of records
+
+        Returns:
+            history records
+        """
+        segments = self.get_index()['segments']
+        records: list[HistoryRecord] = []
+        for segment_name in sorted(segments.keys(), reverse=True):
+            segment = segments[segment_name]
+            if since is not None and (segment['last'] is None or segment['last'] < since):
+                continue
+            command_summaries = [
+                summary for record_command, summary in segment['commands'].items()
+                if _matches_command(record_command, command)
+            ]
+            if not command_summaries:
+                continue
+            if failed and not any(summary['failures'] for summary in command_summaries):
+                continue
+            for record in self._read_records_reversed(self.folder / segment_name, segment['size']):
+                if (_matches_command(record.command, command)
+                        and (since is None or record.time >= since)
+                        and (not failed or record.exit_status != 0)):
+                    records.append(record)
+                    if limit is not None and len(records) >= limit:
+                        return records
+        return records
+
+    def get_statistics(self,
+                       command: str = None,
+                       since: float = None,
+                       failed: bool = False,
+                       ) -> list[HistoryStatistics]:
+        """Aggregate statistics per command.
+
+        Args:
+            command: optional command name, which also matches sub-commands
+            since: optional minimum time in seconds since the epoch
+            failed: only include records with a non-zero exit status if True
+
+        Returns:
+            statistics sorted by command name
+        """
+        segments = self.get_index()['segments']
+        summaries: dict[str, dict] = {}
+        for segment_name, segment in segments.items():
+            if segment['last'] is None or (since is not None and segment['last'] < since):
+                continue
+            if failed and not any(segment_summary['failures']
+                                  for record_command, segment_summary in segment['commands'].items()
+                                  if _matches_command(record_command, command)):
+                continue
+            if not failed and (since is None or segment['first'] >= since):
+                # The whole segment qualifies, so the index summaries suffice.
+                for record_command, segment_summary in segment['commands'].items():
+                    if _matches_command(record_command, command):
+                        _merge_command_summary(
+                            summaries.setdefault(record_command, _new_command_summary()), segment_summary)
+            else:
+                # The segment straddles the time boundary or only failures
+                # count, which summaries can't handle, so read its records.
+                for record, _end_offset in self._read_records(self.folder / segment_name):
+                    if ((since is None or record.time >= since)
+                            and (not failed or record.exit_status != 0)
+                            and _matches_command(record.command, command)):
+                        _add_to_command_summary(
+                            summaries.setdefault(record.command, _new_command_summary()), record)
+        statistics: list[HistoryStatistics] = []
+        for record_command in sorted(summaries.keys()):
+            summary = summaries[record_command]
+            statistics.append(HistoryStatistics(command=record_command,
+                                                count=summary['count'],
+                                                failures=summary['failures'],
+                                                wall_p50=get_histogram_percentile(summary['wall'], 50),
+                                                wall_p95=get_histogram_percentile(summary['wall'], 95),
+                                                cpu_p50=get_histogram_percentile(summary['cpu'], 50),
+                                                cpu_p95=get_histogram_percentile(summary['cpu'], 95),
+                                                max_rss=summary['max_rss'],
+                                                last=summary['last']))
+        return statistics
@@ -51,9 +51,12 @@ def prepare_arguments(
     if not expanded_arguments:
         expanded_arguments = ['help']
     # Don't assume alias sub-command is present or that it's called 'alias'.
+    # Only check the leading command's task, so that other tasks, e.g. stubs
+    # in lazy mode, don't need to be resolved.
     alias_command_name: str | None = None
     for sub_task in runtime_root_task.sub_tasks:
-        if (sub_task.task_function is not None
+        if (sub_task.name == expanded_arguments[0]
+                and sub_task.task_function is not None
                 and sub_task.task_function.__name__ == 'alias'):
             alias_command_name = sub_task.name
     # Special-purpose alias tweak to make sure aliased command arguments are
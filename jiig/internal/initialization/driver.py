@@ -24,7 +24,7 @@ from jiig.constants import TOP_TASK_LABEL, SUB_TASK_LABEL, TOP_TASK_DEST_NAME
 from jiig.driver import Driver, DriverOptions, CLIDriver
 from jiig.types import ToolOptions
 from jiig.util.class_resolver import ClassResolver
-from jiig.util.log import set_log_writer
+from jiig.util.log import abort, set_log_writer
 from jiig.util.options import OPTIONS
 
 
@@ -58,6 +58,12 @@ def prepare_driver(*,
         global_option_names.append('pause')
     if options.enable_keep_files:
         global_option_names.append('keep_files')
+    if options.enable_jobs:
+        global_option_names.append('jobs')
+    if not options.disable_trace:
+        global_option_names.append('trace')
+    if not options.disable_profile_startup:
+        global_option_names.append('profile_startup')
 
     driver_options = DriverOptions(
         raise_exceptions=True,
@@ -65,6 +71,7 @@ def prepare_driver(*,
         sub_task_label=SUB_TASK_LABEL,
         top_task_dest_name=TOP_TASK_DEST_NAME,
         global_option_names=global_option_names,
+        lazy_parsing=options.enable_lazy_parsing,
     )
     if driver_spec is None:
         driver_spec = CLIDriver
@@ -96,5 +103,15 @@ def prepare_driver(*,
         OPTIONS.set_pause(True)
     if options.enable_keep_files and getattr(driver.preliminary_app_data.data, 'KEEP_FILES'):
         OPTIONS.set_keep_files(True)
+    if options.enable_jobs:
+        jobs = getattr(driver.preliminary_app_data.data, 'JOBS', None)
+        if jobs is not None:
+            if not jobs.isdigit() or int(jobs) < 1:
+                abort(f'Parallel jobs option value is not a positive number: {jobs}')
+            OPTIONS.set_jobs(int(jobs))
+    if not options.disable_trace:
+        trace_path = getattr(driver.preliminary_app_data.data, 'TRACE', None)
+        if trace_path is not None:
+            OPTIONS.set_trace_path(trace_path)
 
     return driver
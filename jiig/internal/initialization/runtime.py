@@ -35,6 +35,7 @@ from jiig.types import (
     ToolPaths,
 )
 from jiig.util.class_resolver import ClassResolver
+from jiig.util.configuration import ConfigurationSnapshot
 from jiig.util.log import abort
 from jiig.util.scoped_catalog import ScopedCatalog
 
@@ -51,6 +52,7 @@ def prepare_runtime(*,
                     root_task: RuntimeTask,
                     aliases_catalog: ScopedCatalog,
                     params_catalog: ScopedCatalog,
+                    config: ConfigurationSnapshot | None = None,
                     ) -> Runtime:
     """Prepare runtime object passed to task functions.
 
@@ -66,6 +68,7 @@ def prepare_runtime(*,
         root_task: runtime root task, e.g. for re-parsing command line for aliases
         aliases_catalog: aliases catalog instance
         params_catalog: parameters catalog instance
+        config: optional configuration snapshot
 
     Returns:
         prepared runtime object
@@ -100,6 +103,7 @@ def prepare_runtime(*,
             params_catalog=params_catalog,
             driver=driver,
             root_task=root_task,
+            config=config,
         )
     except Exception as exc:
         abort(f'Exception while creating runtime class {runtime_class.__name__}',
@@ -0,0 +1,468 @@
+# Copyright (C) 2023, Steven Cooper
+#
+# This file is part of Jiig.
+#
+# Jiig is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Jiig is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Jiig.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Persistent compiled task tree manifest.
+
+The manifest holds the fully-resolved runtime task tree, i.e. the results of
+doc string parsing and task function signature inspection, so that later runs
+can rebuild the runtime task tree without importing or inspecting task modules.
+Task modules are only imported when a task function is actually needed.
+
+The manifest is keyed on a signature of the task tree configuration and the
+modification time and size of every source module consulted to build it. Any
+mismatch causes the manifest to be rebuilt. A task function that can no longer
+be imported also invalidates the manifest and rebuilds the task tree.
+"""
+
+import hashlib
+import json
+import operator
+import os
+import sys
+from functools import reduce
+from importlib import import_module
+from inspect import isfunction, ismodule
+from pathlib import Path
+from types import GenericAlias, ModuleType, UnionType
+from typing import Any, Callable, get_args, get_origin
+
+from jiig.task import (
+    BuiltinTask,
+    BuiltinTaskGroup,
+    RuntimeTask,
+    TaskGroup,
+)
+from jiig.types import TaskField
+from jiig.util.default import DefaultValue
+from jiig.util.log import log_error, log_message
+from jiig.util.repetition import Repetition
+
+MANIFEST_FORMAT_VERSION = 1
+
+
+class TaskManifestError(Exception):
+    """Raised when task tree data can not be stored in or loaded from a manifest."""
+    pass
+
+
+def get_task_tree_signature(task_tree: TaskGroup, *package_names: str) -> str:
+    """Produce a signature string for task tree configuration data.
+
+    Args:
+        task_tree: task tree configuration data
+        *package_names: names of packages used to resolve task references
+
+    Returns:
+        signature hash string
+    """
+    def _encode_impl(impl: Any) -> Any:
+        if ismodule(impl):
+            return impl.__name__
+        if isfunction(impl):
+            return f'{impl.__module__}:{impl.__qualname__}'
+        return impl
+
+    def _encode_group(group: TaskGroup) -> dict:
+        return {
+            'name': group.name,
+            'builtin': isinstance(group, BuiltinTaskGroup),
+            'visibility': group.visibility,
+            'description': group.description,
+            'notes': group.notes,
+            'footnotes': group.footnotes,
+            'hints': group.hints,
+            'tasks': [
+                {
+                    'name': task.name,
+                    'builtin': isinstance(task, BuiltinTask),
+                    'impl': _encode_impl(task.impl),
+                    'visibility': task.visibility,
+                    'description': task.description,
+                    'notes': task.notes,
+                    'footnotes': task.footnotes,
+                    'hints': task.hints,
+                }
+                for task in group.tasks
+            ],
+            'groups': [_encode_group(sub_group) for sub_group in group.groups],
+        }
+
+    signature_data = {
+        'packages': list(package_names),
+        'tree': _encode_group(task_tree),
+    }
+    # Unexpected objects use repr(), which may not be stable across runs. That
+    # only causes the manifest to be rebuilt more often than necessary.
+    signature_text = json.dumps(signature_data, sort_keys=True, default=repr)
+    return hashlib.sha256(signature_text.encode('utf-8')).hexdigest()
+
+
+def get_loaded_source_paths(*folders: str | Path) -> list[str]:
+    """Get source file paths for loaded modules in the specified folders.
+
+    Args:
+        *folders: folders containing source files of interest
+
+    Returns:
+        sorted source file path list
+    """
+    folder_prefixes = [os.path.join(os.path.realpath(folder), '') for folder in folders]
+    source_paths: set[str] = set()
+    for module in list(sys.modules.values()):
+        module_path = getattr(module, '__file__', None)
+        if module_path:
+            module_path = os.path.realpath(module_path)
+            for folder_prefix in folder_prefixes:
+                if module_path.startswith(folder_prefix):
+                    source_paths.add(module_path)
+                    break
+    return sorted(source_paths)
+
+
+def get_source_signatures(source_paths: list[str]) -> dict[str, list[int]]:
+    """Get modification time and size for source files.
+
+    Args:
+        source_paths: source file paths
+
+    Returns:
+        dictionary mapping paths to [mtime_ns, size] pairs
+    """
+    signatures: dict[str, list[int]] = {}
+    for source_path in sorted(source_paths):
+        stat_result = os.stat(source_path)
+        signatures[source_path] = [stat_result.st_mtime_ns, stat_result.st_size]
+    return signatures
+
+
+def check_task_manifest(manifest_data: dict, tree_signature: str) -> str | None:
+    """Check if manifest data is current.
+
+    Args:
+        manifest_data: loaded manifest data
+        tree_signature: current task tree signature
+
+    Returns:
+        reason string if the manifest is stale or None if it is current
+    """
+    if manifest_data.get('version') != MANIFEST_FORMAT_VERSION:
+        return 'format version changed'
+    if manifest_data.get('python') != _python_version():
+        return 'Python version changed'
+    if manifest_data.get('tree_signature') != tree_signature:
+        return 'task tree configuration changed'
+    sources = manifest_data.get('sources')
+    if not isinstance(sources, dict):
+        return 'missing source signatures'
+    for source_path, source_signature in sources.items():
+        try:
+            stat_result = os.stat(source_path)
+        except OSError:
+            return f'source file is missing: {source_path}'
+        if [stat_result.st_mtime_ns, stat_result.st_size] != source_signature:
+            return f'source file changed: {source_path}'
+    return None
+
+
+def load_task_manifest(manifest_path: Path,
+                       tree_signature: str,
+                       rebuild: Callable[[], RuntimeTask] = None,
+                       ) -> RuntimeTask | None:
+    """Load runtime task tree from manifest, if it exists and is current.
+
+    If a task function can't be imported later, e.g. because it was moved to
+    a module that wasn't consulted to build the manifest, the manifest is
+    deleted and the task is resolved from a task tree rebuilt by the optional
+    rebuild call-back.
+
+    Args:
+        manifest_path: manifest file path
+        tree_signature: current task tree signature
+        rebuild: optional call-back that builds the runtime task tree, and is
+            expected to save a new manifest
+
+    Returns:
+        runtime root task or None if the manifest is missing or stale
+    """
+    if not manifest_path.is_file():
+        log_message('Task manifest does not exist.', manifest_path, debug=True)
+        return None
+    try:
+        with open(manifest_path, encoding='utf-8') as manifest_file:
+            manifest_data = json.load(manifest_file)
+        reason = check_task_manifest(manifest_data, tree_signature)
+        if reason is not None:
+            log_message(f'Task manifest is stale: {reason}', manifest_path, debug=True)
+            return None
+        root_task = _decode_root(manifest_data['root'],
+                                 _ManifestRebuilder(manifest_path, rebuild))
+    except (OSError, ValueError, TypeError, KeyError, TaskManifestError) as exc:
+        log_message('Ignoring unusable task manifest.', manifest_path, exc, debug=True)
+        return None
+    log_message('Task manifest is current.', manifest_path, debug=True)
+    return root_task
+
+
+def save_task_manifest(manifest_path: Path,
+                       tree_signature: str,
+                       root_task: RuntimeTask,
+                       source_paths: list[str],
+                       ):
+    """Save runtime task tree to manifest, if possible.
+
+    Task trees with data that can't be stored, e.g. adapter closures or
+    non-JSON default values, are not saved.
+
+    Args:
+        manifest_path: manifest file path
+        tree_signature: current task tree signature
+        root_task: fully-resolved runtime root task
+        source_paths: paths of all source modules used to build the task tree
+    """
+    try:
+        manifest_data = {
+            'version': MANIFEST_FORMAT_VERSION,
+            'python': _python_version(),
+            'tree_signature': tree_signature,
+            'sources': get_source_signatures(source_paths),
+            'root': _encode_task(root_task),
+        }
+    except (OSError, TaskManifestError) as exc:
+        log_message('Task tree can not be saved to a manifest.', exc, debug=True)
+        return
+    temporary_path = manifest_path.with_name(f'{manifest_path.name}.{os.getpid()}')
+    try:
+        manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(temporary_path, 'w', encoding='utf-8') as manifest_file:
+            json.dump(manifest_data, manifest_file)
+        # Replace atomically in case other tool processes are running.
+        os.replace(temporary_path, manifest_path)
+        log_message('Task manifest saved.', manifest_path, debug=True)
+    except OSError as exc:
+        # Save errors are non-fatal, since the manifest is only an optimization.
+        log_error(f'Failed to save task manifest: {manifest_path}', str(exc))
+        if temporary_path.exists():
+            temporary_path.unlink()
+
+
+class _ManifestRebuilder:
+    # Invalidates the manifest and rebuilds the task tree once for stub tasks
+    # that fail to resolve.
+
+    def __init__(self, manifest_path: Path, rebuild: Callable[[], RuntimeTask] | None):
+        self.manifest_path = manifest_path
+        self.rebuild = rebuild
+        self.rebuilt = False
+        self.root_task: RuntimeTask | None = None
+
+    def get_task(self, full_name: str) -> RuntimeTask | None:
+        if not self.rebuilt:
+            self.rebuilt = True
+            log_message('Task manifest is stale: task function can not be imported.',
+                        self.manifest_path, debug=True)
+            try:
+                self.manifest_path.unlink()
+            except OSError:
+                pass
+            if self.rebuild is not None:
+                self.root_task = self.rebuild()
+        if self.root_task is None:
+            return None
+        return _find_task(self.root_task, full_name)
+
+
+def _find_task(task: RuntimeTask, full_name: str) -> RuntimeTask | None:
+    if task.full_name == full_name:
+        return task
+    for sub_task in task.sub_tasks or []:
+        found_task = _find_task(sub_task, full_name)
+        if found_task is not None:
+            return found_task
+    return None
+
+
+def _python_version() -> str:
+    return '.'.join(str(part) for part in sys.version_info[:2])
+
+
+def _check_json_value(value: Any, label: str) -> Any:
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, list):
+        for item in value:
+            _check_json_value(item, label)
+        return value
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if not isinstance(key, str):
+                raise TaskManifestError(f'{label}: non-string key: {key!r}')
+            _check_json_value(item, label)
+        return value
+    raise TaskManifestError(f'{label}: unsupported value type: {value!r}')
+
+
+def _encode_reference(value: Any) -> Any:
+    if value is None:
+        return None
+    if isinstance(value, UnionType):
+        return {'union': [_encode_reference(arg) for arg in get_args(value)]}
+    if isinstance(value, GenericAlias):
+        return {'generic': _encode_reference(get_origin(value)),
+                'args': [_encode_reference(arg) for arg in get_args(value)]}
+    module_name = getattr(value, '__module__', None)
+    qualified_name = getattr(value, '__qualname__', None)
+    if not module_name or not qualified_name or '<' in qualified_name:
+        raise TaskManifestError(f'object can not be imported by name: {value!r}')
+    return f'{module_name}:{qualified_name}'
+
+
+def _decode_reference(data: Any) -> Any:
+    if data is None:
+        return None
+    if isinstance(data, dict):
+        if 'union' in data:
+            return reduce(operator.or_, [_decode_reference(arg) for arg in data['union']])
+        if 'generic' in data:
+            origin = _decode_reference(data['generic'])
+            return origin[tuple(_decode_reference(arg) for arg in data['args'])]
+    if not isinstance(data, str) or ':' not in data:
+        raise TaskManifestError(f'bad reference data: {data!r}')
+    module_name, qualified_name = data.split(':', maxsplit=1)
+    return _import_by_name(module_name, qualified_name)
+
+
+def _import_by_name(module_name: str, qualified_name: str) -> Any:
+    try:
+        value: Any = import_module(module_name)
+        for name in qualified_name.split('.'):
+            value = getattr(value, name)
+    except (ImportError, AttributeError) as exc:
+        raise TaskManifestError(f'failed to import {module_name}:{qualified_name}: {exc}')
+    return value
+
+
+def _encode_field(task: RuntimeTask, field: TaskField) -> dict:
+    label = f'{task.full_name}:{field.name}'
+    return {
+        'name': field.name,
+        'description': field.description,
+        'element_type': _encode_reference(field.element_type),
+        'field_type': _encode_reference(field.field_type),
+        'default': ({'value': _check_json_value(field.default.value, label)}
+                    if field.default is not None else None),
+        'repeat': ([field.repeat.minimum, field.repeat.maximum]
+                   if field.repeat is not None else None),
+        'choices': _check_json_value(field.choices, label),
+        'adapters': ([_encode_reference(adapter) for adapter in field.adapters]
+                     if field.adapters is not None else None),
+    }
+
+
+def _decode_field(data: dict) -> TaskField:
+    return TaskField(
+        data['name'],
+        data['description'],
+        _decode_reference(data['element_type']),
+        _decode_reference(data['field_type']),
+        DefaultValue(data['default']['value']) if data['default'] is not None else None,
+        Repetition(*data['repeat']) if data['repeat'] is not None else None,
+        data['choices'],
+        ([_decode_reference(adapter) for adapter in data['adapters']]
+         if data['adapters'] is not None else None),
+    )
+
+
+def _encode_task(task: RuntimeTask) -> dict:
+    task_data = {
+        'name': task.name,
+        'full_name': task.full_name,
+        'visibility': task.visibility,
+        'description': task.description,
+        'notes': _check_json_value(task.notes, task.full_name),
+        'footnotes': _check_json_value(task.footnotes, task.full_name),
+        'hints': _check_json_value(task.driver_hints, task.full_name),
+    }
+    if task.task_function is not None:
+        if not isinstance(task.module, ModuleType):
+            raise TaskManifestError(f'{task.full_name}: task function module is unknown')
+        function_reference = _encode_reference(task.task_function)
+        if function_reference != f'{task.module.__name__}:{task.task_function.__qualname__}':
+            raise TaskManifestError(f'{task.full_name}: task function is not a module member')
+        task_data['function'] = function_reference
+        task_data['fields'] = [_encode_field(task, field) for field in task.fields]
+    else:
+        task_data['sub_tasks'] = [_encode_task(sub_task) for sub_task in task.sub_tasks]
+    return task_data
+
+
+def _decode_root(data: dict, rebuilder: _ManifestRebuilder) -> RuntimeTask:
+    return RuntimeTask.new_tree(
+        description=data['description'],
+        sub_tasks=[_decode_task(sub_data, rebuilder) for sub_data in data['sub_tasks']],
+        notes=data['notes'],
+        footnotes=data['footnotes'],
+        hints=data['hints'],
+    )
+
+
+def _decode_task(data: dict, rebuilder: _ManifestRebuilder) -> RuntimeTask:
+    if 'function' not in data:
+        return RuntimeTask.new_group(
+            name=data['name'],
+            full_name=data['full_name'],
+            description=data['description'],
+            visibility=data['visibility'],
+            sub_tasks=[_decode_task(sub_data, rebuilder) for sub_data in data['sub_tasks']],
+            notes=data['notes'],
+            footnotes=data['footnotes'],
+            hints=data['hints'],
+        )
+    fields = [_decode_field(field_data) for field_data in data['fields']]
+
+    def _resolve_task() -> RuntimeTask | None:
+        # Import the task module only when the task function is needed.
+        module_name, function_name = data['function'].split(':', maxsplit=1)
+        try:
+            task_function = _import_by_name(module_name, function_name)
+        except TaskManifestError as exc:
+            log_message('Failed to import task function from manifest.', str(exc), debug=True)
+            return rebuilder.get_task(data['full_name'])
+        return RuntimeTask.new_task(
+            name=data['name'],
+            full_name=data['full_name'],
+            description=data['description'],
+            task_function=task_function,
+            module=sys.modules[module_name],
+            fields=fields,
+            visibility=data['visibility'],
+            notes=data['notes'],
+            footnotes=data['footnotes'],
+            hints=data['hints'],
+        )
+
+    return RuntimeTask.new_stub(
+        name=data['name'],
+        full_name=data['full_name'],
+        visibility=data['visibility'],
+        sub_tasks=None,
+        hints=data['hints'],
+        resolver=_resolve_task,
+        description=data['description'],
+        fields=fields,
+        notes=data['notes'],
+        footnotes=data['footnotes'],
+    )
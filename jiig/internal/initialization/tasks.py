@@ -20,6 +20,7 @@
 import os
 import re
 from dataclasses import dataclass
+from pathlib import Path
 from inspect import (
     isfunction,
     ismodule,
@@ -27,6 +28,7 @@ from inspect import (
 from types import ModuleType
 from typing import Sequence
 
+import jiig
 from jiig.runtime import Runtime
 from jiig.task import (
     BUILTINS,
@@ -61,6 +63,12 @@ from jiig.util.text.footnotes import (
     FootnoteBuilder,
 )
 
+from .task_manifest import (
+    get_loaded_source_paths,
+    get_task_tree_signature,
+    load_task_manifest,
+    save_task_manifest,
+)
 from .tool_environment import ToolEnvironment
 
 DEFAULT_TASK_DESCRIPTION = '(no task description, e.g. in task doc string)'
@@ -73,12 +81,24 @@ DOC_STRING_GOOGLE_PARAM_REGEX = re.compile(r'^\s*(\w+)\s*:\s*(.*)\s*$')
 def prepare_tasks(
     task_tree: TaskTree,
     tool_env: ToolEnvironment,
+    lazy: bool = False,
+    manifest_path: Path | None = None,
 ) -> RuntimeTask:
     """Prepare runtime task tree.
 
+    In lazy mode the tree is populated with stub tasks that only import and
+    inspect task modules when implementation-dependent data is first accessed,
+    e.g. for tasks on the active command path or for help output.
+
+    If a manifest path is provided, the runtime task tree is loaded from the
+    manifest when it is current. Otherwise, the tree is fully resolved and
+    saved to the manifest for subsequent runs.
+
     Args:
         task_tree: raw input task tree
         tool_env: tool environment data
+        lazy: populate tree with stub tasks that are resolved on demand if True
+        manifest_path: optional task manifest path
 
     Returns:
         runtime task tree root
@@ -86,11 +106,48 @@ def prepare_tasks(
     if OPTIONS.debug:
         task_tree.log_dump_all()
 
-    # Build runtime task hierarchy.
+    if manifest_path is None:
+        return _build_tasks(task_tree, tool_env, lazy=lazy)
+
+    package_names = [tool_env.tool_tasks_package.__name__]
+    if tool_env.jiig_tasks_package is not None:
+        package_names.append(tool_env.jiig_tasks_package.__name__)
+    tree_signature = get_task_tree_signature(task_tree, *package_names)
+
+    def _rebuild() -> RuntimeTask:
+        return _build_tasks(task_tree, tool_env, manifest_path=manifest_path, tree_signature=tree_signature)
+
+    root_task = load_task_manifest(manifest_path, tree_signature, rebuild=_rebuild)
+    if root_task is not None:
+        return root_task
+    return _rebuild()
+
+
+def _build_tasks(task_tree: TaskTree,
+                 tool_env: ToolEnvironment,
+                 lazy: bool = False,
+                 manifest_path: Path | None = None,
+                 tree_signature: str | None = None,
+                 ) -> RuntimeTask:
+    # Build runtime task hierarchy. Building a manifest requires a fully
+    # resolved tree.
     preparer = _RuntimeTaskPreparer(task_tree,
                                     tool_env.tool_tasks_package,
-                                    tool_env.jiig_tasks_package)
-    return preparer.populate()
+                                    tool_env.jiig_tasks_package,
+                                    lazy=lazy and manifest_path is None)
+    root_task = preparer.populate()
+
+    # Don't save a manifest that would hide task resolution errors.
+    if manifest_path is not None and preparer.failure_count == 0:
+        # Track every loaded tool and Jiig module, not only task modules,
+        # since task modules may get task functions from other modules.
+        source_paths = preparer.source_paths.union(
+            get_loaded_source_paths(tool_env.base_folder, Path(jiig.__file__).parent))
+        save_task_manifest(manifest_path,
+                           tree_signature,
+                           root_task,
+                           sorted(source_paths))
+    return root_task
 
 
 @dataclass
@@ -107,11 +164,16 @@ class _RuntimeTaskPreparer:
                  task_tree: TaskTree,
                  tasks_package: ModuleType,
                  jiig_tasks_package: ModuleType | None,
+                 lazy: bool = False,
                  ):
         self.task_tree = task_tree
         self.tasks_package = tasks_package
         self.jiig_tasks_package = jiig_tasks_package
+        self.lazy = lazy
         self.module_resolver = ModuleReferenceResolver()
+        # Source modules and resolution failures are tracked for the manifest.
+        self.source_paths: set[str] = set()
+        self.failure_count = 0
 
     def populate(self) -> RuntimeTask:
         """Convert configuration TaskTree tasks to complete RuntimeTask hierarchy."""
@@ -139,23 +201,40 @@ class _RuntimeTaskPreparer:
                             *names: str):
         """Convert configuration TaskGroup tasks to RuntimeTask hierarchy."""
         for sub_task in task_group.tasks:
-            runtime_sub_task = self._new_task(
-                sub_task,
-                task_group,
-                package,
-                names,
-            )
+            if self.lazy:
+                runtime_sub_task = self._new_task_stub(
+                    sub_task,
+                    task_group,
+                    package,
+                    names,
+                )
+            else:
+                runtime_sub_task = self._new_task(
+                    sub_task,
+                    task_group,
+                    package,
+                    names,
+                )
             if runtime_sub_task is not None:
                 runtime_task_group.sub_tasks.append(runtime_sub_task)
+            else:
+                self.failure_count += 1
         for sub_group in task_group.groups:
             sub_package = self.get_sub_package_reference(package,
                                                          sub_group.name,
                                                          isinstance(sub_group, BuiltinTaskGroup))
-            runtime_sub_group = self._new_group(
-                sub_group,
-                sub_package,
-                names,
-            )
+            if self.lazy:
+                runtime_sub_group = self._new_group_stub(
+                    sub_group,
+                    sub_package,
+                    names,
+                )
+            else:
+                runtime_sub_group = self._new_group(
+                    sub_group,
+                    sub_package,
+                    names,
+                )
             runtime_task_group.sub_tasks.append(runtime_sub_group)
             self.populate_task_group(
                 sub_group,
@@ -227,12 +306,60 @@ class _RuntimeTaskPreparer:
             hints=group.hints,
         )
 
+    def _new_task_stub(self,
+                       task: Task,
+                       task_group: TaskGroup,
+                       package: ModuleReference | None,
+                       names: Sequence[str],
+                       ) -> RuntimeTask:
+        # Nothing is imported until the stub is resolved.
+        return RuntimeTask.new_stub(
+            name=task.name,
+            full_name='.'.join(list(names) + [task.name]),
+            visibility=task.visibility,
+            sub_tasks=None,
+            hints=task.hints,
+            resolver=lambda: self._new_task(task, task_group, package, names),
+        )
+
+    def _new_group_stub(self,
+                        group: TaskGroup,
+                        package: ModuleReference,
+                        names: Sequence[str],
+                        ) -> RuntimeTask:
+        # Sub-tasks are populated by the caller. Only the group package doc
+        # string requires resolution.
+        return RuntimeTask.new_stub(
+            name=group.name,
+            full_name='.'.join(list(names) + [group.name]),
+            visibility=group.visibility,
+            sub_tasks=[],
+            hints=group.hints,
+            resolver=lambda: self._new_group(group, package, names),
+        )
+
     def get_package_doc_string(self, package: ModuleReference) -> str:
         if package is None:
             return ''
-        module = self.module_resolver.resolve(package)
+        module = self.resolve_module(package)
         return (module.__doc__ or '') if module is not None else ''
 
+    def resolve_module(self, reference: ModuleReference) -> ModuleType | None:
+        module = self.module_resolver.resolve(reference)
+        if module is None:
+            self.failure_count += 1
+        else:
+            self.add_source_module(module)
+        return module
+
+    def add_source_module(self, module: ModuleType | None):
+        source_path = getattr(module, '__file__', None)
+        if source_path:
+            self.source_paths.add(source_path)
+        else:
+            # E.g. a namespace package or a module without a source file.
+            self.failure_count += 1
+
     @staticmethod
     def parse_doc_string(doc_string: str | None,
                          app_description: str | None,
@@ -374,8 +501,10 @@ class _RuntimeTaskPreparer:
         if isfunction(reference):
             module = None
             registered_task = TASKS_BY_FUNCTION_ID.get(id(reference))
+            if registered_task is not None:
+                self.add_source_module(registered_task.module)
         else:
-            module = self.module_resolver.resolve(reference)
+            module = self.resolve_module(reference)
             if module is None:
                 return None
             registered_task = TASKS_BY_MODULE_ID.get(id(module))
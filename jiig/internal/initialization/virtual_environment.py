@@ -24,6 +24,7 @@ from pathlib import Path
 from jiig.util.log import log_message
 from jiig.util.python import (
     PYTHON_NATIVE_ENVIRONMENT_NAME,
+    activate_virtual_environment,
     build_virtual_environment,
     install_missing_pip_packages,
 )
@@ -34,6 +35,7 @@ def prepare_virtual_environment(*,
                                 runner_args: list[str],
                                 cli_args: list[str],
                                 packages: list[str] | None,
+                                in_process: bool = False,
                                 ):
     """Check virtual environment, build it, and restart in it as needed.
 
@@ -42,6 +44,8 @@ def prepare_virtual_environment(*,
         runner_args: runner arguments
         cli_args: CLI arguments
         packages: optional packages to install in the virtual environment
+        in_process: activate in the current process, instead of restarting, if
+            the Python versions match
 
     Returns:
         virtual environment root Path
@@ -52,7 +56,9 @@ def prepare_virtual_environment(*,
     else:
         log_message('Activating virtual environment...', debug=True)
         build_virtual_environment(venv_folder, packages=packages, quiet=True)
-        if cli_args:
+        # In-process activation requires matching Python versions.
+        activated = in_process and activate_virtual_environment(venv_folder)
+        if cli_args and not activated:
             # Restart inside the virtual environment with '--' inserted to help parsing.
             args = [str(interpreter_path)] + runner_args
             args.append('--')
@@ -0,0 +1,292 @@
+# Copyright (C) 2023, Steven Cooper
+#
+# This file is part of Jiig.
+#
+# Jiig is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Jiig is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Jiig.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Make-style task result cache.
+
+Tasks declared with @jiig.task(cache=...) are skipped when a cache entry exists
+for the same fingerprint. The fingerprint covers the task name, prepared
+argument data, and either the modification time and size or the content hash
+of each declared input file. Declared output paths must also exist for a cache
+hit, so that deleting outputs forces a re-run.
+
+Entries are small JSON files under the tool build folder, named by
+fingerprint. Hits refresh the entry modification time, which drives
+least-recently-used pruning once the entry count exceeds the cap. The entry
+count is only read from the folder once per process, and is tracked after
+that, so entries added by other processes may delay pruning.
+"""
+
+import glob
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable
+
+from jiig.constants import TASK_CACHE_FOLDER_NAME, TASK_CACHE_MAXIMUM_ENTRIES
+from jiig.util.filesystem import is_glob_pattern
+from jiig.util.log import log_error, log_message
+
+CACHE_FORMAT_VERSION = 1
+_ENTRY_SUFFIX = '.json'
+_HASH_BLOCK_SIZE = 1024 * 1024
+# Entry counts by cache folder, tracked to avoid listing folders for every record.
+_ENTRY_COUNTS: dict[Path, int] = {}
+_ENTRY_COUNTS_LOCK = threading.Lock()
+
+
+@dataclass
+class TaskCacheEntry:
+    """Task result cache entry."""
+    #: Fingerprint that names the entry.
+    fingerprint: str
+    #: Full task name.
+    task_name: str
+    #: Command string that produced the entry.
+    command: str
+    #: Creation time in seconds since the epoch.
+    created: float
+    #: Last use time in seconds since the epoch.
+    used: float
+    #: Number of input files covered by the fingerprint.
+    input_count: int
+
+
+def get_task_cache_folder(build_folder: str | Path) -> Path:
+    """Get the task result cache folder.
+
+    Args:
+        build_folder: tool build folder
+
+    Returns:
+        cache folder path
+    """
+    return Path(build_folder) / TASK_CACHE_FOLDER_NAME
+
+
+def get_input_paths(patterns: Iterable[str]) -> list[str]:
+    """Expand input path patterns to a sorted list of file paths.
+
+    Glob patterns may use "**" for recursion. Folders contribute all the files
+    below them. Non-pattern paths that don't exist are kept, so that creating
+    them later changes the fingerprint.
+
+    Args:
+        patterns: file paths, folder paths, or glob patterns
+
+    Returns:
+        sorted file path list
+    """
+    input_paths: set[str] = set()
+    for pattern in patterns:
+        if is_glob_pattern(pattern):
+            paths = glob.glob(pattern, recursive=True)
+        else:
+            paths = [pattern]
+        for path in paths:
+            if os.path.isdir(path):
+                for folder, _sub_folders, file_names in os.walk(path):
+                    input_paths.update(os.path.join(folder, file_name) for file_name in file_names)
+            else:
+                input_paths.add(path)
+    return sorted(input_paths)
+
+
+def get_input_signatures(input_paths: Iterable[str], hash_content: bool = False) -> dict[str, Any]:
+    """Get signatures for input files.
+
+    Args:
+        input_paths: input file paths
+        hash_content: use a content hash instead of modification time and size
+
+    Returns:
+        dictionary mapping paths to signatures, which are None for missing files
+    """
+    signatures: dict[str, Any] = {}
+    for input_path in input_paths:
+        try:
+            if hash_content:
+                content_hash = hashlib.sha256()
+                with open(input_path, 'rb') as input_file:
+                    while block := input_file.read(_HASH_BLOCK_SIZE):
+                        content_hash.update(block)
+                signatures[input_path] = content_hash.hexdigest()
+            else:
+                stat_result = os.stat(input_path)
+                signatures[input_path] = [stat_result.st_mtime_ns, stat_result.st_size]
+        except OSError:
+            signatures[input_path] = None
+    return signatures
+
+
+def get_task_fingerprint(task_name: str,
+                         task_field_data: dict[str, Any],
+                         input_signatures: dict[str, Any],
+                         ) -> str:
+    """Produce a task result cache fingerprint.
+
+    Args:
+        task_name: full task name
+        task_field_data: prepared task argument data
+        input_signatures: input file signatures
+
+    Returns:
+        fingerprint hash string
+    """
+    fingerprint_data = {
+        'version': CACHE_FORMAT_VERSION,
+        'task': task_name,
+        'arguments': task_field_data,
+        'inputs': input_signatures,
+    }
+    # Unexpected argument objects use str(), e.g. for paths.
+    fingerprint_text = json.dumps(fingerprint_data, sort_keys=True, default=str)
+    return hashlib.sha256(fingerprint_text.encode('utf-8')).hexdigest()
+
+
+class TaskCache:
+    """Task result cache entries in a folder."""
+
+    def __init__(self, folder: str | Path, maximum_entries: int = TASK_CACHE_MAXIMUM_ENTRIES):
+        """Task cache constructor.
+
+        Args:
+            folder: cache folder
+            maximum_entries: entry count above which least-recently-used entries are pruned
+        """
+        self.folder = Path(folder)
+        self.maximum_entries = maximum_entries
+
+    def _entry_path(self, fingerprint: str) -> Path:
+        return self.folder / f'{fingerprint}{_ENTRY_SUFFIX}'
+
+    def check(self, fingerprint: str) -> bool:
+        """Check for an entry and mark it as used if found.
+
+        Args:
+            fingerprint: task fingerprint
+
+        Returns:
+            True if an entry exists
+        """
+        try:
+            os.utime(self._entry_path(fingerprint))
+            return True
+        except OSError:
+            return False
+
+    def record(self, fingerprint: str, task_name: str, command: str, input_count: int):
+        """Record an entry and prune least-recently-used entries above the cap.
+
+        Failures are reported, but are not fatal, since the cache is only an
+        optimization.
+
+        Args:
+            fingerprint: task fingerprint
+            task_name: full task name
+            command: command string
+            input_count: number of input files covered by the fingerprint
+        """
+        entry_data = {
+            'task': task_name,
+            'command': command,
+            'created': time.time(),
+            'inputs': input_count,
+        }
+        entry_path = self._entry_path(fingerprint)
+        temporary_path = entry_path.with_name(f'{entry_path.name}.{os.getpid()}.tmp')
+        try:
+            self.folder.mkdir(parents=True, exist_ok=True)
+            is_new_entry = not entry_path.exists()
+            with open(temporary_path, 'w', encoding='utf-8') as entry_file:
+                json.dump(entry_data, entry_file)
+            os.replace(temporary_path, entry_path)
+        except OSError as exc:
+            log_error('Unable to record task cache entry.', path=entry_path, exception=exc)
+            return
+        with _ENTRY_COUNTS_LOCK:
+            entry_count = _ENTRY_COUNTS.get(self.folder)
+            if entry_count is None:
+                entry_count = self._count_entries()
+            elif is_new_entry:
+                entry_count += 1
+            _ENTRY_COUNTS[self.folder] = entry_count
+        # Only read entries for pruning when there are too many.
+        if entry_count > self.maximum_entries:
+            self.prune(self.maximum_entries)
+
+    def _count_entries(self) -> int:
+        try:
+            with os.scandir(self.folder) as folder_entries:
+                return sum(1 for folder_entry in folder_entries if folder_entry.name.endswith(_ENTRY_SUFFIX))
+        except OSError:
+            return 0
+
+    def list_entries(self) -> list[TaskCacheEntry]:
+        """List cache entries, most recently used first.
+
+        Returns:
+            cache entries
+        """
+        entries: list[TaskCacheEntry] = []
+        try:
+            entry_paths = list(self.folder.glob(f'*{_ENTRY_SUFFIX}'))
+        except OSError:
+            return entries
+        for entry_path in entry_paths:
+            try:
+                used = entry_path.stat().st_mtime
+                with open(entry_path, encoding='utf-8') as entry_file:
+                    entry_data = json.load(entry_file)
+                entries.append(TaskCacheEntry(fingerprint=entry_path.stem,
+                                              task_name=entry_data['task'],
+                                              command=entry_data['command'],
+                                              created=entry_data['created'],
+                                              used=used,
+                                              input_count=entry_data['inputs']))
+            except (OSError, ValueError, KeyError, TypeError) as exc:
+                log_message('Ignoring bad task cache entry.', path=entry_path, exception=exc, debug=True)
+        entries.sort(key=lambda entry: entry.used, reverse=True)
+        return entries
+
+    def prune(self, keep: int = 0, task_name: str = None) -> int:
+        """Delete least-recently-used entries.
+
+        Args:
+            keep: number of most-recently-used entries to keep
+            task_name: optional full task name to restrict pruning to
+
+        Returns:
+            number of deleted entries
+        """
+        entries = self.list_entries()
+        entry_count = len(entries)
+        if task_name is not None:
+            entries = [entry for entry in entries if entry.task_name == task_name]
+        deleted_count = 0
+        for entry in entries[keep:]:
+            try:
+                self._entry_path(entry.fingerprint).unlink()
+                deleted_count += 1
+            except OSError as exc:
+                log_error('Unable to delete task cache entry.', fingerprint=entry.fingerprint, exception=exc)
+        with _ENTRY_COUNTS_LOCK:
+            _ENTRY_COUNTS[self.folder] = entry_count - deleted_count
+        return deleted_count
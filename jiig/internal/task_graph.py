@@ -0,0 +1,157 @@
+# Copyright (C) 2023, Steven Cooper
+#
+# This file is part of Jiig.
+#
+# Jiig is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Jiig is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Jiig.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Task dependency graph ordering and parallel scheduling.
+
+The graph is generic. Nodes have unique keys, dependency keys, and a call-back
+that does the work. Scheduling runs each node once all of its dependencies
+succeeded, with independent nodes running concurrently. After a failure no
+more nodes are started, but running nodes are allowed to finish.
+"""
+
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from dataclasses import dataclass
+from typing import Any, Callable
+
+
+class TaskGraphCycleError(ValueError):
+    """Raised when task dependencies are circular."""
+
+    def __init__(self, cycle: list[str]):
+        """Task graph cycle error constructor.
+
+        Args:
+            cycle: node keys forming the cycle, with the first key repeated last
+        """
+        self.cycle = cycle
+        super().__init__(f'Circular task dependencies: {" -> ".join(cycle)}')
+
+
+@dataclass
+class TaskGraphNode:
+    """Task dependency graph node."""
+    #: Unique node key.
+    key: str
+    #: Keys of nodes that must succeed first.
+    dependencies: list[str]
+    #: Call-back that does the node's work.
+    run: Callable[[], Any]
+
+
+@dataclass
+class TaskGraphResult:
+    """Task dependency graph node result."""
+    #: Node key.
+    key: str
+    #: Value returned by the node call-back.
+    value: Any = None
+    #: Elapsed time in seconds.
+    elapsed: float = 0.0
+    #: Exception raised by the node call-back, including SystemExit.
+    exception: BaseException | None = None
+    #: True if the node was started.
+    started: bool = False
+
+
+def order_task_graph(nodes: dict[str, TaskGraphNode]) -> list[str]:
+    """Order nodes so that dependencies come before dependents.
+
+    Args:
+        nodes: nodes by key
+
+    Returns:
+        ordered node keys
+
+    Raises:
+        TaskGraphCycleError: if dependencies are circular
+        KeyError: if a dependency key is unknown
+    """
+    ordered_keys: list[str] = []
+    # Node states are absent (unvisited), False (in progress), or True (done).
+    states: dict[str, bool] = {}
+
+    def _visit(key: str, path: list[str]):
+        state = states.get(key)
+        if state is True:
+            return
+        if state is False:
+            raise TaskGraphCycleError(path[path.index(key):] + [key])
+        states[key] = False
+        for dependency_key in nodes[key].dependencies:
+            _visit(dependency_key, path + [key])
+        states[key] = True
+        ordered_keys.append(key)
+
+    for node_key in nodes:
+        _visit(node_key, [])
+    return ordered_keys
+
+
+def run_task_graph(nodes: dict[str, TaskGraphNode],
+                   submit: Callable[..., Future],
+                   ) -> list[TaskGraphResult]:
+    """Run nodes concurrently in dependency order.
+
+    Args:
+        nodes: nodes by key
+        submit: executor submit function that bounds concurrency
+
+    Returns:
+        results in dependency order, including nodes that were not started
+
+    Raises:
+        TaskGraphCycleError: if dependencies are circular
+    """
+    ordered_keys = order_task_graph(nodes)
+    results = {key: TaskGraphResult(key) for key in ordered_keys}
+    waiting_counts = {key: len(set(nodes[key].dependencies)) for key in ordered_keys}
+    dependents: dict[str, list[str]] = {key: [] for key in ordered_keys}
+    for key in ordered_keys:
+        for dependency_key in set(nodes[key].dependencies):
+            dependents[dependency_key].append(key)
+    ready_keys = [key for key in ordered_keys if waiting_counts[key] == 0]
+    running: dict[Future, str] = {}
+    failed = False
+
+    def _run_node(node: TaskGraphNode) -> Any:
+        start_time = time.perf_counter()
+        try:
+            return node.run()
+        finally:
+            results[node.key].elapsed = time.perf_counter() - start_time
+
+    while ready_keys or running:
+        if not failed:
+            for key in ready_keys:
+                results[key].started = True
+                running[submit(_run_node, nodes[key])] = key
+        ready_keys = []
+        done_futures, _pending_futures = wait(running, return_when=FIRST_COMPLETED)
+        for future in done_futures:
+            key = running.pop(future)
+            exception = future.exception()
+            if exception is not None:
+                results[key].exception = exception
+                failed = True
+                continue
+            results[key].value = future.result()
+            for dependent_key in dependents[key]:
+                waiting_counts[dependent_key] -= 1
+                if waiting_counts[dependent_key] == 0:
+                    ready_keys.append(dependent_key)
+    return [results[key] for key in ordered_keys]
@@ -0,0 +1,269 @@
+# Copyright (C) 2023, Steven Cooper
+#
+# This file is part of Jiig.
+#
+# Jiig is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Jiig is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Jiig.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Warm worker (zygote) server.
+
+The server is a tool process that has already imported Jiig and prepared the
+task tree. It listens on a Unix socket and forks a child per request. The child
+takes over the client's arguments, working folder, environment and standard
+I/O file descriptors, which are passed using SCM_RIGHTS, and runs the rest of
+the normal startup sequence.
+
+Messages in both directions are a 4-byte big-endian length followed by a JSON
+object. Requests have "argv", "cwd" and "env" members, with the client stdin,
+stdout and stderr file descriptors attached to the first message chunk. A
+request with a "command" of "stop" shuts the server down. The reply is either
+"stale": true, which tells the client to fall back to normal startup because
+task sources changed, or a "pid" from the child, followed by an "exit_code"
+message when the child is done. The client forwards SIGINT and SIGTERM to the
+child pid. The child terminates itself if the client connection drops.
+
+The client, bin/jiigclient, does not import Jiig and duplicates the protocol
+and socket path conventions.
+"""
+
+import hashlib
+import json
+import os
+import signal
+import socket
+import struct
+import sys
+import threading
+import traceback
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterable
+
+from jiig.constants import ZYGOTE_FOLDER_NAME
+from jiig.util.log import log_error, log_message
+from jiig.util.options import OPTIONS
+
+from .initialization.task_manifest import get_source_signatures
+
+_HEADER = struct.Struct('!I')
+_MAXIMUM_MESSAGE_SIZE = 16 * 1024 * 1024
+
+
+@dataclass
+class ZygoteRequest:
+    """Request received from a zygote client."""
+    #: Command line arguments, including the script path.
+    argv: list[str]
+    #: Client working folder.
+    cwd: str
+    #: Client environment.
+    env: dict[str, str]
+    #: Client stdin, stdout and stderr file descriptors.
+    fds: list[int]
+    #: Optional server command, e.g. "stop".
+    command: str | None
+
+
+def get_zygote_socket_path(config_root: Path, script_path: str | Path) -> Path:
+    """Get zygote server socket path for a tool script.
+
+    Args:
+        config_root: Jiig configuration root folder
+        script_path: tool script path
+
+    Returns:
+        socket path
+    """
+    script_hash = hashlib.sha256(os.path.realpath(script_path).encode()).hexdigest()
+    return config_root / ZYGOTE_FOLDER_NAME / f'{script_hash[:16]}.sock'
+
+
+def serve_zygote(socket_path: Path,
+                 source_paths: Iterable[str],
+                 run_request: Callable[[list[str]], None],
+                 idle_timeout: float | None = None,
+                 ):
+    """Serve zygote requests until stopped, idle, or task sources change.
+
+    Args:
+        socket_path: Unix socket path
+        source_paths: source file paths checked for changes before each request
+        run_request: call-back that runs the tool with CLI arguments in a child
+        idle_timeout: seconds without requests before exiting
+    """
+    source_signatures = get_source_signatures(source_paths)
+    # Requests run commands as the server user, so only the user may connect.
+    socket_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    os.chmod(socket_path.parent, 0o700)
+    if socket_path.exists():
+        socket_path.unlink()
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(str(socket_path))
+    os.chmod(socket_path, 0o600)
+    socket_stat = os.stat(socket_path)
+    listener.listen()
+    listener.settimeout(idle_timeout)
+    # Avoid zombie children without having to wait for them.
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, lambda _signal_number, _frame: sys.exit(0))
+    log_message('Zygote server is ready.', socket=socket_path, debug=True)
+    try:
+        while True:
+            try:
+                connection, _address = listener.accept()
+            except socket.timeout:
+                log_message('Zygote server is idle.', debug=True)
+                break
+            connection.settimeout(None)
+            request = _receive_request(connection)
+            if request is None:
+                connection.close()
+                continue
+            if request.command == 'stop':
+                _send_message(connection, {'stopped': True})
+                connection.close()
+                break
+            if _is_stale(source_signatures):
+                log_message('Zygote server is stale.', debug=True)
+                _send_message(connection, {'stale': True})
+                _close_fds(request.fds)
+                connection.close()
+                break
+            pid = os.fork()
+            if pid == 0:
+                listener.close()
+                _run_child(connection, request, run_request)
+                # _run_child() does not return.
+            _close_fds(request.fds)
+            connection.close()
+    finally:
+        listener.close()
+        # Don't remove a socket that belongs to a newer server.
+        try:
+            current_stat = os.stat(socket_path)
+            if (current_stat.st_ino, current_stat.st_dev) == (socket_stat.st_ino, socket_stat.st_dev):
+                socket_path.unlink()
+        except OSError:
+            pass
+
+
+def _is_stale(source_signatures: dict[str, list[int]]) -> bool:
+    # A source file that can no longer be checked, e.g. because it was
+    # deleted, also makes the server stale.
+    try:
+        return get_source_signatures(source_signatures.keys()) != source_signatures
+    except OSError:
+        return True
+
+
+def _run_child(connection: socket.socket,
+               request: ZygoteRequest,
+               run_request: Callable[[list[str]], None],
+               ):
+    exit_code = 1
+    try:
+        signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        # The client relays signals to the pid.
+        _send_message(connection, {'pid': os.getpid()})
+        threading.Thread(target=_watch_connection, args=[connection], daemon=True).start()
+        sys.stdout.flush()
+        sys.stderr.flush()
+        for target_fd, source_fd in enumerate(request.fds):
+            os.dup2(source_fd, target_fd)
+        _close_fds(fd for fd in request.fds if fd > 2)
+        os.chdir(request.cwd)
+        os.environ.clear()
+        os.environ.update(request.env)
+        OPTIONS.read_environment()
+        sys.argv = request.argv
+        try:
+            run_request(request.argv[1:])
+            exit_code = 0
+        except SystemExit as exc:
+            if exc.code is None:
+                exit_code = 0
+            elif isinstance(exc.code, int):
+                exit_code = exc.code
+            else:
+                sys.stderr.write(f'{exc.code}{os.linesep}')
+                exit_code = 1
+        except KeyboardInterrupt:
+            exit_code = 128 + signal.SIGINT
+        except Exception:
+            traceback.print_exc()
+            exit_code = 1
+    finally:
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            _send_message(connection, {'exit_code': exit_code})
+        finally:
+            os._exit(exit_code)
+
+
+def _watch_connection(connection: socket.socket):
+    # Terminate the child if the client goes away, e.g. when it is killed,
+    # since the command would otherwise keep running on the client terminal.
+    try:
+        while connection.recv(1024):
+            pass
+    except OSError:
+        pass
+    os.kill(os.getpid(), signal.SIGTERM)
+
+
+def _receive_request(connection: socket.socket) -> ZygoteRequest | None:
+    fds: list[int] = []
+    try:
+        data, fds, _flags, _address = socket.recv_fds(connection, 65536, 3)
+        if len(data) < _HEADER.size:
+            raise ValueError('truncated request header')
+        size = _HEADER.unpack(data[:_HEADER.size])[0]
+        if size > _MAXIMUM_MESSAGE_SIZE:
+            raise ValueError(f'request is too large: {size}')
+        payload = bytearray(data[_HEADER.size:])
+        while len(payload) < size:
+            chunk = connection.recv(size - len(payload))
+            if not chunk:
+                raise ValueError('truncated request')
+            payload.extend(chunk)
+        message = json.loads(payload)
+        command = message.get('command')
+        if command is None and len(fds) != 3:
+            raise ValueError(f'expected 3 file descriptors, received {len(fds)}')
+        return ZygoteRequest(argv=list(message.get('argv', [])),
+                             cwd=message.get('cwd', '/'),
+                             env=dict(message.get('env', {})),
+                             fds=fds,
+                             command=command)
+    except (OSError, ValueError) as exc:
+        log_error('Bad zygote request.', exception=exc)
+        _close_fds(fds)
+        return None
+
+
+def _send_message(connection: socket.socket, message: dict):
+    payload = json.dumps(message).encode()
+    try:
+        connection.sendall(_HEADER.pack(len(payload)) + payload)
+    except OSError as exc:
+        log_error('Unable to send zygote reply.', exception=exc)
+
+
+def _close_fds(fds: Iterable[int]):
+    for fd in fds:
+        try:
+            os.close(fd)
+        except OSError:
+            pass
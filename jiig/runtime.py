@@ -16,11 +16,16 @@
 # along with Jiig.  If not, see <https://www.gnu.org/licenses/>.
 
 """Runner provides data and an API to task call-back functions.."""
+import subprocess
 import sys
+from concurrent.futures import Future
 from pathlib import Path
 from typing import (
     Any,
+    Awaitable,
     Callable,
+    Iterable,
+    Iterator,
     Self,
     Sequence,
 )
@@ -47,8 +52,11 @@ from .types import (
     ToolMetadata,
     ToolPaths,
 )
+from .util.collections import AttributeDictionary
+from .util.concurrency import WorkerPools, gather_limited
+from .util.configuration import ConfigurationSnapshot
 from .util.log import LogWriter
-from .util.process import shell_command_string
+from .util.process import run_async, shell_command_string
 from .util.scoped_catalog import ScopedCatalog
 
 
@@ -87,6 +95,7 @@ class Runtime(ActionContext):
                  params_catalog: ScopedCatalog,
                  driver: Driver,
                  root_task: RuntimeTask,
+                 config: ConfigurationSnapshot = None,
                  **symbols,
                  ):
         """Construct root runtime context.
@@ -105,31 +114,46 @@ class Runtime(ActionContext):
             params_catalog: tool parameters scoped catalog
             driver: jiig driver, used internally
             root_task: root task for re-parsing command line arguments, used internally
+            config: optional frozen tool configuration, with values available by
+                dotted name, e.g. "tool.name" (default: empty)
             **symbols: initial symbols
         """
         self.help_generator = help_generator
         self.data = data
         self.meta = meta
         self.paths = paths
+        if config is None:
+            config = ConfigurationSnapshot({})
+        self.config = config
         self.internal = _RuntimeInternal(driver, root_task, aliases_catalog, params_catalog)
         self.when_done_callables: list[Callable] = []
-        super().__init__(
-            parent,
-            aliases_path=paths.aliases_catalog_path,
-            author=meta.author,
-            build_folder=paths.build,
-            copyright=meta.copyright,
-            description=meta.description,
-            doc_folder=paths.doc,
-            pip_packages=meta.pip_packages,
-            project_name=meta.project_name,
-            sub_task_label=meta.sub_task_label,
-            tool_name=meta.tool_name,
-            top_task_label=meta.top_task_label,
-            venv_folder=paths.venv,
-            version=meta.version,
-            **symbols,
-        )
+        # Sub-contexts share worker pools with their parent runtime.
+        if isinstance(parent, Runtime):
+            self._worker_pools_owner = parent._worker_pools_owner
+        else:
+            self._worker_pools_owner = self
+        self._worker_pools: WorkerPools | None = None
+        # Runtime sub-contexts inherit the tool symbols from the parent runtime.
+        if isinstance(parent, Runtime):
+            super().__init__(parent, **symbols)
+        else:
+            super().__init__(
+                parent,
+                aliases_path=paths.aliases_catalog_path,
+                author=meta.author,
+                build_folder=paths.build,
+                copyright=meta.copyright,
+                description=meta.description,
+                doc_folder=paths.doc,
+                pip_packages=meta.pip_packages,
+                project_name=meta.project_name,
+                sub_task_label=meta.sub_task_label,
+                tool_name=meta.tool_name,
+                top_task_label=meta.top_task_label,
+                venv_folder=paths.venv,
+                version=meta.version,
+                **symbols,
+            )
 
     def when_done(self, when_done_callable: Callable):
         """Register "when-done" clean-up call-back.
@@ -140,6 +164,9 @@ class Runtime(ActionContext):
         implemented as inner functions within the task run function, and are
         aware of the local stack frame and runtime.
 
+        Async functions are also accepted, and are awaited on the event loop
+        used for async task functions.
+
         Args:
             when_done_callable: callable (accepts no arguments) that is called
                 when done
@@ -170,6 +197,162 @@ class Runtime(ActionContext):
         """
         self.help_generator.generate_help(*names, show_hidden=show_hidden)
 
+    def submit(self,
+               function: Callable,
+               *args,
+               processes: bool = False,
+               **kwargs,
+               ) -> Future:
+        """Submit a function call to a thread or process worker pool.
+
+        Pools are created on demand and shut down when the task is done. Pool
+        size is limited by the jobs option, e.g. from --jobs, or is based on the
+        CPU count.
+
+        Args:
+            function: function to call (must be picklable for processes)
+            *args: positional arguments for function
+            processes: use process pool if True, otherwise thread pool
+            **kwargs: keyword arguments for function
+
+        Returns:
+            future for the result
+        """
+        return self._get_worker_pools().submit(function, *args, processes=processes, **kwargs)
+
+    def parallel_map(self,
+                     function: Callable[[Any], Any],
+                     items: Iterable,
+                     processes: bool = False,
+                     ordered: bool = True,
+                     ) -> Iterator[Any]:
+        """Call function for each item in a thread or process worker pool.
+
+        Calls that haven't started are cancelled if a call fails or aborts.
+
+        Args:
+            function: function to call with each item (must be picklable for
+                processes)
+            items: items to pass to function
+            processes: use process pool if True, otherwise thread pool
+            ordered: provide results in item order if True, otherwise as
+                completed
+
+        Returns:
+            result iterator
+        """
+        return self._get_worker_pools().map(function, items, processes=processes, ordered=ordered)
+
+    def shutdown_workers(self, cancel: bool = False):
+        """Shut down worker pools, if any, waiting for running calls to finish.
+
+        Called automatically when done, or with cancel=True after a failure.
+
+        Args:
+            cancel: cancel calls that haven't started if True
+        """
+        owner = self._worker_pools_owner
+        if owner._worker_pools is not None:
+            owner._worker_pools.shutdown(cancel=cancel)
+
+    def _get_worker_pools(self) -> WorkerPools:
+        owner = self._worker_pools_owner
+        if owner._worker_pools is None:
+            owner._worker_pools = WorkerPools()
+            owner.when_done(owner.shutdown_workers)
+        return owner._worker_pools
+
+    async def run_async(self,
+                        cmd_args: list,
+                        unchecked: bool = False,
+                        working_folder: str | Path = None,
+                        env: dict = None,
+                        host: str = None,
+                        shell: bool = False,
+                        run_always: bool = False,
+                        capture: bool = False,
+                        ) -> subprocess.CompletedProcess:
+        """Run a command asynchronously, e.g. in an async task function.
+
+        Args:
+            cmd_args: raw argument list
+            unchecked: return when an error occurs instead of aborting if True
+            working_folder: folder for the command to run in
+            env: environment variables passed to command process
+            host: host for remote execution
+            shell: run inside a new shell process if True
+            run_always: execute even during a dry run if True
+            capture: capture standard output and error if True
+
+        Returns:
+            CompletedProcess object
+        """
+        return await run_async(cmd_args,
+                               unchecked=unchecked,
+                               working_folder=working_folder,
+                               env=env,
+                               host=host,
+                               shell=shell,
+                               run_always=run_always,
+                               capture=capture)
+
+    async def download_text_async(self,
+                                  url: str,
+                                  headers: dict = None,
+                                  timeout: float = None,
+                                  ) -> str:
+        """Download text from URL asynchronously.
+
+        Args:
+            url: target URL
+            headers: optional HTML headers
+            timeout: timeout in seconds
+
+        Returns:
+            downloaded text
+        """
+        # Imported here, since it pulls in urllib, http, and ssl.
+        from .util.network import download_text_async
+        return await download_text_async(url, headers=headers, timeout=timeout)
+
+    async def download_json_async(self,
+                                  url: str,
+                                  headers: dict = None,
+                                  timeout: float = None,
+                                  ) -> AttributeDictionary:
+        """Download JSON data from URL asynchronously.
+
+        Args:
+            url: target URL
+            headers: optional headers
+            timeout: timeout in seconds
+
+        Returns:
+            downloaded and decoded JSON data
+        """
+        # Imported here, since it pulls in urllib, http, and ssl.
+        from .util.network import download_json_async
+        return await download_json_async(url, headers=headers, timeout=timeout)
+
+    async def gather(self,
+                     *awaitables: Awaitable,
+                     limit: int = None,
+                     return_exceptions: bool = False,
+                     ) -> list[Any]:
+        """Await multiple awaitables with an optional concurrency limit.
+
+        Args:
+            *awaitables: coroutines, e.g. from run_async() calls
+            limit: maximum number of coroutines to run at once (default: no limit)
+            return_exceptions: return exceptions as results instead of raising
+
+        Returns:
+            results in the same order as the awaitables
+        """
+        return await gather_limited(*awaitables,
+                                    limit=limit,
+                                    return_exceptions=return_exceptions)
+
     def context(self, **symbols) -> Self:
         """Create a runtime sub-context.
 
@@ -187,6 +370,8 @@ class Runtime(ActionContext):
                               aliases_catalog=self.internal.aliases_catalog,
                               params_catalog=self.internal.params_catalog,
                               driver=self.internal.driver,
+                              root_task=self.internal.root_task,
+                              config=self.config,
                               **symbols)
 
 
@@ -41,11 +41,17 @@ from .constants import (
     JIIG_CONFIG_ROOT_ENV_VAR,
     JIIG_JSON_CONFIGURATION_NAME,
     JIIG_TOML_CONFIGURATION_NAME,
+    PROFILE_STARTUP_ENV_VAR,
+    PROFILE_STARTUP_JSON_ENV_VAR,
+    PROFILE_STARTUP_PHASES_ENV_VAR,
     SUB_TASK_LABEL,
     TOP_TASK_LABEL,
     VENV_FOLDER_NAME,
+    ZYGOTE_IDLE_TIMEOUT,
+    ZYGOTE_SERVE_ENV_VAR,
 )
-from .task import TaskTree
+from .driver import Driver
+from .task import RuntimeTask, TaskTree
 from .types import (
     ToolCustomizations,
     ToolMetadata,
@@ -55,12 +61,16 @@ from .util.collections import (
     AttributeDictionary,
     make_list,
 )
-from .util.configuration import load_configuration
+from .util.configuration import ConfigurationSnapshot, load_configuration
 from .util.filesystem import search_folder_stack
 from .util.log import (
     abort,
     log_error,
 )
+from .util.options import OPTIONS
+from .util.process import get_subprocess_count
+from .util.profiling import PhaseProfiler
+from .util.tracing import start_tracing, stop_tracing
 
 RE_CONFIG_EMPTY_LINE = re.compile(r'^\s*$')
 RE_CONFIG_COMMENT_LINE = re.compile(r'^\s*#.*\s*$')
@@ -100,19 +110,11 @@ def _read_script_configuration(script_path: Path) -> AttributeDictionary:
 
 class _ConfigurationDataExtractor:
 
-    def __init__(self, raw_data: dict):
-        self.raw_data = raw_data
+    def __init__(self, config: ConfigurationSnapshot):
+        self.config = config
 
     def _get(self, name: str) -> Any | None:
-        raw_data = self.raw_data
-        name_parts = name.split('.')
-        for name_part in name_parts[:-1]:
-            if name_part not in raw_data:
-                return None
-            raw_data = raw_data[name_part]
-            if not isinstance(raw_data, dict):
-                return None
-        return raw_data.get(name_parts[-1])
+        return self.config.get(name)
 
     def boolean(self, name: str, default: bool) -> bool:
         value = self._get(name)
@@ -156,7 +158,7 @@ class _ConfigurationDataExtractor:
         return paths
 
     def task_tree(self, name: str) -> TaskTree:
-        value = self._get(name)
+        value = self.config.get_copy(name)
         if value is None:
             return TaskTree(sub_tasks=[])
         # The extracted value is just the sub-tasks. Wrap so that
@@ -171,7 +173,7 @@ class _ConfigurationDataExtractor:
         return value
 
     def dictionary(self, name: str) -> dict:
-        value = self._get(name)
+        value = self.config.get_copy(name)
         if value is None or not isinstance(value, dict):
             return {}
         return value
@@ -202,6 +204,7 @@ def tool_main(meta: ToolMetadata,
               custom: ToolCustomizations = None,
               param_defaults: dict[str, Any] = None,
               param_comments: dict[str, str] = None,
+              config: ConfigurationSnapshot = None,
               skip_venv_preparation: bool = False,
               ):
     """Start a Jiig tool application based on Python tool data objects.
@@ -223,9 +226,11 @@ def tool_main(meta: ToolMetadata,
         custom: optional tool customizations
         param_defaults: optional tool parameter defaults
         param_comments: optional tool parameter comments
+        config: optional configuration snapshot made available to tasks
         skip_venv_preparation: skip active virtual environment preparation if True
     """
-    from .internal import execution, initialization
+    # Defer loading internal modules until needed.
+    from .internal import initialization
 
     # Provide defaults for missing parameters.
     if options is None:
@@ -237,82 +242,285 @@ def tool_main(meta: ToolMetadata,
     if cli_args is None:
         cli_args = sys.argv[1:]
 
-    # Check, prepare, and invoke virtual environment as needed.
-    if venv_folder is None:
-        venv_folder = meta.jiig_config_root / meta.tool_name / VENV_FOLDER_NAME
-    if not skip_venv_preparation:
-        initialization.prepare_virtual_environment(
+    # Phase timings are always recorded, but only reported when enabled by
+    # environment variable or, once the driver is ready, by global option.
+    profiler = _create_startup_profiler()
+    start_subprocess_count = get_subprocess_count()
+    zygote_server = bool(os.environ.get(ZYGOTE_SERVE_ENV_VAR))
+    driver: Driver | None = None
+    try:
+        # Check, prepare, and invoke virtual environment as needed.
+        if venv_folder is None:
+            venv_folder = meta.jiig_config_root / meta.tool_name / VENV_FOLDER_NAME
+        if not skip_venv_preparation:
+            with profiler.phase('venv'):
+                initialization.prepare_virtual_environment(
+                    venv_folder=venv_folder,
+                    runner_args=runner_args,
+                    # A zygote server has no arguments, but must still restart
+                    # in the virtual environment. The arguments are ignored.
+                    cli_args=cli_args or (['--'] if zygote_server else []),
+                    packages=meta.pip_packages,
+                    in_process=options.enable_in_process_venv,
+                )
+
+        application_kwargs = dict(
+            meta=meta,
+            script_path=script_path,
             venv_folder=venv_folder,
-            runner_args=runner_args,
-            cli_args=cli_args,
-            packages=meta.pip_packages,
+            build_folder=build_folder,
+            doc_folder=doc_folder,
+            test_folder=test_folder,
+            options=options,
+            custom=custom,
+            param_defaults=param_defaults,
+            param_comments=param_comments,
+            config=config,
         )
 
-    # Load driver.
-    driver = initialization.prepare_driver(
-        driver_spec=custom.driver,
-        args=cli_args,
-        tool_name=meta.tool_name,
-        options=options,
-        description=meta.description,
+        if zygote_server:
+            os.environ.pop(ZYGOTE_SERVE_ENV_VAR)
+            _serve_zygote(task_tree=task_tree, **application_kwargs)
+            return
+
+        # Load driver.
+        driver = _prepare_driver(profiler=profiler, cli_args=cli_args, options=options,
+                                 meta=meta, custom=custom)
+
+        # Prepare tool environment, including the Python library load path,
+        # determining the tool base folder path, and importing task package(s).
+        with profiler.phase('tool_environment'):
+            tool_env = initialization.prepare_tool_environment(
+                tool_name=meta.tool_name,
+                script_path=Path(script_path),
+            )
+
+        # Prepare runtime tasks.
+        with profiler.phase('tasks'):
+            runtime_root_task = initialization.prepare_tasks(
+                task_tree=task_tree,
+                tool_env=tool_env,
+                lazy=options.enable_lazy_tasks,
+                manifest_path=meta.tasks_manifest_path if options.enable_task_manifest else None,
+            )
+
+        _run_application(profiler=profiler,
+                         driver=driver,
+                         base_folder=tool_env.base_folder,
+                         runtime_root_task=runtime_root_task,
+                         **application_kwargs)
+    finally:
+        profiler.report()
+        _save_trace(profiler)
+        if not zygote_server and not options.disable_history:
+            _record_history(profiler.start_time, start_subprocess_count, meta, driver, cli_args)
+
+
+def _create_startup_profiler() -> PhaseProfiler:
+    return PhaseProfiler(
+        'Startup profile',
+        enabled=(os.environ.get(PROFILE_STARTUP_ENV_VAR, '').lower() in ['yes', 'true', '1']
+                 or bool(os.environ.get(PROFILE_STARTUP_JSON_ENV_VAR))),
+        json_path=os.environ.get(PROFILE_STARTUP_JSON_ENV_VAR),
+        profiled_phases=make_list(os.environ.get(PROFILE_STARTUP_PHASES_ENV_VAR), sep=','),
     )
 
-    # Prepare tool environment, including the Python library load path,
-    # determining the tool base folder path, and importing task package(s).
-    tool_env = initialization.prepare_tool_environment(
-        tool_name=meta.tool_name,
-        script_path=Path(script_path),
-    )
 
-    # Prepare runtime tasks.
-    runtime_root_task = initialization.prepare_tasks(
-        task_tree=task_tree,
-        tool_env=tool_env,
-    )
+def _prepare_driver(*,
+                    profiler: PhaseProfiler,
+                    cli_args: list[str],
+                    options: ToolOptions,
+                    meta: ToolMetadata,
+                    custom: ToolCustomizations,
+                    ) -> Driver:
+    from .internal import initialization
+    with profiler.phase('driver'):
+        driver = initialization.prepare_driver(
+            driver_spec=custom.driver,
+            args=cli_args,
+            tool_name=meta.tool_name,
+            options=options,
+            description=meta.description,
+        )
+    if (not options.disable_profile_startup
+            and getattr(driver.preliminary_app_data.data, 'PROFILE_STARTUP', False)):
+        profiler.enable()
+    if OPTIONS.trace_path:
+        start_tracing(start_time=profiler.start_time)
+    return driver
+
+
+def _save_trace(profiler: PhaseProfiler):
+    # Save the trace, if tracing, with startup phases as spans.
+    recorder = stop_tracing()
+    if recorder is None:
+        return
+    for phase in profiler.phases:
+        phase_start_time = profiler.start_time + phase.start
+        recorder.add_span(phase.name,
+                          'startup',
+                          phase_start_time,
+                          phase_start_time + phase.elapsed,
+                          {'imports': phase.imports})
+    recorder.save(OPTIONS.trace_path)
+
+
+def _record_history(start_time: float,
+                    start_subprocess_count: int,
+                    meta: ToolMetadata,
+                    driver: Driver | None,
+                    cli_args: list[str],
+                    ):
+    # Record the command, if one was resolved, with the exit status taken from
+    # the exception in flight, if any.
+    if driver is None or driver.app_data is None:
+        return
+    from .internal.history import CommandAccounting, HistoryStore, ResourceUsage
+    exception = sys.exc_info()[1]
+    if exception is None:
+        exit_status = 0
+    elif isinstance(exception, SystemExit):
+        if exception.code is None:
+            exit_status = 0
+        elif isinstance(exception.code, int):
+            exit_status = exception.code
+        else:
+            exit_status = 1
+    else:
+        exit_status = 1
+    command = ' '.join(task.name for task in driver.app_data.task_stack[1:])
+    # CPU times are counted from process start, which for a zygote child is
+    # the fork, so that resource usage needn't be sampled before the command.
+    accounting = CommandAccounting(start_time=start_time,
+                                   start_usage=ResourceUsage(0.0, 0.0, 0.0, 0.0, 0, 0),
+                                   start_subprocess_count=start_subprocess_count)
+    record = accounting.create_record(command, cli_args, exit_status)
+    HistoryStore(meta.history_folder).append(record)
+
+
+def _run_application(*,
+                     profiler: PhaseProfiler,
+                     driver: Driver,
+                     base_folder: Path,
+                     runtime_root_task: RuntimeTask,
+                     meta: ToolMetadata,
+                     script_path: str | Path,
+                     venv_folder: Path,
+                     build_folder: str | Path | None,
+                     doc_folder: str | Path | None,
+                     test_folder: str | Path | None,
+                     options: ToolOptions,
+                     custom: ToolCustomizations,
+                     param_defaults: dict[str, Any] | None,
+                     param_comments: dict[str, str] | None,
+                     config: ConfigurationSnapshot | None,
+                     ):
+    from .internal import execution, initialization
 
     # Create aliases and parameters catalog classes.
-    aliases_catalog = initialization.create_aliases_catalog(
-        meta.aliases_catalog_path,
-    )
-    params_catalog = initialization.create_params_catalog(
-        catalog_path=meta.params_catalog_path,
-        defaults=param_defaults,
-        comments=param_comments,
-    )
+    with profiler.phase('catalogs'):
+        aliases_catalog = initialization.create_aliases_catalog(
+            meta.aliases_catalog_path,
+        )
+        params_catalog = initialization.create_params_catalog(
+            catalog_path=meta.params_catalog_path,
+            defaults=param_defaults,
+            comments=param_comments,
+        )
 
     # Expand alias as needed and provide 'help' as default command.
-    arguments = initialization.prepare_arguments(
-        arguments=driver.preliminary_app_data.additional_arguments,
-        aliases_catalog=aliases_catalog,
-        runtime_root_task=runtime_root_task,
-    )
+    with profiler.phase('arguments'):
+        arguments = initialization.prepare_arguments(
+            arguments=driver.preliminary_app_data.additional_arguments,
+            aliases_catalog=aliases_catalog,
+            runtime_root_task=runtime_root_task,
+        )
 
     # Initialize driver to access app data object and help generator.
-    driver.initialize_application(
-        arguments=arguments,
-        root_task=runtime_root_task,
-    )
+    with profiler.phase('application'):
+        driver.initialize_application(
+            arguments=arguments,
+            root_task=runtime_root_task,
+        )
 
     # Initialize application and prepare Runtime API object.
-    runtime = initialization.prepare_runtime(
-        runtime_spec=custom.runtime,
-        meta=meta,
-        venv_folder=venv_folder,
-        base_folder=tool_env.base_folder,
-        build_folder=build_folder,
-        doc_folder=doc_folder,
-        test_folder=test_folder,
-        driver=driver,
-        aliases_catalog=aliases_catalog,
-        params_catalog=params_catalog,
-        root_task=runtime_root_task,
-    )
+    with profiler.phase('runtime'):
+        runtime = initialization.prepare_runtime(
+            runtime_spec=custom.runtime,
+            meta=meta,
+            venv_folder=venv_folder,
+            base_folder=base_folder,
+            build_folder=build_folder,
+            doc_folder=doc_folder,
+            test_folder=test_folder,
+            driver=driver,
+            aliases_catalog=aliases_catalog,
+            params_catalog=params_catalog,
+            root_task=runtime_root_task,
+            config=config,
+        )
 
     # Execute application.
-    execution.execute_application(
-        task_stack=driver.app_data.task_stack,
-        runtime=runtime,
+    with profiler.phase('execution'):
+        execution.execute_application(
+            task_stack=driver.app_data.task_stack,
+            runtime=runtime,
+        )
+
+
+def _serve_zygote(*,
+                  task_tree: TaskTree,
+                  meta: ToolMetadata,
+                  script_path: str | Path,
+                  options: ToolOptions,
+                  custom: ToolCustomizations,
+                  **application_kwargs,
+                  ):
+    # Prepare everything that doesn't depend on arguments and serve requests
+    # in forked children that run the remaining startup phases.
+    from .internal import initialization
+    from .internal.initialization.task_manifest import get_loaded_source_paths
+    from .internal.zygote import get_zygote_socket_path, serve_zygote
+    tool_env = initialization.prepare_tool_environment(
+        tool_name=meta.tool_name,
+        script_path=Path(script_path),
     )
+    # Fully resolve tasks so that children don't need to import task modules.
+    runtime_root_task = initialization.prepare_tasks(
+        task_tree=task_tree,
+        tool_env=tool_env,
+    )
+    source_folders = [tool_env.base_folder, Path(__file__).parent]
+    source_paths = get_loaded_source_paths(*source_folders)
+    source_paths.append(os.path.realpath(script_path))
+
+    def _run_request(cli_args: list[str]):
+        profiler = _create_startup_profiler()
+        start_subprocess_count = get_subprocess_count()
+        driver: Driver | None = None
+        try:
+            driver = _prepare_driver(profiler=profiler, cli_args=cli_args, options=options,
+                                     meta=meta, custom=custom)
+            _run_application(profiler=profiler,
+                             driver=driver,
+                             base_folder=tool_env.base_folder,
+                             runtime_root_task=runtime_root_task,
+                             meta=meta,
+                             script_path=script_path,
+                             options=options,
+                             custom=custom,
+                             **application_kwargs)
+        finally:
+            profiler.report()
+            _save_trace(profiler)
+            if not options.disable_history:
+                _record_history(profiler.start_time, start_subprocess_count,
+                                meta, driver, cli_args)
+
+    serve_zygote(get_zygote_socket_path(meta.jiig_config_root, script_path),
+                 source_paths,
+                 _run_request,
+                 idle_timeout=ZYGOTE_IDLE_TIMEOUT)
 
 
 def jiigrun_main(skip_venv_check: bool = False):
@@ -337,9 +545,9 @@ def jiigrun_main(skip_venv_check: bool = False):
     script_path = Path(runner_args[1]).resolve()
 
     # TOML configuration data can either be embedded in the script or in a
-    # separate file.
-    config_data = _read_script_configuration(script_path)
-    extractor = _ConfigurationDataExtractor(config_data)
+    # separate file. The frozen snapshot is shared by option extraction and tasks.
+    config = ConfigurationSnapshot(_read_script_configuration(script_path))
+    extractor = _ConfigurationDataExtractor(config)
 
     options = ToolOptions(
         disable_debug=extractor.boolean('options.disable_debug', False),
@@ -347,6 +555,14 @@ def jiigrun_main(skip_venv_check: bool = False):
         disable_verbose=extractor.boolean('options.disable_verbose', False),
         enable_pause=extractor.boolean('options.enable_pause', False),
         enable_keep_files=extractor.boolean('options.enable_keep_files', False),
+        enable_jobs=extractor.boolean('options.enable_jobs', False),
+        disable_trace=extractor.boolean('options.disable_trace', False),
+        disable_profile_startup=extractor.boolean('options.disable_profile_startup', False),
+        disable_history=extractor.boolean('options.disable_history', False),
+        enable_lazy_tasks=extractor.boolean('options.enable_lazy_tasks', False),
+        enable_task_manifest=extractor.boolean('options.enable_task_manifest', False),
+        enable_lazy_parsing=extractor.boolean('options.enable_lazy_parsing', False),
+        enable_in_process_venv=extractor.boolean('options.enable_in_process_venv', False),
     )
 
     custom = ToolCustomizations(
@@ -389,5 +605,6 @@ def jiigrun_main(skip_venv_check: bool = False):
         custom=custom,
         param_defaults=param_defaults,
         param_comments=param_comments,
+        config=config,
         skip_venv_preparation=skip_venv_check,
     )
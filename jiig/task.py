@@ -19,6 +19,7 @@
 
 import os
 import re
+import shlex
 import sys
 import textwrap
 from dataclasses import dataclass
@@ -29,6 +30,7 @@ from inspect import (
 from types import ModuleType
 from typing import (
     Any,
+    Callable,
     Self,
     Sequence,
     TypeVar,
@@ -38,6 +40,10 @@ from .constants import (
     BUILTIN_TASK_NAME_FORMAT,
     BUILTIN_TASK_NAME_PATTERN,
 )
+from .internal.field_conversion import (
+    FieldConverter,
+    compile_field_converters,
+)
 from .types import (
     TaskField,
     TaskFunction,
@@ -495,11 +501,20 @@ class RegisteredTask:
     description: str | None
     notes: NotesSpec | None
     footnotes: NotesDict | None
+    fan_out: str | None = None
+    cache: bool = False
+    cache_inputs: list[str] | None = None
+    cache_outputs: list[str] | None = None
+    cache_content: bool = False
+    depends: list[tuple[str, list[str]]] | None = None
 
 
 TASKS_BY_FUNCTION_ID: dict[int, RegisteredTask] = {}
 TASKS_BY_MODULE_ID: dict[int, RegisteredTask] = {}
 
+# Placeholder for RuntimeTask data that is not available until resolution.
+_UNRESOLVED = object()
+
 
 class RuntimeTask:
     """Runtime task information, based on a registered class.
@@ -526,6 +541,8 @@ class RuntimeTask:
                  notes: NotesList | None = None,
                  footnotes: NotesDict | None = None,
                  driver_hints: dict | None = None,
+                 # For lazily-resolved (stub) task.
+                 resolver: Callable[[], Self | None] | None = None,
                  ):
         """Construct runtime task with resolved function/module references.
 
@@ -544,18 +561,110 @@ class RuntimeTask:
             notes: optional notes
             footnotes: optional footnotes
             driver_hints: optional driver hints
+            resolver: optional call-back that provides the fully-resolved task
+                the first time implementation-dependent data is accessed
         """
         self.name = name
         self.full_name = full_name
         self.visibility = visibility
-        self.description = description
-        self.task_function = task_function
-        self.module = module
-        self.fields = fields or []
         self.sub_tasks = list(sub_tasks) if sub_tasks is not None else []
-        self.notes = notes or []
-        self.footnotes = footnotes or {}
         self.driver_hints = driver_hints or {}
+        self._description = description
+        self._task_function = task_function
+        self._module = module
+        self._fields = fields if fields is _UNRESOLVED else (fields or [])
+        self._notes = notes if notes is _UNRESOLVED else (notes or [])
+        self._footnotes = footnotes if footnotes is _UNRESOLVED else (footnotes or {})
+        self._resolver = resolver
+        self._field_converters: list[FieldConverter] | None = None
+
+    def is_resolved(self, *attribute_names: str) -> bool:
+        """Check if implementation-dependent data is available without resolution.
+
+        Args:
+            *attribute_names: optional attribute names to check, e.g. 'fields'
+                (default: check all)
+
+        Returns:
+            True if the data is available without importing or inspecting the
+            implementation
+        """
+        if self._resolver is None:
+            return True
+        if not attribute_names:
+            return False
+        for attribute_name in attribute_names:
+            if getattr(self, f'_{attribute_name}') is _UNRESOLVED:
+                return False
+        return True
+
+    def resolve(self):
+        """Resolve stub task by importing and inspecting the implementation.
+
+        Does nothing if the task is already resolved.
+        """
+        if self._resolver is None:
+            return
+        resolver = self._resolver
+        # Clear the resolver first to guard against recursion.
+        self._resolver = None
+        resolved_task = resolver()
+        if resolved_task is None:
+            abort(f'Failed to resolve task:', task=self.full_name)
+        self._description = resolved_task.description
+        self._task_function = resolved_task.task_function
+        self._module = resolved_task.module
+        self._fields = resolved_task.fields
+        self._field_converters = None
+        self._notes = resolved_task.notes
+        self._footnotes = resolved_task.footnotes
+
+    def _get_resolved(self, attribute_name: str) -> Any:
+        value = getattr(self, attribute_name)
+        if value is _UNRESOLVED:
+            self.resolve()
+            value = getattr(self, attribute_name)
+        return value
+
+    @property
+    def description(self) -> str:
+        """Task description (may resolve stub task)."""
+        return self._get_resolved('_description')
+
+    @property
+    def task_function(self) -> TaskFunction | None:
+        """Task implementation function (may resolve stub task)."""
+        return self._get_resolved('_task_function')
+
+    @property
+    def module(self) -> ModuleType | None:
+        """Module containing task function (may resolve stub task)."""
+        return self._get_resolved('_module')
+
+    @property
+    def fields(self) -> list[TaskField]:
+        """Task fields (may resolve stub task)."""
+        return self._get_resolved('_fields')
+
+    @property
+    def field_converters(self) -> list[FieldConverter]:
+        """Compiled field argument converters (may resolve stub task).
+
+        Compiled on first access, i.e. only for tasks that get executed.
+        """
+        if self._field_converters is None:
+            self._field_converters = compile_field_converters(self.fields)
+        return self._field_converters
+
+    @property
+    def notes(self) -> NotesList:
+        """Task notes (may resolve stub task)."""
+        return self._get_resolved('_notes')
+
+    @property
+    def footnotes(self) -> NotesDict:
+        """Task footnotes (may resolve stub task)."""
+        return self._get_resolved('_footnotes')
 
     @classmethod
     def new_task(cls,
@@ -602,6 +711,56 @@ class RuntimeTask:
             driver_hints=hints,
         )
 
+    @classmethod
+    def new_stub(cls,
+                 *,
+                 name: str,
+                 full_name: str,
+                 visibility: int,
+                 sub_tasks: Sequence[Self] | None,
+                 hints: dict,
+                 resolver: Callable[[], Self | None],
+                 description: str | None = None,
+                 fields: list[TaskField] | None = None,
+                 notes: NotesList | None = None,
+                 footnotes: NotesDict | None = None,
+                 ) -> Self:
+        """Create stub RuntimeTask that is resolved on demand.
+
+        Only the data available without importing the implementation is
+        provided up front. The resolver is called when missing data, e.g. the
+        task function, is first accessed.
+
+        Args:
+            name: task name
+            full_name: full task name
+            visibility: visibility (0=normal, 1=secondary, 2=hidden)
+            sub_tasks: sub-tasks (for task group only)
+            hints: driver hints
+            resolver: call-back that returns the fully-resolved task or None
+            description: optional description, if known
+            fields: optional task fields, if known
+            notes: optional notes list, if known
+            footnotes: optional footnotes dictionary, if known
+
+        Returns:
+            new stub RuntimeTask
+        """
+        return RuntimeTask(
+            name=name,
+            full_name=full_name,
+            visibility=visibility,
+            description=description if description is not None else _UNRESOLVED,
+            task_function=_UNRESOLVED,
+            module=_UNRESOLVED,
+            fields=fields if fields is not None else _UNRESOLVED,
+            sub_tasks=sub_tasks,
+            notes=notes if notes is not None else _UNRESOLVED,
+            footnotes=footnotes if footnotes is not None else _UNRESOLVED,
+            driver_hints=hints,
+            resolver=resolver,
+        )
+
     @classmethod
     def new_group(cls,
                   *,
@@ -710,15 +869,49 @@ def task(
     description: str = None,
     notes: NotesSpec = None,
     footnotes: NotesDict = None,
+    fan_out: str = None,
+    cache: bool | str | list[str] = None,
+    cache_outputs: str | list[str] = None,
+    cache_content: bool = False,
+    depends: list[str | Sequence[str]] = None,
 ) -> TaskFunction:
     """Task function decorator.
 
+    Decorated functions may be async, in which case they run on an event loop
+    that is shared by the task stack.
+
+    A fan_out field name causes the task function to be called once per item
+    of that repeated field, concurrently, with a single-item list as the field
+    value. Async functions run on the event loop and others run in the runtime
+    thread pool. Failures are reported together after all items are done.
+
+    A cache value enables make-style result caching, which skips the task
+    function when it previously succeeded with the same arguments and input
+    files. It may be True or input file paths, folders, or glob patterns.
+    Output paths, if provided, must all exist to skip the function. Paths may
+    reference runtime symbols, e.g. "{doc_folder}", and relative paths are
+    relative to the working folder. Caching is not supported for fan_out tasks.
+
+    Dependencies are other tasks that must succeed first. Each one is a full
+    task name, e.g. "doc.html", optionally followed by command line arguments,
+    either in the same string or as a sequence of strings. Shared dependencies
+    only run once, and independent dependencies run concurrently, bounded by
+    the jobs option. Only the dependency task functions run, not the functions
+    of their parent task groups.
+
     Args:
         naked_task_function: not used explicitly, only non-None for naked @task
             functions
         description: task description (default: parsed from doc string)
         notes: optional note or notes text
         footnotes: optional footnotes dictionary
+        fan_out: optional repeated field name for calling the function per item
+        cache: enable result caching if True or input path(s) that are checked
+            for changes
+        cache_outputs: optional output path(s) required for using cached results
+        cache_content: check input file content hashes instead of modification
+            times and sizes if True
+        depends: optional task dependencies, with optional arguments
 
     Returns:
         wrapper task function
@@ -731,6 +924,11 @@ def task(
                 task_description=description,
                 task_notes=notes,
                 task_footnotes=footnotes,
+                task_fan_out=fan_out,
+                task_cache=cache,
+                task_cache_outputs=cache_outputs,
+                task_cache_content=cache_content,
+                task_depends=depends,
             )
             return task_function
 
@@ -746,12 +944,20 @@ def _register_task_function(
         task_description: str | None = None,
         task_notes: NotesSpec = None,
         task_footnotes: NotesDict = None,
+        task_fan_out: str = None,
+        task_cache: bool | str | list[str] = None,
+        task_cache_outputs: str | list[str] = None,
+        task_cache_content: bool = False,
+        task_depends: list[str | Sequence[str]] = None,
 ):
     # task_function.__module__ may be None, e.g. for tasks in a Jiig script.
     module_name = getattr(task_function, '__module__')
     if module_name == 'builtins':
         module_name = '<tool>'
     module = sys.modules.get(module_name)
+    if task_fan_out is not None and task_cache:
+        abort('Task result caching is not supported for fan-out tasks.',
+              task=f'{module_name}.{task_function.__name__}()')
     registered_task = RegisteredTask(
         task_function=task_function,
         module=module,
@@ -759,12 +965,28 @@ def _register_task_function(
         description=task_description,
         notes=task_notes,
         footnotes=task_footnotes,
+        fan_out=task_fan_out,
+        cache=bool(task_cache),
+        cache_inputs=make_list(task_cache, strings=True) if task_cache and task_cache is not True else None,
+        cache_outputs=make_list(task_cache_outputs, strings=True, allow_none=True),
+        cache_content=task_cache_content,
+        depends=[_parse_dependency(dependency) for dependency in task_depends] if task_depends else None,
     )
     TASKS_BY_FUNCTION_ID[id(task_function)] = registered_task
     if module is not None:
         TASKS_BY_MODULE_ID[id(registered_task.module)] = registered_task
 
 
+def _parse_dependency(dependency: str | Sequence[str]) -> tuple[str, list[str]]:
+    if isinstance(dependency, str):
+        dependency_parts = shlex.split(dependency)
+    else:
+        dependency_parts = [str(part) for part in dependency]
+    if not dependency_parts:
+        abort('Empty task dependency.')
+    return dependency_parts[0], dependency_parts[1:]
+
+
 class _TaskGroupSubTaskScrubber:
 
     def __init__(self):
@@ -951,6 +1173,23 @@ BUILTINS: dict[str, Task | TaskGroup] = {
         visibility=1,
     ),
 
+    #: Task for running a batch of commands in one process.
+    'batch': Task(
+        name='batch',
+        cli_options={'keep_going': ['-k', '--keep-going']},
+        visibility=1,
+    ),
+
+    #: Task group for managing cached task results.
+    'cache': TaskGroup(
+        name='cache',
+        sub_tasks=[
+            Task(name='list'),
+            Task(name='prune', cli_options={'keep': ['-k', '--keep']}),
+        ],
+        visibility=1,
+    ),
+
     #: Task group for building a distribution.
     'build': TaskGroup(
         name='build',
@@ -967,6 +1206,19 @@ BUILTINS: dict[str, Task | TaskGroup] = {
         cli_options={'all_tasks': ['-a', '--all']},
     ),
 
+    #: Task for listing command history and resource usage statistics.
+    'history': Task(
+        name='history',
+        cli_options={
+            'command': ['-c', '--command'],
+            'failed': ['-f', '--failed'],
+            'limit': ['-n', '--limit'],
+            'since': ['-s', '--since'],
+            'stats': ['--stats'],
+        },
+        visibility=1,
+    ),
+
     #: Task group for generating and serving documentation.
     'doc': TaskGroup(
         name='doc',
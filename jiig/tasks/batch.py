@@ -0,0 +1,82 @@
+# Copyright (C) 2023, Steven Cooper
+#
+# This file is part of Jiig.
+#
+# Jiig is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Jiig is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Jiig.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Run a batch of commands in one process."""
+
+import shlex
+import sys
+
+import jiig
+from jiig.internal.execution import execute_command
+from jiig.util.log import log_error, log_message
+
+
+@jiig.task
+def batch(
+    runtime: jiig.Runtime,
+    keep_going: jiig.f.boolean() = False,
+    path: jiig.f.text() = None,
+):
+    """Run commands read from a file or stdin in a single process.
+
+    Each line holds one command, i.e. the arguments that would follow the tool
+    name on the command line. Lines are split using shell-like syntax, and
+    blank lines and "#" comments are ignored. Aliases are expanded.
+
+    Commands share the loaded task tree and configuration, which avoids the
+    start-up cost of running the tool once per command. Each command receives
+    its own argument data and clean-up call-backs. Global options, e.g.
+    --dry-run, are only accepted before the batch command, not in batch lines.
+
+    Args:
+        runtime: jiig Runtime API
+        keep_going: keep running commands after a command fails
+        path: command file path, or "-" or omitted for stdin
+    """
+    if path is None or path == '-':
+        lines = sys.stdin.readlines()
+    else:
+        try:
+            with open(path, encoding='utf-8') as batch_file:
+                lines = batch_file.readlines()
+        except OSError as exc:
+            runtime.abort('Unable to read batch file.', path=path, exception=exc)
+    failures: list[tuple[int, str, int]] = []
+    command_count = 0
+    for line_number, line in enumerate(lines, start=1):
+        try:
+            arguments = shlex.split(line, comments=True)
+        except ValueError as exc:
+            log_error(f'Bad batch command: {exc}', line=line_number)
+            command_count += 1
+            failures.append((line_number, line.strip(), 2))
+            if not keep_going:
+                break
+            continue
+        if not arguments:
+            continue
+        command_count += 1
+        log_message(f'Batch command: {shlex.join(arguments)}', debug=True)
+        exit_code = execute_command(arguments, runtime)
+        if exit_code != 0:
+            failures.append((line_number, shlex.join(arguments), exit_code))
+            if not keep_going:
+                break
+    if failures:
+        runtime.abort(f'Batch commands failed: {len(failures)} of {command_count}',
+                      *[f'line {line_number}: {command} (exit status {exit_code})'
+                        for line_number, command, exit_code in failures])
@@ -17,24 +17,43 @@
 
 """Build source distribution."""
 
-import os
+import sys
 from pathlib import Path
 
 import jiig
+from jiig.util.process import run
 
+_SOURCE_FOLDER = Path(jiig.__file__).parent.parent
 
-@jiig.task
+
+@jiig.task(
+    cache=[
+        str(_SOURCE_FOLDER / 'pyproject.toml'),
+        str(_SOURCE_FOLDER / 'README.md'),
+        str(_SOURCE_FOLDER / 'LICENSE'),
+        str(_SOURCE_FOLDER / 'jiig' / '**' / '*.py'),
+    ],
+    cache_outputs=str(_SOURCE_FOLDER / 'dist'),
+)
 def sdist(
     runtime: jiig.Runtime,
 ):
     """Build the source distribution.
 
+    Results are cached until the project file, README, license, or package
+    sources change. The build exit status is the tool exit status.
+
     Args:
         runtime: Jiig runtime API.
     """
-    if (Path(jiig.__file__).parent.parent / 'pyproject.toml').is_file():
+    if (_SOURCE_FOLDER / 'pyproject.toml').is_file():
         runtime.heading(1, 'Build source distribution')
         python_path = runtime.format_path('{venv_folder}/bin/python')
-        os.execvp(python_path, [python_path, '-m', 'build'])
+        # Run, rather than exec, so that successful results can be cached.
+        # Exit with the build status, as if exec'd, rather than aborting.
+        proc = run([python_path, '-m', 'build', _SOURCE_FOLDER], unchecked=True)
+        if proc.returncode != 0:
+            # A negative status means the build was killed by a signal.
+            sys.exit(proc.returncode if proc.returncode > 0 else 128 - proc.returncode)
     else:
         runtime.error('Not running in Jiig source environment.')
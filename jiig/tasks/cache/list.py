@@ -0,0 +1,53 @@
+# Copyright (C) 2021-2023, Steven Cooper
+#
+# This file is part of Jiig.
+#
+# Jiig is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Jiig is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Jiig.  If not, see <https://www.gnu.org/licenses/>.
+"""Task result cache listing task."""
+
+from time import localtime, strftime
+
+import jiig
+from jiig.internal.task_cache import TaskCache, get_task_cache_folder
+from jiig.util.text.table import format_table
+
+_TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+# noinspection PyShadowingBuiltins
+@jiig.task
+def list(
+    runtime: jiig.Runtime,
+):
+    """List cached task results, most recently used first.
+
+    Args:
+        runtime: Jiig runtime API.
+    """
+    task_cache = TaskCache(get_task_cache_folder(runtime.paths.build))
+    rows = [
+        [
+            entry.command,
+            strftime(_TIME_FORMAT, localtime(entry.used)),
+            strftime(_TIME_FORMAT, localtime(entry.created)),
+            entry.input_count,
+            entry.fingerprint[:12],
+        ]
+        for entry in task_cache.list_entries()
+    ]
+    if not rows:
+        runtime.message('No cached task results.')
+        return
+    for line in format_table(*rows, headers=['command', 'used', 'created', 'inputs', 'fingerprint']):
+        runtime.message(line)
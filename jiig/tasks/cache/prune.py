@@ -0,0 +1,41 @@
+# Copyright (C) 2021-2023, Steven Cooper
+#
+# This file is part of Jiig.
+#
+# Jiig is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Jiig is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Jiig.  If not, see <https://www.gnu.org/licenses/>.
+"""Task result cache pruning task."""
+
+import jiig
+from jiig.internal.task_cache import TaskCache, get_task_cache_folder
+from jiig.util.text.grammar import pluralize
+
+
+@jiig.task
+def prune(
+    runtime: jiig.Runtime,
+    task: jiig.f.text() = None,
+    keep: jiig.f.integer() = 0,
+):
+    """Delete cached task results, least recently used first.
+
+    Args:
+        runtime: Jiig runtime API.
+        task: optional full task name to prune, e.g. "doc.html"
+        keep: number of most recently used results to keep (default: 0)
+    """
+    if keep < 0:
+        runtime.abort(f'Number of results to keep is negative: {keep}')
+    task_cache = TaskCache(get_task_cache_folder(runtime.paths.build))
+    deleted_count = task_cache.prune(keep=keep, task_name=task)
+    runtime.message(f'Deleted {deleted_count} cached task {pluralize("result", count=deleted_count)}.')
@@ -24,8 +24,10 @@ import jiig
 from jiig.util.filesystem import create_folder
 from jiig.util.process import run
 
+_PACKAGE_FOLDER = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
 
-@jiig.task
+
+@jiig.task(cache=os.path.join(_PACKAGE_FOLDER, '**', '*.py'), cache_outputs='{doc_folder}/{tool_name}')
 def html(runtime: jiig.Runtime):
     """Use Pdoc3 to build HTML format documentation.
 
@@ -53,7 +55,7 @@ def generate_html(runtime: jiig.Runtime) -> Path:
             '--html',
             '-o', doc_folder,
             '--force',
-            os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+            _PACKAGE_FOLDER,
         ],
         unchecked=True,
         capture=True,
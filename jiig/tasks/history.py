@@ -0,0 +1,99 @@
+# Copyright (C) 2023, Steven Cooper
+#
+# This file is part of Jiig.
+#
+# Jiig is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Jiig is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Jiig.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Command history task."""
+
+from time import localtime, strftime
+
+import jiig
+from jiig.internal.history import HistoryStore
+from jiig.util.filesystem import format_file_size
+from jiig.util.text.table import format_table
+
+_TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def _format_seconds(seconds: float) -> str:
+    return f'{seconds:.3f}s'
+
+
+@jiig.task
+def history(
+    runtime: jiig.Runtime,
+    failed: jiig.f.boolean(),
+    stats: jiig.f.boolean(),
+    command: jiig.f.text() = None,
+    since: jiig.f.age() = None,
+    limit: jiig.f.integer() = 20,
+):
+    """List command history with resource usage, or aggregate statistics.
+
+    Statistics include median (p50) and 95th percentile (p95) wall and CPU
+    times per command. CPU times include child processes.
+
+    Args:
+        runtime: Jiig runtime API.
+        failed: only include commands with a non-zero exit status
+        stats: display per-command statistics instead of a listing
+        command: optional command name, e.g. "cache list", including sub-commands
+        since: optional age limit, e.g. "1d" for the last day
+        limit: maximum number of commands listed (default: 20)
+    """
+    history_store = HistoryStore(runtime.meta.history_folder)
+    if stats:
+        rows = [
+            [
+                statistics.command,
+                statistics.count,
+                statistics.failures,
+                _format_seconds(statistics.wall_p50),
+                _format_seconds(statistics.wall_p95),
+                _format_seconds(statistics.cpu_p50),
+                _format_seconds(statistics.cpu_p95),
+                format_file_size(statistics.max_rss, unit_format='b'),
+                strftime(_TIME_FORMAT, localtime(statistics.last)),
+            ]
+            for statistics in history_store.get_statistics(command=command,
+                                                           since=since,
+                                                           failed=failed)
+        ]
+        headers = ['command', 'count', 'failed', 'wall p50', 'wall p95',
+                   'cpu p50', 'cpu p95', 'max rss', 'last']
+    else:
+        if limit < 1:
+            runtime.abort(f'Command limit is not a positive number: {limit}')
+        rows = [
+            [
+                strftime(_TIME_FORMAT, localtime(record.time)),
+                record.command,
+                record.exit_status,
+                _format_seconds(record.wall),
+                _format_seconds(record.cpu),
+                format_file_size(max(record.max_rss, record.child_max_rss), unit_format='b'),
+                record.subprocesses,
+            ]
+            for record in history_store.list_records(command=command,
+                                                     since=since,
+                                                     failed=failed,
+                                                     limit=limit)
+        ]
+        headers = ['time', 'command', 'status', 'wall', 'cpu', 'max rss', 'processes']
+    if not rows:
+        runtime.message('No command history.')
+        return
+    for line in format_table(*rows, headers=headers):
+        runtime.message(line)
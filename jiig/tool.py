@@ -26,6 +26,7 @@ from .types import (
     ToolOptions,
     ToolPaths,
 )
+from .util.log import abort
 from .util.options import OPTIONS
 
 
@@ -67,6 +68,12 @@ class Tool:
             self.global_option_names.append('pause')
         if self.options.enable_keep_files:
             self.global_option_names.append('keep_files')
+        if self.options.enable_jobs:
+            self.global_option_names.append('jobs')
+        if not self.options.disable_trace:
+            self.global_option_names.append('trace')
+        if not self.options.disable_profile_startup:
+            self.global_option_names.append('profile_startup')
 
     def apply_options(self, runtime_data: object):
         """Apply options specified as runtime data attributes.
@@ -85,6 +92,14 @@ class Tool:
             OPTIONS.set_pause(True)
         if self.options.enable_keep_files and getattr(runtime_data, 'KEEP_FILES'):
             OPTIONS.set_keep_files(True)
+        if self.options.enable_jobs:
+            jobs = getattr(runtime_data, 'JOBS', None)
+            if jobs is not None:
+                if not str(jobs).isdigit() or int(jobs) < 1:
+                    abort(f'Parallel jobs option value is not a positive number: {jobs}')
+                OPTIONS.set_jobs(int(jobs))
+        if not self.options.disable_trace and getattr(runtime_data, 'TRACE', None):
+            OPTIONS.set_trace_path(getattr(runtime_data, 'TRACE'))
 
     # noinspection PyListCreation
     def __str__(self) -> str:
@@ -17,6 +17,7 @@
 
 """Simple dataclasses, abstract classes, and type hinting types."""
 
+import os
 from abc import (
     ABC,
     abstractmethod,
@@ -40,9 +41,12 @@ from .constants import (
     DEFAULT_TOOL_DESCRIPTION,
     DEFAULT_URL,
     DEFAULT_VERSION,
+    HISTORY_FOLDER_NAME,
     JIIG_CONFIG_ROOT,
+    JIIG_CONFIG_ROOT_ENV_VAR,
     PARAMS_CATALOG_FILE_NAME,
     SUB_TASK_LABEL,
+    TASKS_MANIFEST_FILE_NAME,
     TOP_TASK_LABEL,
 )
 from .util.default import DefaultValue
@@ -130,14 +134,15 @@ class ToolMetadata:
     sub_task_label: str = SUB_TASK_LABEL
     #: Pip packages required for virtual environment.
     pip_packages: list[str] = field(default_factory=list)
-    #: Jiig configuration root folder (default: constants.JIIG_CONFIG_ROOT).
+    #: Jiig configuration root folder (default: $JIIG_CONFIG_ROOT or
+    #: constants.JIIG_CONFIG_ROOT).
     jiig_config_root: Path = None
 
     def __post_init__(self):
         if self.project_name is None:
             self.project_name = self.tool_name.capitalize()
         if self.jiig_config_root is None:
-            self.jiig_config_root = JIIG_CONFIG_ROOT
+            self.jiig_config_root = Path(os.environ.get(JIIG_CONFIG_ROOT_ENV_VAR, JIIG_CONFIG_ROOT))
 
     @property
     def aliases_catalog_path(self) -> Path:
@@ -159,6 +164,26 @@ class ToolMetadata:
         """
         return self.jiig_config_root / self.tool_name / PARAMS_CATALOG_FILE_NAME
 
+    @property
+    def tasks_manifest_path(self) -> Path:
+        """
+        Provide path to compiled task tree manifest file.
+
+        Returns:
+            path to task tree manifest file
+        """
+        return self.jiig_config_root / self.tool_name / TASKS_MANIFEST_FILE_NAME
+
+    @property
+    def history_folder(self) -> Path:
+        """
+        Provide path to command history folder.
+
+        Returns:
+            path to command history folder
+        """
+        return self.jiig_config_root / self.tool_name / HISTORY_FOLDER_NAME
+
 
 @dataclass
 class ToolPaths:
@@ -192,6 +217,22 @@ class ToolOptions:
     enable_pause: bool = False
     #: Enable keep files option if True.
     enable_keep_files: bool = False
+    #: Enable parallel jobs option if True.
+    enable_jobs: bool = False
+    #: Disable trace output option if True.
+    disable_trace: bool = False
+    #: Disable startup profiling option if True.
+    disable_profile_startup: bool = False
+    #: Disable command history and resource accounting if True.
+    disable_history: bool = False
+    #: Import task modules on demand, e.g. only for the active command, if True.
+    enable_lazy_tasks: bool = False
+    #: Save and reuse compiled task tree manifest if True.
+    enable_task_manifest: bool = False
+    #: Only build argument parsers for the active command path if True.
+    enable_lazy_parsing: bool = False
+    #: Activate the virtual environment without restarting Python if possible.
+    enable_in_process_venv: bool = False
 
 
 @dataclass
@@ -17,6 +17,8 @@
 
 """Attribute dictionary meta-classes, classes, and functions."""
 
+import threading
+from collections import ChainMap
 from typing import (
     Any,
     Callable,
@@ -84,7 +86,11 @@ def make_tuple(value: Any,
 
 
 class MetaAttributeDictionary(type):
-    """Meta-class for creating dict-based classes with attribute style access."""
+    """Meta-class for creating dict-based classes with attribute style access.
+
+    Note that attribute reads may modify the dictionary, by replacing nested
+    values with wrapped ones, even when it is read-only. See __new__().
+    """
 
     def __new__(mcs,
                 mcs_name: str,
@@ -100,6 +106,16 @@ class MetaAttributeDictionary(type):
         Nested attribute-dictionary instances have a "__key_stack__" attribute
         that allows exception messages to report the full key name.
 
+        Sub-dictionaries, lists and tuples are wrapped on first attribute access
+        and replace the original values. Repeated access returns the same
+        object without copying, and changes made through it are kept.
+
+        The replacement is a write by an attribute read. It bypasses read_only,
+        which only rejects attribute writes. References to the original nested
+        values, e.g. from earlier item access, don't see later changes made
+        through attributes. Concurrent first accesses are serialized, so that
+        they get the same wrapped value.
+
         Args:
             mcs_name: class name
             bases: base classes
@@ -142,26 +158,50 @@ class MetaAttributeDictionary(type):
             get_item_function = dict_class.get
 
         if max_depth != 1:
+            def wrap_value_recursive(value: Any, key_stack: list[str], depth: int = 0) -> Any:
+                # Returns the same object if nothing needed wrapping.
+                if max_depth is None or depth < max_depth:
+                    if isinstance(value, dict):
+                        if type(value) is dict_class:
+                            return value
+                        sub_dict = dict_class(value)
+                        object.__setattr__(sub_dict, '__key_stack__', key_stack)
+                        return sub_dict
+                    if isinstance(value, (list, tuple)):
+                        sub_values = [wrap_value_recursive(sub_value, key_stack, depth=depth + 1)
+                                      for sub_value in value]
+                        if all(sub_value is old_sub_value
+                               for sub_value, old_sub_value in zip(sub_values, value)):
+                            return value
+                        return sub_values if isinstance(value, list) else tuple(sub_values)
+                return value
+
+            # Serializes wrapping, which is a read-modify-write of the item.
+            wrap_lock = threading.Lock()
+
             def get_attribute_function(self, name: Any) -> Any:
                 if name == '__key_stack__':
                     return super(dict, self).__getattr__(name)
-
-                def wrap_value_recursive(value: Any, depth: int = 0) -> Any:
-                    if max_depth is None or depth < max_depth:
-                        if isinstance(value, dict):
-                            sub_dict = dict_class(value)
-                            parent_key_stack = getattr(value, '__key_stack__', [])
-                            setattr(sub_dict, '__key_stack__', parent_key_stack + [name])
-                            return sub_dict
-                        if isinstance(value, list):
-                            return [wrap_value_recursive(sub_value, depth=depth + 1)
-                                    for sub_value in value]
-                        if isinstance(value, tuple):
-                            return tuple(wrap_value_recursive(sub_value, depth=depth + 1)
-                                         for sub_value in value)
+                value = get_item_function(self, name)
+                if type(value) is dict_class or not isinstance(value, (dict, list, tuple)):
                     return value
-
-                return wrap_value_recursive(get_item_function(self, name))
+                # Wrapped values replace the originals, so that they are only
+                # wrapped once and modifications through them are kept.
+                wrapped_values = self.__dict__.get('__wrapped_values__')
+                if wrapped_values is not None and wrapped_values.get(name) is value:
+                    return value
+                with wrap_lock:
+                    # Another thread may have wrapped the value in the meantime.
+                    value = get_item_function(self, name)
+                    wrapped_values = self.__dict__.setdefault('__wrapped_values__', {})
+                    if type(value) is dict_class or wrapped_values.get(name) is value:
+                        return value
+                    key_stack = getattr(self, '__key_stack__', []) + [name]
+                    wrapped_value = wrap_value_recursive(value, key_stack)
+                    if wrapped_value is not value and name in self:
+                        dict.__setitem__(self, name, wrapped_value)
+                    wrapped_values[name] = wrapped_value
+                return wrapped_value
         else:
             get_attribute_function = get_item_function
         setattr(dict_class, '__getattr__', get_attribute_function)
@@ -229,6 +269,158 @@ class AttributeDictionary(dict):
         return CustomAttributeDictionary(symbols or {})
 
 
+# Wraps nested dictionaries found by AttributeChainMap attribute access.
+_NestedAttributeDictionary = type(AttributeDictionary.new(no_defaults=True))
+# Layer count above which new_child() collapses the parent layers.
+_MAXIMUM_CHAIN_DEPTH = 32
+# AttributeChainMap attributes that are not items.
+_CHAIN_MAP_ATTRIBUTE_NAMES = ('maps', '_first_map_shared')
+# Marks a provided value that has not been computed yet.
+_NOT_PROVIDED = object()
+
+
+class _ProvidedValue:
+    # Placeholder for a value that is provided on first reference. The value is
+    # also memoized here, because collapsed and copied layers hold copies of
+    # placeholders.
+    __slots__ = ('provider', 'value')
+
+    def __init__(self, provider: Callable[[], Any]):
+        self.provider = provider
+        self.value = _NOT_PROVIDED
+
+    def get(self) -> Any:
+        if self.value is _NOT_PROVIDED:
+            self.value = self.provider()
+        return self.value
+
+
+class AttributeChainMap(ChainMap):
+    """Layered dictionaries with attribute-based item access.
+
+    Lookups fall through the layers and writes go to the first layer, so that a
+    child layer created by new_child() shares, rather than copies, its parent
+    symbols. A child sees its parent symbols as of its creation, as if they were
+    copied, because the parent copies its shared first layer before the next
+    change, i.e. copy-on-write.
+
+    Since shared layers never change, a very deep chain that creates a child
+    first collapses its own parent layers into a single layer, which keeps
+    lookups and child creation from degrading with depth.
+
+    Like an AttributeDictionary created with no_defaults=True, missing
+    attributes raise AttributeError and nested dictionaries are wrapped for
+    attribute access.
+
+    Values registered with provide() are computed on first reference and
+    memoized in the layer that registered them, where children also see them.
+    """
+
+    # True if children share the first layer, which is copied before it changes.
+    _first_map_shared = False
+
+    def __getitem__(self, key: Any) -> Any:
+        for mapping in self.maps:
+            if key in mapping:
+                value = mapping[key]
+                if type(value) is _ProvidedValue:
+                    # Concurrent first references may call the provider more
+                    # than once, but the memoized value is consistent.
+                    value = mapping[key] = value.get()
+                return value
+        return self.__missing__(key)
+
+    def _get_writable_map(self) -> dict:
+        if self._first_map_shared:
+            self.maps[0] = dict(self.maps[0])
+            self._first_map_shared = False
+        return self.maps[0]
+
+    def __setitem__(self, key: Any, value: Any):
+        self._get_writable_map()[key] = value
+
+    def __delitem__(self, key: Any):
+        self._get_writable_map()
+        super().__delitem__(key)
+
+    def pop(self, key: Any, *args) -> Any:
+        self._get_writable_map()
+        return super().pop(key, *args)
+
+    def popitem(self) -> tuple[Any, Any]:
+        self._get_writable_map()
+        return super().popitem()
+
+    def clear(self):
+        self._get_writable_map()
+        super().clear()
+
+    def __ior__(self, other: Any) -> Self:
+        self._get_writable_map()
+        return super().__ior__(other)
+
+    def provide(self, key: Any, provider: Callable[[], Any]):
+        """Set a value provider in the first layer, called on first reference.
+
+        Args:
+            key: item key
+            provider: callable that accepts no arguments and returns the value
+        """
+        self._get_writable_map()[key] = _ProvidedValue(provider)
+
+    def __getattr__(self, name: str) -> Any:
+        # Avoid recursion when attributes are not set yet, e.g. for copy or pickle.
+        if name in _CHAIN_MAP_ATTRIBUTE_NAMES or name.startswith('__'):
+            raise AttributeError(name)
+        try:
+            value = self[name]
+        except KeyError:
+            raise AttributeError(f'{self.__class__.__name__} attribute does not exist: {name}')
+        return self._wrap_value(value, name)
+
+    def __setattr__(self, name: str, value: Any):
+        if name in _CHAIN_MAP_ATTRIBUTE_NAMES:
+            super().__setattr__(name, value)
+        else:
+            self[name] = value
+
+    def new_child(self, m: dict = None, **kwargs) -> Self:
+        """Create a child with a new first layer in front of this one.
+
+        Args:
+            m: optional first layer dictionary
+            **kwargs: optional additional first layer items
+
+        Returns:
+            child chain
+        """
+        if m is None:
+            m = kwargs
+        elif kwargs:
+            m.update(kwargs)
+        if len(self.maps) >= _MAXIMUM_CHAIN_DEPTH:
+            # Collapse once here, rather than flattening for every child. The
+            # parent layers are shared, and therefore unchanging.
+            flattened_map: dict = {}
+            for parent_map in reversed(self.maps[1:]):
+                flattened_map.update(parent_map)
+            self.maps = [self.maps[0], flattened_map]
+        self._first_map_shared = True
+        return self.__class__(m, *self.maps)
+
+    @classmethod
+    def _wrap_value(cls, value: Any, name: str) -> Any:
+        if isinstance(value, dict):
+            sub_dict = _NestedAttributeDictionary(value)
+            setattr(sub_dict, '__key_stack__', [name])
+            return sub_dict
+        if isinstance(value, list):
+            return [cls._wrap_value(sub_value, name) for sub_value in value]
+        if isinstance(value, tuple):
+            return tuple(cls._wrap_value(sub_value, name) for sub_value in value)
+        return value
+
+
 def filter_dict(function: Callable[[Any, Any], bool],
                 input_data: dict | Sequence[tuple[Any, Any]],
                 ) -> dict:
@@ -0,0 +1,221 @@
+# Copyright (C) 2020-2023, Steven Cooper
+#
+# This file is part of Jiig.
+#
+# Jiig is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Jiig is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Jiig.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Concurrency utilities."""
+
+from concurrent.futures import (
+    Executor,
+    Future,
+    ThreadPoolExecutor,
+    as_completed,
+)
+from contextlib import contextmanager
+from threading import Lock
+from typing import Any, Awaitable, Callable, Iterable, Iterator
+
+from .log import LogWriter, get_log_writer, set_log_writer
+from .options import OPTIONS, Options
+
+_concurrent_section_lock = Lock()
+_concurrent_section_count = 0
+
+
+@contextmanager
+def concurrent_section() -> Iterator[None]:
+    """Context manager for code that runs tasks concurrently.
+
+    Concurrent tasks share process-wide state, such as the working folder.
+    Changes to that state are rejected while any section is active.
+    """
+    global _concurrent_section_count
+    with _concurrent_section_lock:
+        _concurrent_section_count += 1
+    try:
+        yield
+    finally:
+        with _concurrent_section_lock:
+            _concurrent_section_count -= 1
+
+
+def is_concurrent() -> bool:
+    """Check if tasks may be running concurrently.
+
+    Returns:
+        True if a concurrent_section() is active
+    """
+    return _concurrent_section_count > 0
+
+
+async def gather_limited(*awaitables: Awaitable,
+                         limit: int = None,
+                         return_exceptions: bool = False,
+                         ) -> list[Any]:
+    """Await multiple awaitables with an optional concurrency limit.
+
+    The limit only applies to coroutines that haven't started yet. Tasks and
+    futures that are already scheduled run regardless of the limit.
+
+    Args:
+        *awaitables: coroutines or other awaitables
+        limit: maximum number of awaitables to run at once (default: no limit)
+        return_exceptions: return exceptions as results instead of raising
+
+    Returns:
+        results in the same order as the awaitables
+    """
+    # Imported here, since asyncio is slow to import and not used by most tools.
+    import asyncio
+    if limit is None:
+        return await asyncio.gather(*awaitables, return_exceptions=return_exceptions)
+    if limit < 1:
+        raise ValueError(f'Concurrency limit must be positive: {limit}')
+    semaphore = asyncio.Semaphore(limit)
+
+    async def _limited(awaitable: Awaitable) -> Any:
+        async with semaphore:
+            return await awaitable
+
+    return await asyncio.gather(*[_limited(awaitable) for awaitable in awaitables],
+                                return_exceptions=return_exceptions)
+
+
+def _initialize_worker_process(options: Options, log_writer: LogWriter):
+    # Give worker processes the parent's options and log writer, even when the
+    # process start method doesn't fork.
+    OPTIONS.copy(options)
+    set_log_writer(log_writer)
+
+
+class WorkerPools:
+    """Thread and process pool executors that are created on demand.
+
+    Pools are sized by the jobs argument, or, if not specified, by the jobs
+    option, e.g. from the --jobs command line option. Otherwise the executor
+    default sizes, which are based on the CPU count, apply.
+    """
+
+    def __init__(self, jobs: int = None):
+        """Worker pools constructor.
+
+        Args:
+            jobs: optional maximum number of concurrent workers per pool
+        """
+        self.jobs = jobs
+        self.thread_pool: ThreadPoolExecutor | None = None
+        self.process_pool: Executor | None = None
+        self._lock = Lock()
+
+    @property
+    def max_workers(self) -> int | None:
+        """Maximum number of workers per pool.
+
+        Returns:
+            worker count or None for the executor default
+        """
+        return self.jobs or OPTIONS.jobs
+
+    def get_executor(self, processes: bool = False) -> Executor:
+        """Get thread or process pool executor, creating it as needed.
+
+        Args:
+            processes: use process pool if True, otherwise thread pool
+
+        Returns:
+            executor
+        """
+        with self._lock:
+            if processes:
+                if self.process_pool is None:
+                    # Imported here, since it pulls in multiprocessing.
+                    from concurrent.futures import ProcessPoolExecutor
+                    self.process_pool = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        initializer=_initialize_worker_process,
+                        initargs=(OPTIONS, get_log_writer()),
+                    )
+                return self.process_pool
+            if self.thread_pool is None:
+                self.thread_pool = ThreadPoolExecutor(max_workers=self.max_workers)
+            return self.thread_pool
+
+    def submit(self,
+               function: Callable,
+               *args,
+               processes: bool = False,
+               **kwargs,
+               ) -> Future:
+        """Submit a function call to a worker pool.
+
+        Args:
+            function: function to call (must be picklable for processes)
+            *args: positional arguments for function
+            processes: use process pool if True, otherwise thread pool
+            **kwargs: keyword arguments for function
+
+        Returns:
+            future for the result
+        """
+        return self.get_executor(processes=processes).submit(function, *args, **kwargs)
+
+    def map(self,
+            function: Callable[[Any], Any],
+            items: Iterable,
+            processes: bool = False,
+            ordered: bool = True,
+            ) -> Iterator[Any]:
+        """Call function for each item in a worker pool.
+
+        All calls are submitted before returning. Calls that haven't started
+        are cancelled if a call raises an exception, including SystemExit from
+        abort(), or if the iterator is discarded before it is exhausted.
+
+        Args:
+            function: function to call with each item (must be picklable for
+                processes)
+            items: items to pass to function
+            processes: use process pool if True, otherwise thread pool
+            ordered: provide results in item order if True, otherwise as
+                completed
+
+        Returns:
+            result iterator
+        """
+        executor = self.get_executor(processes=processes)
+        futures = [executor.submit(function, item) for item in items]
+        return self._iterate_results(futures, ordered)
+
+    @staticmethod
+    def _iterate_results(futures: list[Future], ordered: bool) -> Iterator[Any]:
+        try:
+            for future in (futures if ordered else as_completed(futures)):
+                yield future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def shutdown(self, cancel: bool = False):
+        """Shut down pools, waiting for running calls to finish.
+
+        Args:
+            cancel: cancel calls that haven't started if True
+        """
+        with self._lock:
+            pools = [pool for pool in (self.thread_pool, self.process_pool) if pool is not None]
+            self.thread_pool = None
+            self.process_pool = None
+        for pool in pools:
+            pool.shutdown(wait=True, cancel_futures=cancel)
@@ -21,6 +21,8 @@ import json
 import os
 import tomllib
 from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Iterator, Mapping
 
 from .collections import AttributeDictionary
 from .stream import open_input_file
@@ -30,6 +32,109 @@ class Configuration(AttributeDictionary):
     pass
 
 
+class ConfigurationSnapshot(Mapping):
+    """Frozen configuration snapshot with a flat dotted name index.
+
+    The mapping keys are the full dotted names of all tables and values, e.g.
+    "tool" and "tool.options.debug", so that nested values are found with a
+    single dictionary lookup. Tables become read-only mappings and arrays
+    become tuples, allowing the snapshot to be shared safely.
+
+    Keys containing "." are not indexed, since they would be ambiguous, but are
+    still available through their parent table.
+    """
+
+    __slots__ = ('_values',)
+
+    def __init__(self, data: Mapping):
+        """Compile configuration snapshot.
+
+        Args:
+            data: configuration data, e.g. as returned by load_configuration()
+        """
+        values: dict[str, Any] = {}
+        for key, value in data.items():
+            _freeze_configuration_value(value, key if '.' not in key else None, values)
+        object.__setattr__(self, '_values', values)
+
+    def __getitem__(self, name: str) -> Any:
+        return self._values[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._values)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __contains__(self, name: Any) -> bool:
+        return name in self._values
+
+    def get(self, name: str, default: Any = None) -> Any:
+        """Get value by dotted name.
+
+        Args:
+            name: dotted name
+            default: value returned if the name is not found
+
+        Returns:
+            frozen value or default if not found
+        """
+        return self._values.get(name, default)
+
+    def get_copy(self, name: str, default: Any = None) -> Any:
+        """Get mutable copy of value by dotted name.
+
+        For code that expects the dictionaries and lists of loaded data.
+
+        Args:
+            name: dotted name
+            default: value returned if the name is not found
+
+        Returns:
+            value copy with dictionaries and lists or default if not found
+        """
+        if name not in self._values:
+            return default
+        return _copy_configuration_value(self._values[name])
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError('Configuration snapshot is read-only.')
+
+    def __delattr__(self, name: str):
+        raise AttributeError('Configuration snapshot is read-only.')
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self._values!r})'
+
+
+def _freeze_configuration_value(value: Any, name: str | None, values: dict[str, Any]) -> Any:
+    # Array items and the contents of keys with "." are frozen, but not indexed.
+    # Tables are indexed before their contents to keep names in document order.
+    if name is not None:
+        values[name] = None
+    if isinstance(value, Mapping):
+        frozen_value = MappingProxyType({
+            key: _freeze_configuration_value(
+                sub_value, f'{name}.{key}' if name is not None and '.' not in key else None, values)
+            for key, sub_value in value.items()
+        })
+    elif isinstance(value, (list, tuple)):
+        frozen_value = tuple(_freeze_configuration_value(item, None, values) for item in value)
+    else:
+        frozen_value = value
+    if name is not None:
+        values[name] = frozen_value
+    return frozen_value
+
+
+def _copy_configuration_value(value: Any) -> Any:
+    if isinstance(value, Mapping):
+        return {key: _copy_configuration_value(sub_value) for key, sub_value in value.items()}
+    if isinstance(value, tuple):
+        return [_copy_configuration_value(item) for item in value]
+    return value
+
+
 def load_configuration(config_path: Path | str,
                        ignore_decode_error: bool = False,
                        writeable: bool = False,
@@ -30,11 +30,13 @@ from typing import Iterator, Any, Sequence, Iterable
 from .thirdparty.gitignore_parser import gitignore_parser
 
 from .collections import make_list
+from .concurrency import is_concurrent
 from .log import abort, log_message, log_error, log_heading
 from .options import OPTIONS
 from .process import run
 from .text.blocks import trim_text_blocks
 from .text.human_units import format_human_byte_count
+from .tracing import get_trace_recorder, trace_span
 
 # noinspection RegExpRedundantClassElement
 REMOTE_PATH_REGEX = re.compile(r'^([\w\d.@-]+):([\w\d_-~/]+)$')
@@ -235,6 +237,56 @@ def check_folder_exists(folder_path: str | Path):
         abort('Path is not a folder.', short_path(folder_path, is_folder=True))
 
 
+def check_paths(paths: Iterable[str | Path], check: str) -> list[bool]:
+    """Check many paths using one folder listing per parent folder.
+
+    Results match os.path.exists(), os.path.isfile(), or os.path.isdir().
+    Paths that can't be resolved from a listing, e.g. names not found, which
+    may differ by case on some filesystems, or symbolic links for an existence
+    check, are checked individually.
+
+    Args:
+        paths: paths to check
+        check: 'exists', 'file', or 'folder'
+
+    Returns:
+        check results in path order
+    """
+    path_checks = {'exists': os.path.exists, 'file': os.path.isfile, 'folder': os.path.isdir}
+    if check not in path_checks:
+        raise ValueError(f'Bad path check: {check}')
+    path_check = path_checks[check]
+    listings: dict[str, dict[str, os.DirEntry] | None] = {}
+    results: list[bool] = []
+    for path in paths:
+        path_string = os.fspath(path)
+        folder, name = os.path.split(path_string)
+        result: bool | None = None
+        if name and name not in ('.', '..'):
+            if folder not in listings:
+                try:
+                    with os.scandir(folder or '.') as entries:
+                        listings[folder] = {entry.name: entry for entry in entries}
+                except OSError:
+                    listings[folder] = None
+            listing = listings[folder]
+            entry = listing.get(name) if listing is not None else None
+            if entry is not None:
+                try:
+                    if check == 'file':
+                        result = entry.is_file()
+                    elif check == 'folder':
+                        result = entry.is_dir()
+                    elif not entry.is_symlink():
+                        result = True
+                except OSError:
+                    pass
+        if result is None:
+            result = path_check(path_string)
+        results.append(result)
+    return results
+
+
 def check_file_not_exists(file_path: str | Path):
     """Make sure a file does not already exist.
 
@@ -280,19 +332,20 @@ def copy_folder(source_folder_path: str | Path,
         merge: add files to existing target folder if True
         quiet: suppress non-error messages if True
     """
-    if not OPTIONS.dry_run:
-        check_folder_exists(source_folder_path)
-    if not merge:
-        delete_folder(target_folder_path, quiet=quiet)
-    synchronize_folders(source_folder_path, target_folder_path)
-    create_folder(os.path.dirname(target_folder_path), quiet=quiet)
-    short_source_folder_path = short_path(source_folder_path, is_folder=True)
-    short_target_folder_path = short_path(target_folder_path, is_folder=True)
-    if not quiet:
-        log_message('Folder copy.',
-                    source=short_source_folder_path,
-                    target=short_target_folder_path)
-    run(['rsync', '-aq', short_source_folder_path, short_target_folder_path])
+    with trace_span('copy_folder', 'filesystem', source=source_folder_path, target=target_folder_path):
+        if not OPTIONS.dry_run:
+            check_folder_exists(source_folder_path)
+        if not merge:
+            delete_folder(target_folder_path, quiet=quiet)
+        synchronize_folders(source_folder_path, target_folder_path)
+        create_folder(os.path.dirname(target_folder_path), quiet=quiet)
+        short_source_folder_path = short_path(source_folder_path, is_folder=True)
+        short_target_folder_path = short_path(target_folder_path, is_folder=True)
+        if not quiet:
+            log_message('Folder copy.',
+                        source=short_source_folder_path,
+                        target=short_target_folder_path)
+        run(['rsync', '-aq', short_source_folder_path, short_target_folder_path])
 
 
 def copy_file(source_file_path: str | Path,
@@ -328,17 +381,22 @@ def copy_files(source_file_pattern: str | Path,
         allow_empty: suppress error for empty source file list if True
         quiet: suppress non-error messages if True
     """
-    source_paths = glob(str(source_file_pattern))
-    short_target_folder_path = short_path(target_folder_path, is_folder=True)
-    if not source_paths and not allow_empty:
-        abort('File copy source is empty.', source_file_pattern)
-    create_folder(target_folder_path, quiet=quiet)
-    if not quiet:
-        log_message('File copy.',
-                    source=short_path(source_file_pattern),
-                    target=short_target_folder_path)
-    for source_path in source_paths:
-        run(['cp', short_path(source_path), short_target_folder_path])
+    with trace_span('copy_files', 'filesystem', source=source_file_pattern, target=target_folder_path) as span_args:
+        source_paths = glob(str(source_file_pattern))
+        short_target_folder_path = short_path(target_folder_path, is_folder=True)
+        if not source_paths and not allow_empty:
+            abort('File copy source is empty.', source_file_pattern)
+        create_folder(target_folder_path, quiet=quiet)
+        if not quiet:
+            log_message('File copy.',
+                        source=short_path(source_file_pattern),
+                        target=short_target_folder_path)
+        span_args['files'] = len(source_paths)
+        # Only pay for sizing the files when they are traced.
+        if get_trace_recorder() is not None:
+            span_args['bytes'] = sum(_get_file_size(source_path) or 0 for source_path in source_paths)
+        for source_path in source_paths:
+            run(['cp', short_path(source_path), short_target_folder_path])
 
 
 def move_file(source_file_path: str,
@@ -361,29 +419,40 @@ def move_file(source_file_path: str,
                        quiet=quiet)
 
 
+def _get_file_size(path: str | Path) -> int | None:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return None
+
+
 def _copy_or_move_file(src_path: str | Path,
                        dst_path: str | Path,
                        move: bool = False,
                        overwrite: bool = False,
                        quiet: bool = False,
                        ):
-    if not OPTIONS.dry_run:
-        check_file_exists(src_path)
-    if overwrite:
-        # If overwriting is allowed a file (only) can be clobbered.
-        if os.path.exists(dst_path) and not OPTIONS.dry_run:
-            check_file_exists(dst_path)
-    else:
-        # If overwriting is prohibited don't clobber anything.
+    with trace_span('move_file' if move else 'copy_file', 'filesystem',
+                    source=src_path, target=dst_path) as span_args:
+        if get_trace_recorder() is not None:
+            span_args['bytes'] = _get_file_size(src_path)
         if not OPTIONS.dry_run:
-            check_file_not_exists(dst_path)
-    parent_folder = os.path.dirname(dst_path)
-    if not os.path.exists(parent_folder):
-        create_folder(parent_folder, quiet=quiet)
-    if move:
-        run(['mv', '-f', short_path(src_path), short_path(dst_path)])
-    else:
-        run(['cp', '-af', short_path(src_path), short_path(dst_path)])
+            check_file_exists(src_path)
+        if overwrite:
+            # If overwriting is allowed a file (only) can be clobbered.
+            if os.path.exists(dst_path) and not OPTIONS.dry_run:
+                check_file_exists(dst_path)
+        else:
+            # If overwriting is prohibited don't clobber anything.
+            if not OPTIONS.dry_run:
+                check_file_not_exists(dst_path)
+        parent_folder = os.path.dirname(dst_path)
+        if not os.path.exists(parent_folder):
+            create_folder(parent_folder, quiet=quiet)
+        if move:
+            run(['mv', '-f', short_path(src_path), short_path(dst_path)])
+        else:
+            run(['cp', '-af', short_path(src_path), short_path(dst_path)])
 
 
 def move_folder(source_folder_path: str | Path,
@@ -399,19 +468,20 @@ def move_folder(source_folder_path: str | Path,
         overwrite: overwrite target if True
         quiet: suppress non-error messages if True
     """
-    short_source_folder_path = short_path(source_folder_path, is_folder=True)
-    short_target_folder_path = short_path(target_folder_path, is_folder=True)
-    if not OPTIONS.dry_run:
-        check_folder_exists(source_folder_path)
-    if overwrite:
-        delete_folder(target_folder_path, quiet=quiet)
-    else:
+    with trace_span('move_folder', 'filesystem', source=source_folder_path, target=target_folder_path):
+        short_source_folder_path = short_path(source_folder_path, is_folder=True)
+        short_target_folder_path = short_path(target_folder_path, is_folder=True)
         if not OPTIONS.dry_run:
-            check_folder_not_exists(target_folder_path)
-    parent_folder_path = os.path.dirname(target_folder_path)
-    if not os.path.exists(parent_folder_path):
-        create_folder(parent_folder_path, quiet=quiet)
-    run(['mv', '-f', short_source_folder_path, short_target_folder_path])
+            check_folder_exists(source_folder_path)
+        if overwrite:
+            delete_folder(target_folder_path, quiet=quiet)
+        else:
+            if not OPTIONS.dry_run:
+                check_folder_not_exists(target_folder_path)
+        parent_folder_path = os.path.dirname(target_folder_path)
+        if not os.path.exists(parent_folder_path):
+            create_folder(parent_folder_path, quiet=quiet)
+        run(['mv', '-f', short_source_folder_path, short_target_folder_path])
 
 
 def synchronize_folders(source_folder_path: str | Path,
@@ -435,35 +505,36 @@ def synchronize_folders(source_folder_path: str | Path,
         show_statistics: display statistics after transfer (rsync --stats)
         quiet: suppress non-error messages
     """
-    # Add the trailing slash for rsync. This works for remote paths too.
-    source_folder_path_string = folder_path_string(source_folder_path)
-    target_folder_path_string = folder_path_string(target_folder_path)
-    if not quiet:
-        log_message('Folder sync.',
-                    source=source_folder_path_string,
-                    target=target_folder_path_string,
-                    exclude=exclude or [])
-    cmd_args = ['rsync']
-    if OPTIONS.dry_run:
-        cmd_args.append('--dry-run')
-    short_options = '-rlptgoDh'
-    if check_contents:
-        short_options += 'c'
-    if show_files:
-        short_options += 'v'
-    long_options: list[str] = []
-    if not merge:
-        long_options.append('--delete')
-        long_options.append('--delete-excluded')
-    if exclude:
-        for excluded in make_list(exclude):
-            long_options.extend(['--exclude', excluded])
-    if show_statistics:
-        long_options.append('--stats')
-    cmd_args.append(short_options)
-    cmd_args.extend(long_options)
-    cmd_args.extend([source_folder_path_string, target_folder_path_string])
-    run(cmd_args)
+    with trace_span('synchronize_folders', 'filesystem', source=source_folder_path, target=target_folder_path):
+        # Add the trailing slash for rsync. This works for remote paths too.
+        source_folder_path_string = folder_path_string(source_folder_path)
+        target_folder_path_string = folder_path_string(target_folder_path)
+        if not quiet:
+            log_message('Folder sync.',
+                        source=source_folder_path_string,
+                        target=target_folder_path_string,
+                        exclude=exclude or [])
+        cmd_args = ['rsync']
+        if OPTIONS.dry_run:
+            cmd_args.append('--dry-run')
+        short_options = '-rlptgoDh'
+        if check_contents:
+            short_options += 'c'
+        if show_files:
+            short_options += 'v'
+        long_options: list[str] = []
+        if not merge:
+            long_options.append('--delete')
+            long_options.append('--delete-excluded')
+        if exclude:
+            for excluded in make_list(exclude):
+                long_options.extend(['--exclude', excluded])
+        if show_statistics:
+            long_options.append('--stats')
+        cmd_args.append(short_options)
+        cmd_args.extend(long_options)
+        cmd_args.extend([source_folder_path_string, target_folder_path_string])
+        run(cmd_args)
 
 
 @contextmanager
@@ -475,6 +546,9 @@ def temporary_working_folder(folder_path: str | Path | None,
     Treats an empty or None folder, or when folder is the current work folder, a
     do-nothing operation. But at least the caller doesn't have to check.
 
+    Aborts while tasks run concurrently, because the working folder is shared by
+    the whole process.
+
     Args:
         folder_path: path of folder to become the working folder
         quiet: suppress non-error messages
@@ -484,6 +558,9 @@ def temporary_working_folder(folder_path: str | Path | None,
     """
     restore_folder_path = Path(os.getcwd())
     if folder_path and os.path.realpath(folder_path) != restore_folder_path:
+        if is_concurrent():
+            abort('Working folder changes are not allowed while tasks run concurrently.',
+                  folder=folder_path)
         log_message('Change working directory.', str(folder_path), debug=quiet)
         os.chdir(folder_path)
     yield restore_folder_path
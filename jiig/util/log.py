@@ -19,6 +19,7 @@
 
 import os
 import sys
+import threading
 import traceback
 from contextlib import (
     AbstractContextManager,
@@ -36,6 +37,8 @@ from .options import OPTIONS
 from .exceptions import get_exception_stack
 from .messages import format_message_lines
 
+# Keeps lines of multi-line messages together when logging from worker threads.
+_LOG_LOCK = threading.RLock()
 MESSAGES_ISSUED_ONCE: set[str] = set()
 LINES_WRITTEN = 0
 EXCEPTION_COUNT = 0
@@ -80,8 +83,8 @@ class ConsoleLogWriter(LogWriter):
                 stream.write(os.linesep)
         else:
             LINES_WRITTEN += 1
-        stream.write(text)
-        stream.write(os.linesep)
+        # Write the line with one call to avoid interleaving with other processes.
+        stream.write(f'{text}{os.linesep}')
         if extra_space:
             stream.write(os.linesep)
             LINES_WRITTEN = 0
@@ -102,6 +105,16 @@ def set_log_writer(log_writer: LogWriter):
     _LOG_WRITER = log_writer
 
 
+def get_log_writer() -> LogWriter:
+    """
+    Get the current log writer.
+
+    Returns:
+        log writer
+    """
+    return _LOG_WRITER
+
+
 def log_message(text: Any, *args, **kwargs):
     """Display message line(s) and indented lines for relevant keyword data.
 
@@ -137,15 +150,16 @@ def log_message(text: Any, *args, **kwargs):
         return
     if debug and not OPTIONS.debug:
         return
-    if issue_once_tag:
-        if issue_once_tag in MESSAGES_ISSUED_ONCE:
-            return
-        # noinspection PyTypeChecker
-        MESSAGES_ISSUED_ONCE.add(issue_once_tag)
-    for line in format_message_lines(text, *args, **kwargs,
-                                     tag=tag,
-                                     string_file_name=string_file_name):
-        _LOG_WRITER.write_line(line, is_error=is_error)
+    with _LOG_LOCK:
+        if issue_once_tag:
+            if issue_once_tag in MESSAGES_ISSUED_ONCE:
+                return
+            # noinspection PyTypeChecker
+            MESSAGES_ISSUED_ONCE.add(issue_once_tag)
+        for line in format_message_lines(text, *args, **kwargs,
+                                         tag=tag,
+                                         string_file_name=string_file_name):
+            _LOG_WRITER.write_line(line, is_error=is_error)
     has_exception = False
     for value in list(args) + list(kwargs.values()):
         if isinstance(value, Exception):
@@ -251,7 +265,8 @@ def log_heading(heading: str,
         line = ' '.join([decoration, heading, decoration])
     else:
         line = decoration
-    _LOG_WRITER.write_line(line, extra_space=not compact, is_error=is_error)
+    with _LOG_LOCK:
+        _LOG_WRITER.write_line(line, extra_space=not compact, is_error=is_error)
 
 
 def log_block_begin(level: int, heading: str):
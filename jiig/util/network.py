@@ -29,6 +29,7 @@ from .collections import AttributeDictionary
 from .log import abort
 from .options import OPTIONS
 from .process import run, pipe
+from .tracing import trace_span
 
 IP_ADDRESS_PATTERN = r'\d+\.\d+\.\d+\.\d+'
 IP_ADDRESS_REGEX = re.compile(rf'^{IP_ADDRESS_PATTERN}$')
@@ -130,8 +131,11 @@ def download_text(url_or_request: str | Request,
                 request.headers.update(headers)
         else:
             request = Request(url_or_request, **kwargs)
-        response = urlopen(request, timeout=timeout)
-        raw_data = response.read()
+        with trace_span('download', 'network', url=request.full_url) as span_args:
+            response = urlopen(request, timeout=timeout)
+            raw_data = response.read()
+            span_args['status'] = getattr(response, 'status', None)
+            span_args['bytes'] = len(raw_data)
         if isinstance(raw_data, str):
             return raw_data.rstrip()
         return raw_data.decode('utf-8').rstrip()
@@ -166,6 +170,57 @@ def download_json(url_or_request: str | Request,
         abort(f'Failed to parse JSON data from URL: {url_or_request}', exc)
 
 
+async def download_text_async(url_or_request: str | Request,
+                              headers: dict = None,
+                              timeout: float = None,
+                              unchecked: bool = False,
+                              ) -> str:
+    """Download text from URL without blocking the event loop.
+
+    Runs download_text() in a worker thread.
+
+    Args:
+        url_or_request: target URL or Request object
+        headers: optional HTML headers
+        timeout: timeout in seconds
+        unchecked: pass along exceptions if True, otherwise abort
+
+    Returns:
+        downloaded text
+    """
+    # Imported here, since asyncio is slow to import and not used by most tools.
+    import asyncio
+    return await asyncio.to_thread(download_text,
+                                   url_or_request,
+                                   headers=headers,
+                                   timeout=timeout,
+                                   unchecked=unchecked)
+
+
+async def download_json_async(url_or_request: str | Request,
+                              headers: dict = None,
+                              timeout: float = None,
+                              ) -> AttributeDictionary:
+    """Download JSON data from URL without blocking the event loop.
+
+    Runs download_json() in a worker thread.
+
+    Args:
+        url_or_request: target URL or Request object
+        headers: optional headers
+        timeout: timeout in seconds
+
+    Returns:
+        downloaded and decoded JSON data
+    """
+    # Imported here, since asyncio is slow to import and not used by most tools.
+    import asyncio
+    return await asyncio.to_thread(download_json,
+                                   url_or_request,
+                                   headers=headers,
+                                   timeout=timeout)
+
+
 def get_client_name() -> str:
     """Get client system name.
 
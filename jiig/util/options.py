@@ -24,6 +24,14 @@ def _env_boolean(name: str) -> bool:
     return os.environ.get(name, '').lower() in ['yes', 'true', '1']
 
 
+def _env_positive_integer(name: str) -> int | None:
+    try:
+        value = int(os.environ.get(name, ''))
+    except ValueError:
+        return None
+    return value if value > 0 else None
+
+
 class Options:
     """Jiig utility library options, with environment overrides.
 
@@ -42,13 +50,31 @@ class Options:
         self._dry_run: bool | None = None
         self._pause: bool | None = None
         self._keep_files: bool | None = None
+        self._jobs: int | None = None
+        self._trace_path: str | None = None
         self._message_indent = '   '
         self._column_separator = '  '
-        self._env_verbose: bool = _env_boolean('JIIG_VERBOSE')
-        self._env_debug: bool = _env_boolean('JIIG_DEBUG')
-        self._env_dry_run: bool = _env_boolean('JIIG_DRY_RUN')
-        self._env_pause: bool = _env_boolean('JIIG_PAUSE')
-        self._env_keep_files: bool = _env_boolean('JIIG_KEEP_FILES')
+        self._env_verbose = False
+        self._env_debug = False
+        self._env_dry_run = False
+        self._env_pause = False
+        self._env_keep_files = False
+        self._env_jobs: int | None = None
+        self._env_trace_path: str | None = None
+        self.read_environment()
+
+    def read_environment(self):
+        """(Re-)read environment variable overrides.
+
+        E.g. needed after the process environment is replaced.
+        """
+        self._env_verbose = _env_boolean('JIIG_VERBOSE')
+        self._env_debug = _env_boolean('JIIG_DEBUG')
+        self._env_dry_run = _env_boolean('JIIG_DRY_RUN')
+        self._env_pause = _env_boolean('JIIG_PAUSE')
+        self._env_keep_files = _env_boolean('JIIG_KEEP_FILES')
+        self._env_jobs = _env_positive_integer('JIIG_JOBS')
+        self._env_trace_path = os.environ.get('JIIG_TRACE') or None
 
     @property
     def is_initialized(self) -> bool:
@@ -104,6 +130,24 @@ class Options:
         """
         return self._keep_files or self._env_keep_files
 
+    @property
+    def jobs(self) -> int | None:
+        """Read-only access to parallel jobs option with environment override.
+
+        Returns:
+            maximum number of parallel jobs or None for the default
+        """
+        return self._jobs or self._env_jobs
+
+    @property
+    def trace_path(self) -> str | None:
+        """Read-only access to trace output path option with environment override.
+
+        Returns:
+            Chrome trace event output file path or None if not tracing
+        """
+        return self._trace_path or self._env_trace_path
+
     @property
     def message_indent(self) -> str:
         """Read-only access to message indent string.
@@ -162,6 +206,22 @@ class Options:
         """
         self._keep_files = enabled
 
+    def set_jobs(self, jobs: int | None):
+        """Update parallel jobs option.
+
+        Args:
+            jobs: maximum number of parallel jobs or None for the default
+        """
+        self._jobs = jobs
+
+    def set_trace_path(self, path: str | None):
+        """Update trace output path option.
+
+        Args:
+            path: Chrome trace event output file path or None to disable
+        """
+        self._trace_path = path
+
     def set_message_indent(self, text: str):
         """Update message indent string.
 
@@ -189,6 +249,8 @@ class Options:
         self._dry_run: bool | None = other._dry_run
         self._pause: bool | None = other._pause
         self._keep_files: bool | None = other._keep_files
+        self._jobs: int | None = other._jobs
+        self._trace_path: str | None = other._trace_path
         self._message_indent = other._message_indent
         self._column_separator = other._column_separator
 
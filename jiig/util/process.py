@@ -21,11 +21,13 @@ import os
 import re
 import shlex
 import subprocess
+import threading
 from pathlib import Path
 from typing import Any, Sequence
 
 from .log import abort, log_message
 from .options import OPTIONS
+from .tracing import trace_span
 
 # Operators to leave unchanged when quoting shell arguments.
 SHELL_OPERATORS = ['<', '>', '|', '&&', '||', ';']
@@ -34,6 +36,24 @@ SHELL_QUOTED_REGEX = re.compile(r'[\s"\\;<>{}()\[\]|&!*$]')
 # Characters that need to be escaped inside a double-quoted string.
 SHELL_ESCAPED_REGEX = re.compile(r'"')
 
+_subprocess_count = 0
+_subprocess_count_lock = threading.Lock()
+
+
+def _count_subprocess():
+    global _subprocess_count
+    with _subprocess_count_lock:
+        _subprocess_count += 1
+
+
+def get_subprocess_count() -> int:
+    """Get the number of subprocesses started by run() and run_async().
+
+    Returns:
+        subprocess count
+    """
+    return _subprocess_count
+
 
 def shell_quote_arg(arg: str) -> str:
     """
@@ -79,6 +99,51 @@ def shell_quote_path(path: str | Path) -> str:
     return path_string
 
 
+def _prepare_command(cmd_args: list,
+                     env: dict | None,
+                     host: str | None,
+                     shell: bool,
+                     working_folder: str | Path | None,
+                     replace_process: bool,
+                     ) -> tuple[list[str], str]:
+    # Check arguments, log the command, and return the argument strings, with
+    # SSH added for remote execution, and the display/shell command string.
+    if not cmd_args:
+        abort('Called run() without a command.')
+    if not isinstance(cmd_args, (tuple, list)):
+        abort('Called run() with a non-list/tuple.', cmd_args=cmd_args)
+    cmd_strings = [str(arg) for arg in cmd_args]
+    if host:
+        if shell or env or working_folder:
+            abort('Remote run() command, i.e. with "host" specified, may not'
+                  ' use "shell", "env", or "working_folder" keywords.',
+                  cmd_args=cmd_args)
+    # The command string for display or shell execution.
+    cmd_string = shell_command_string(*cmd_strings)
+    # Adjust remote command to run through SSH.
+    if host:
+        cmd_strings = ['ssh', host] + cmd_strings
+    # Log message about impending command and run options.
+    message_data = {}
+    if env:
+        message_data['environment'] = ' '.join([
+            '{}={}'.format(name, shlex.quote(value))
+            for name, value in env.items()])
+    if host:
+        message_data['host'] = host
+    if replace_process:
+        message_data['exec'] = 'yes'
+    log_message('Run command.', cmd_string, **message_data, verbose=True)
+    return cmd_strings, cmd_string
+
+
+def _get_span_name(cmd_strings: list[str]) -> str:
+    # Label trace spans with the program name, which is more readable in a
+    # timeline than the full command, which is also recorded.
+    program_words = cmd_strings[0].split()
+    return f'run {os.path.basename(program_words[0])}' if program_words else 'run'
+
+
 def run(cmd_args: list,
         unchecked: bool = False,
         replace_process: bool = False,
@@ -101,7 +166,7 @@ def run(cmd_args: list,
         cmd_args: raw argument list
         unchecked: return when an error occurs instead of aborting if True
         replace_process: replace current process if True
-        working_folder: folder to change to before running command
+        working_folder: folder for the command to run in
         env: environment variables passed to command process
         host: host for remote execution
         shell: run inside a new shell process if True
@@ -112,34 +177,12 @@ def run(cmd_args: list,
     Returns:
         CompletedProcess object
     """
-    if not cmd_args:
-        abort('Called run() without a command.')
-    if not isinstance(cmd_args, (tuple, list)):
-        abort('Called run() with a non-list/tuple.', cmd_args=cmd_args)
-    cmd_strings = [str(arg) for arg in cmd_args]
-    if host:
-        if shell or env or working_folder:
-            abort('Remote run() command, i.e. with "host" specified, may not'
-                  ' use "shell", "env", or "working_folder" keywords.',
-                  cmd_args=cmd_args)
-    # The command string for display or shell execution.
-    cmd_string = shell_command_string(*cmd_strings)
-    # Adjust remote command to run through SSH.
-    if host:
-        cmd_strings = ['ssh', host] + cmd_strings
-    # Log message about impending command and run options.
-    message_data = {}
-    if env:
-        message_data['environment'] = ' '.join([
-            '{}={}'.format(name, shlex.quote(value))
-            for name, value in env.items()])
-    if host:
-        message_data['host'] = host
-    if replace_process:
-        message_data['exec'] = 'yes'
-    if quiet:
-        message_data['verbose'] = True
-    log_message('Run command.', cmd_string, **message_data, verbose=True)
+    cmd_strings, cmd_string = _prepare_command(cmd_args,
+                                               env=env,
+                                               host=host,
+                                               shell=shell,
+                                               working_folder=working_folder,
+                                               replace_process=replace_process)
     # A dry run can stop here, before taking real action.
     if OPTIONS.dry_run and not run_always:
         return subprocess.CompletedProcess(cmd_strings, 0)
@@ -147,37 +190,119 @@ def run(cmd_args: list,
     run_env = dict(os.environ)
     if env:
         run_env.update(env)
-    # Set a temporary working folder, if specified.
+    # Check the working folder, which is passed to the child process, rather
+    # than changing the current folder, which is shared by all threads.
     if working_folder:
         working_folder = Path(working_folder)
         if not working_folder.is_dir():
             abort('Desired working folder does not exist', working_folder)
-        restore_folder = os.getcwd()
-        os.chdir(working_folder)
-    else:
-        restore_folder = None
     # Run the command with process replacement.
     if replace_process:
+        if working_folder:
+            os.chdir(working_folder)
         os.execlp(cmd_strings[0], *cmd_strings)
     # Or run the command and continue.
-    try:
+    with trace_span(_get_span_name(cmd_strings), 'process', command=cmd_string) as span_args:
         try:
             kwargs = dict(
                 check=not unchecked,
                 shell=shell,
                 env=run_env,
+                cwd=working_folder,
                 capture_output=capture,
             )
             if capture:
                 kwargs['encoding'] = 'utf-8'
-            return subprocess.run(cmd_strings, **kwargs)
+            _count_subprocess()
+            proc = subprocess.run(cmd_strings, **kwargs)
+            span_args['exit_code'] = proc.returncode
+            if capture:
+                span_args['output_bytes'] = len(proc.stdout or '') + len(proc.stderr or '')
+            return proc
         except subprocess.CalledProcessError as exc:
+            span_args['exit_code'] = exc.returncode
             abort('Command failed.', cmd_string, exc)
         except FileNotFoundError as exc:
             abort('Command not found.', cmd_string, exc)
-    finally:
-        if restore_folder:
-            os.chdir(restore_folder)
+
+
+async def run_async(cmd_args: list,
+                    unchecked: bool = False,
+                    working_folder: str | Path = None,
+                    env: dict = None,
+                    host: str = None,
+                    shell: bool = False,
+                    run_always: bool = False,
+                    capture: bool = False,
+                    ) -> subprocess.CompletedProcess:
+    """Run a shell command without blocking the event loop.
+
+    Asynchronous counterpart to run() for concurrent commands. The working
+    folder is passed to the child process instead of changing the current
+    folder, which is shared by concurrent commands. Process replacement is not
+    supported.
+
+    Args:
+        cmd_args: raw argument list
+        unchecked: return when an error occurs instead of aborting if True
+        working_folder: folder for the command to run in
+        env: environment variables passed to command process
+        host: host for remote execution
+        shell: run inside a new shell process if True
+        run_always: execute even during a dry run if True
+        capture: capture standard output and error if True
+
+    Returns:
+        CompletedProcess object
+    """
+    cmd_strings, cmd_string = _prepare_command(cmd_args,
+                                               env=env,
+                                               host=host,
+                                               shell=shell,
+                                               working_folder=working_folder,
+                                               replace_process=False)
+    if OPTIONS.dry_run and not run_always:
+        return subprocess.CompletedProcess(cmd_strings, 0)
+    run_env = dict(os.environ)
+    if env:
+        run_env.update(env)
+    if working_folder:
+        working_folder = Path(working_folder)
+        if not working_folder.is_dir():
+            abort('Desired working folder does not exist', working_folder)
+    # Imported here, since asyncio is slow to import and not used by most tools.
+    import asyncio
+    output_pipe = asyncio.subprocess.PIPE if capture else None
+    _count_subprocess()
+    with trace_span(_get_span_name(cmd_strings), 'process', command=cmd_string) as span_args:
+        try:
+            if shell:
+                process = await asyncio.create_subprocess_shell(cmd_string,
+                                                                stdout=output_pipe,
+                                                                stderr=output_pipe,
+                                                                cwd=working_folder,
+                                                                env=run_env)
+            else:
+                process = await asyncio.create_subprocess_exec(*cmd_strings,
+                                                               stdout=output_pipe,
+                                                               stderr=output_pipe,
+                                                               cwd=working_folder,
+                                                               env=run_env)
+        except FileNotFoundError as exc:
+            abort('Command not found.', cmd_string, exc)
+        stdout_data, stderr_data = await process.communicate()
+        span_args['exit_code'] = process.returncode
+        if capture:
+            span_args['output_bytes'] = len(stdout_data) + len(stderr_data)
+    if capture:
+        stdout_data = stdout_data.decode('utf-8')
+        stderr_data = stderr_data.decode('utf-8')
+    if process.returncode != 0 and not unchecked:
+        abort('Command failed.', cmd_string, returncode=process.returncode)
+    return subprocess.CompletedProcess(cmd_strings,
+                                       process.returncode,
+                                       stdout=stdout_data,
+                                       stderr=stderr_data)
 
 
 def run_shell(cmd_args: list,
@@ -192,7 +317,7 @@ def run_shell(cmd_args: list,
         cmd_args: raw argument list
         unchecked: return when an error occurs instead of aborting if True
         replace_process: replace current process if True
-        working_folder: folder to change to before running command
+        working_folder: folder for the command to run in
         run_always: execute even during a dry run if True
 
     Returns:
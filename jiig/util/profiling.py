@@ -0,0 +1,163 @@
+# Copyright (C) 2023, Steven Cooper
+#
+# This file is part of Jiig.
+#
+# Jiig is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Jiig is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Jiig.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Phase profiling utilities."""
+
+import io
+import json
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Iterator
+
+from .log import log_error, log_message
+
+
+@dataclass
+class ProfilerPhase:
+    """Timing and import data for a profiled phase."""
+    #: Phase name.
+    name: str
+    #: Start time in seconds, relative to profiler creation.
+    start: float
+    #: Elapsed time in seconds.
+    elapsed: float
+    #: Number of modules imported during the phase.
+    imports: int
+
+
+class PhaseProfiler:
+    """Records monotonic timings and import counts for named phases.
+
+    Recording is cheap enough to always be active. Reporting only happens when
+    the profiler is enabled, which may happen after phases were recorded, e.g.
+    once command line options are known.
+    """
+
+    def __init__(self,
+                 name: str,
+                 enabled: bool = False,
+                 json_path: str | Path = None,
+                 profiled_phases: list[str] = None,
+                 ):
+        """Phase profiler constructor.
+
+        Args:
+            name: profiler name used in the report heading
+            enabled: report results if True
+            json_path: optional path for saving JSON results
+            profiled_phases: optional names of phases to capture with cProfile
+        """
+        self.name = name
+        self.enabled = enabled
+        self.json_path = Path(json_path) if json_path else None
+        self.profiled_phases = profiled_phases or []
+        self.phases: list[ProfilerPhase] = []
+        self.phase_stats: dict[str, pstats.Stats] = {}
+        self.start_time = time.perf_counter()
+        self.start_import_count = len(sys.modules)
+
+    def enable(self):
+        """Enable reporting."""
+        self.enabled = True
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Context manager for recording a phase.
+
+        Args:
+            name: phase name
+        """
+        profile: cProfile.Profile | None = None
+        if name in self.profiled_phases:
+            # Imported here, since profiling specific phases is rare, and
+            # before counting, so that the phase isn't charged for them.
+            import cProfile
+            import pstats
+            profile = cProfile.Profile()
+        import_count = len(sys.modules)
+        if profile is not None:
+            profile.enable()
+        phase_start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            phase_end_time = time.perf_counter()
+            if profile is not None:
+                profile.disable()
+                self.phase_stats[name] = pstats.Stats(profile)
+            self.phases.append(ProfilerPhase(name=name,
+                                             start=phase_start_time - self.start_time,
+                                             elapsed=phase_end_time - phase_start_time,
+                                             imports=len(sys.modules) - import_count))
+
+    def format_report(self, stats_limit: int = 20) -> list[str]:
+        """Format profiling results as text lines.
+
+        Args:
+            stats_limit: maximum number of cProfile functions to list per phase
+
+        Returns:
+            report lines
+        """
+        total_elapsed = time.perf_counter() - self.start_time
+        total_imports = len(sys.modules) - self.start_import_count
+        name_width = max([len(phase.name) for phase in self.phases] + [5])
+        lines = [f'{self.name}: {total_elapsed * 1000:.1f} ms, {total_imports} imports']
+        for phase in self.phases:
+            percent = (phase.elapsed / total_elapsed * 100) if total_elapsed else 0.0
+            lines.append(f'{phase.name:{name_width}}  {phase.elapsed * 1000:9.1f} ms'
+                         f'  {percent:5.1f}%  {phase.imports:4d} imports')
+        for phase_name, stats in self.phase_stats.items():
+            stream = io.StringIO()
+            stats.stream = stream
+            stats.sort_stats('cumulative').print_stats(stats_limit)
+            lines.append(f'cProfile: {phase_name}')
+            lines.extend(f'  {line}' for line in stream.getvalue().strip().splitlines())
+        return lines
+
+    def to_json_data(self) -> dict:
+        """Provide JSON-compatible profiling results.
+
+        Returns:
+            results dictionary
+        """
+        return {
+            'name': self.name,
+            'elapsed': time.perf_counter() - self.start_time,
+            'imports': len(sys.modules) - self.start_import_count,
+            'phases': [asdict(phase) for phase in self.phases],
+        }
+
+    def report(self):
+        """Display report and/or save JSON results if enabled."""
+        if not self.enabled:
+            return
+        if self.json_path is not None:
+            try:
+                with open(self.json_path, 'w', encoding='utf-8') as json_file:
+                    json.dump(self.to_json_data(), json_file, indent=2)
+                    json_file.write('\n')
+            except OSError as exc:
+                log_error('Unable to save profiling results.',
+                          path=self.json_path,
+                          exception=exc)
+        else:
+            lines = self.format_report()
+            log_message(lines[0], *lines[1:], is_error=True)
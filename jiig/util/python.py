@@ -17,8 +17,11 @@
 
 """Python interpreter utilities."""
 
+import hashlib
 import importlib.util
+import json
 import os
+import site
 import sys
 import traceback
 from dataclasses import fields, is_dataclass, MISSING
@@ -38,6 +41,7 @@ from .stream import open_text_stream
 from .text.grammar import pluralize
 
 PYTHON_NATIVE_ENVIRONMENT_NAME = 'JIIG_NATIVE_PYTHON'
+VIRTUAL_ENVIRONMENT_STAMP_FILE_NAME = 'jiig-packages.stamp'
 
 
 def format_call_string(call_name: str, *args, **kwargs) -> str:
@@ -308,6 +312,76 @@ def build_virtual_environment(venv_folder: str | Path,
         run([pip_path, 'install'] + packages)
 
 
+def activate_virtual_environment(venv_folder: str | Path) -> bool:
+    """Activate virtual environment in the current process.
+
+    Only works if the virtual environment Python version matches the running
+    interpreter's. Adjusts sys.prefix, sys.exec_prefix, sys.executable,
+    sys.path, and the VIRTUAL_ENV and PATH environment variables in the way
+    that starting the virtual environment interpreter would have.
+
+    Virtual environment site-packages folders are placed ahead of any system
+    and user site-packages folders in sys.path.
+
+    Args:
+        venv_folder: virtual environment folder path
+
+    Returns:
+        True if the virtual environment was activated
+    """
+    if not isinstance(venv_folder, Path):
+        venv_folder = Path(venv_folder)
+    config: dict[str, str] = {}
+    try:
+        with open(venv_folder / 'pyvenv.cfg', encoding='utf-8') as config_file:
+            for line in config_file:
+                if '=' in line:
+                    name, value = line.split('=', maxsplit=1)
+                    config[name.strip().lower()] = value.strip()
+    except OSError as exc:
+        log_message('Unable to read virtual environment configuration.',
+                    exception=exc,
+                    debug=True)
+        return False
+    venv_version = config.get('version') or config.get('version_info')
+    python_version = '.'.join(str(part) for part in sys.version_info[:3])
+    if venv_version != python_version:
+        log_message('Virtual environment Python version does not match.',
+                    venv_version=venv_version,
+                    python_version=python_version,
+                    debug=True)
+        return False
+    site_packages = get_virtual_environment_site_packages(venv_folder)
+    if site_packages is None:
+        log_message('Virtual environment site-packages not found.', debug=True)
+        return False
+    outside_site_folders = set(site.getsitepackages())
+    if site.ENABLE_USER_SITE:
+        outside_site_folders.add(site.getusersitepackages())
+    # Drop system and user site-packages, unless the virtual environment includes them.
+    if config.get('include-system-site-packages', 'false').lower() != 'true':
+        sys.path[:] = [path for path in sys.path if path not in outside_site_folders]
+    os.environ[PYTHON_NATIVE_ENVIRONMENT_NAME] = sys.executable
+    sys.prefix = sys.exec_prefix = str(venv_folder)
+    sys.executable = str(venv_folder / 'bin' / 'python')
+    # site.addsitedir() appends, but virtual environment packages must take
+    # precedence over system and user packages, as with the venv interpreter.
+    saved_paths = list(sys.path)
+    site.addsitedir(str(site_packages))
+    saved_path_set = set(saved_paths)
+    added_paths = [path for path in sys.path if path not in saved_path_set]
+    insert_index = len(saved_paths)
+    for path_index, path in enumerate(saved_paths):
+        if path in outside_site_folders:
+            insert_index = path_index
+            break
+    sys.path[:] = saved_paths[:insert_index] + added_paths + saved_paths[insert_index:]
+    os.environ['VIRTUAL_ENV'] = str(venv_folder)
+    os.environ['PATH'] = os.pathsep.join([str(venv_folder / 'bin'), os.environ.get('PATH', '')])
+    log_message('Virtual environment activated in process.', debug=True)
+    return True
+
+
 def install_missing_pip_packages(packages: Iterable[str],
                                  venv_folder: str | Path = None,
                                  quiet: bool = False,
@@ -330,16 +404,114 @@ def install_missing_pip_packages(packages: Iterable[str],
     else:
         if not isinstance(venv_folder, Path):
             venv_folder = Path(venv_folder)
+        # The stamp is only current if nothing changed since the last check.
+        if check_virtual_environment_stamp(venv_folder, packages):
+            return
         installed = virtual_environment_installed_packages(venv_folder)
         pip_path = venv_folder / 'bin' / 'pip'
     new_packages = list(filter(lambda p: p not in installed, packages))
-    if not new_packages:
+    if new_packages:
+        pip_args = [pip_path, 'install']
+        if quiet:
+            pip_args.append('-q')
+        pip_args.extend(new_packages)
+        run(pip_args)
+    if venv_folder is not None and not OPTIONS.dry_run:
+        update_virtual_environment_stamp(venv_folder, packages)
+
+
+def get_virtual_environment_stamp(venv_folder: Path | str,
+                                  packages: Iterable[str],
+                                  site_packages: Path | str | None = None,
+                                  ) -> str | None:
+    """Calculate virtual environment readiness stamp.
+
+    The stamp is a hash of the required packages, the interpreter path, and
+    the site-packages folder modification time, which changes when packages
+    are installed or removed.
+
+    Args:
+        venv_folder: virtual environment folder path
+        packages: packages needed
+        site_packages: site-packages folder path, looked up if not specified
+
+    Returns:
+        stamp string or None if site-packages was not found
+    """
+    if not isinstance(venv_folder, Path):
+        venv_folder = Path(venv_folder)
+    if site_packages is None:
+        site_packages = get_virtual_environment_site_packages(venv_folder)
+        if site_packages is None:
+            return None
+    try:
+        site_packages_mtime = os.stat(site_packages).st_mtime_ns
+    except OSError:
+        return None
+    stamp_data = [
+        sorted(packages),
+        os.path.realpath(venv_folder / 'bin' / 'python'),
+        str(site_packages),
+        site_packages_mtime,
+    ]
+    return hashlib.sha256(json.dumps(stamp_data).encode()).hexdigest()
+
+
+def check_virtual_environment_stamp(venv_folder: Path | str,
+                                    packages: Iterable[str],
+                                    ) -> bool:
+    """Check if the virtual environment readiness stamp is current.
+
+    The stamp file holds the stamp and the site-packages path, so that
+    checking only requires reading the file and a site-packages stat().
+
+    Args:
+        venv_folder: virtual environment folder path
+        packages: packages needed
+
+    Returns:
+        True if the stamp is current
+    """
+    if not isinstance(venv_folder, Path):
+        venv_folder = Path(venv_folder)
+    stamp_path = venv_folder / VIRTUAL_ENVIRONMENT_STAMP_FILE_NAME
+    try:
+        stamp_lines = stamp_path.read_text(encoding='utf-8').splitlines()
+    except OSError:
+        return False
+    if len(stamp_lines) != 2:
+        return False
+    saved_stamp, site_packages = stamp_lines
+    return saved_stamp == get_virtual_environment_stamp(venv_folder,
+                                                        packages,
+                                                        site_packages=site_packages)
+
+
+def update_virtual_environment_stamp(venv_folder: Path | str,
+                                     packages: Iterable[str],
+                                     ):
+    """Save the virtual environment readiness stamp.
+
+    Args:
+        venv_folder: virtual environment folder path
+        packages: packages needed
+    """
+    if not isinstance(venv_folder, Path):
+        venv_folder = Path(venv_folder)
+    site_packages = get_virtual_environment_site_packages(venv_folder)
+    if site_packages is None:
+        return
+    stamp = get_virtual_environment_stamp(venv_folder, packages, site_packages=site_packages)
+    if stamp is None:
         return
-    pip_args = [pip_path, 'install']
-    if quiet:
-        pip_args.append('-q')
-    pip_args.extend(new_packages)
-    run(pip_args)
+    stamp_path = venv_folder / VIRTUAL_ENVIRONMENT_STAMP_FILE_NAME
+    try:
+        stamp_path.write_text(os.linesep.join([stamp, str(site_packages)]) + os.linesep,
+                              encoding='utf-8')
+    except OSError as exc:
+        log_warning('Unable to save virtual environment stamp.',
+                    path=stamp_path,
+                    exception=exc)
 
 
 def pip_installed_packages(pip_path: Path | str | None = None,
@@ -365,6 +537,26 @@ def pip_installed_packages(pip_path: Path | str | None = None,
     return installed
 
 
+def get_virtual_environment_site_packages(venv_folder: Path | str) -> Path | None:
+    """Find virtual environment site-packages folder.
+
+    Args:
+        venv_folder: virtual environment folder path
+
+    Returns:
+        site-packages folder path or None if it was not found
+    """
+    if not isinstance(venv_folder, Path):
+        venv_folder = Path(venv_folder)
+    lib_folder = venv_folder / 'lib'
+    lib_sub_folders = list(lib_folder.glob('python*'))
+    if lib_sub_folders:
+        site_packages_path = lib_folder / lib_sub_folders[0] / 'site-packages'
+        if site_packages_path.is_dir():
+            return site_packages_path
+    return None
+
+
 def virtual_environment_installed_packages(venv_folder: Path | str,
                                            quiet: bool = False,
                                            ) -> list[str]:
@@ -378,13 +570,7 @@ def virtual_environment_installed_packages(venv_folder: Path | str,
     """
     if not isinstance(venv_folder, Path):
         venv_folder = Path(venv_folder)
-    lib_folder = venv_folder / 'lib'
-    site_packages: Path | None = None
-    lib_sub_folders = list(lib_folder.glob('python*'))
-    if lib_sub_folders:
-        site_packages_path = lib_folder / lib_sub_folders[0] / 'site-packages'
-        if site_packages_path.is_dir():
-            site_packages = site_packages_path
+    site_packages = get_virtual_environment_site_packages(venv_folder)
     if site_packages is None:
         # Panic and fall back to using the pip command.
         log_error(f'Unable to find virtual environment site-packages.',
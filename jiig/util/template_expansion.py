@@ -89,6 +89,7 @@ from .log import (
 from .messages import format_message_block
 from .options import OPTIONS
 from .stream import open_text_stream
+from .tracing import trace_span
 
 TEMPLATE_FOLDER_SYMBOL_REGEX = re.compile(r'\(=(\w+)=\)')
 
@@ -372,11 +373,12 @@ class _TemplateFileExpander:
             if input_files:
                 log_block_begin(2, f'Folder: {relative_folder or "."}')
                 for relative_path in input_files:
-                    try:
-                        self._expand_file(relative_path, target_base_folder)
-                    except TemplateExpansionError as exc:
-                        log_error(str(exc))
-                        failed = True
+                    with trace_span('expand_template', 'template', source=relative_path):
+                        try:
+                            self._expand_file(relative_path, target_base_folder)
+                        except TemplateExpansionError as exc:
+                            log_error(str(exc))
+                            failed = True
                 log_block_end(2)
         log_block_end(1)
         if failed:
@@ -494,5 +496,6 @@ def expand_folder(source_base_folder: str | Path,
         source_base_folder = Path(source_base_folder)
     if not isinstance(target_base_folder, Path):
         target_base_folder = Path(target_base_folder)
-    expander = _TemplateFileExpander(source_base_folder, overwrite=overwrite, symbols=symbols)
-    expander.expand_folder(target_base_folder, sub_folder=sub_folder, includes=includes, excludes=excludes)
+    with trace_span('expand_folder', 'template', source=source_base_folder, target=target_base_folder):
+        expander = _TemplateFileExpander(source_base_folder, overwrite=overwrite, symbols=symbols)
+        expander.expand_folder(target_base_folder, sub_folder=sub_folder, includes=includes, excludes=excludes)
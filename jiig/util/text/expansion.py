@@ -19,25 +19,38 @@
 
 import os
 import sys
+from _string import formatter_field_name_split
+from functools import lru_cache
+from operator import itemgetter
 from pprint import pformat
-from typing import Any
+from string import Formatter
+from typing import Any, Iterable, Mapping
 
+from jiig.constants import FORMAT_TEMPLATE_CACHE_SIZE
 from jiig.util.options import OPTIONS
 
+_FORMATTER = Formatter()
+_CONVERSIONS = {'r': repr, 's': str, 'a': ascii}
+
 
 class StringExpansionError(RuntimeError):
     """String expansion exception."""
 
-    def __init__(self, value: str, *missing: str):
+    def __init__(self, value: str, *missing: str, references: dict[str, list[str]] = None):
         """Constructor.
 
         Args:
-            value: value that failed expansion
+            value: value that failed expansion, e.g. the first one for a batch
             *missing: missing symbols
+            references: optional values referencing each missing symbol
+                (default: value for all missing symbols)
         """
         self.value = value
         self.missing = list(missing)
         self.missing_string = ' '.join([f'{symbol}' for symbol in missing])
+        if references is None:
+            references = {symbol: [value] for symbol in missing}
+        self.references = references
         super().__init__()
 
     def __str__(self) -> str:
@@ -49,9 +62,12 @@ class StringExpansionError(RuntimeError):
         return super().__str__() + f'value="{self.value}" missing={self.missing}'
 
 
-def expand_value(value: Any, symbols: dict) -> str:
+def expand_value(value: Any, symbols: Mapping) -> str:
     """Produce an expanded string for a value and symbols.
 
+    List and tuple values are expanded element by element and joined with
+    spaces.
+
     Args:
         value: value to expand
         symbols: substitution symbols
@@ -62,32 +78,233 @@ def expand_value(value: Any, symbols: dict) -> str:
     Raises:
         StringExpansionError: if symbols are missing, etc.
     """
+    return expand_values([value], symbols)[0]
+
+
+def expand_values(values: Iterable[Any], symbols: Mapping) -> list[str]:
+    """Produce expanded strings for values expanded with the same symbols.
+
+    Field names are checked against the symbols before expansion, so that all
+    missing symbols for all values are reported by a single exception.
+
+    Args:
+        values: values to expand, see expand_value()
+        symbols: substitution symbols
+
+    Returns:
+        expanded strings
+
+    Raises:
+        StringExpansionError: if symbols are missing, etc.
+    """
+    references: dict[str, list[str]] = {}
+    output_strings = [_expand(value, symbols, references) for value in values]
+    if references:
+        if OPTIONS.debug:
+            sys.stderr.write(f'--- symbols ---{os.linesep}')
+            sys.stderr.write(f'{pformat(dict(symbols), indent=2)}{os.linesep}')
+            sys.stderr.write(f'---{os.linesep}')
+        first_value = next(iter(references.values()))[0]
+        raise StringExpansionError(first_value, *references.keys(), references=references)
+    return output_strings
+
+
+def _expand(value: Any, symbols: Mapping, references: dict[str, list[str]]) -> str | None:
+    # Returns None and adds to references if symbols are missing.
     if isinstance(value, (tuple, list)):
-        return ' '.join([expand_value(element, symbols) for element in value])
+        element_strings = [_expand(element, symbols, references) for element in value]
+        if any(element_string is None for element_string in element_strings):
+            return None
+        return ' '.join(element_strings)
     if not isinstance(value, str):
         return str(value)
-    output_string: str | None = None
-    bad_names: list[str] = []
-    # The loop allows all unresolved symbols to be discovered.
-    while output_string is None:
-        try:
-            output_string = value.format(**symbols)
-            if bad_names:
-                if OPTIONS.debug:
-                    sys.stderr.write(f'--- symbols ---{os.linesep}')
-                    sys.stderr.write(f'{pformat(symbols, indent=2)}{os.linesep}')
-                    sys.stderr.write(f'---{os.linesep}')
-                raise StringExpansionError(value, *bad_names)
-        except AttributeError as attr_exc:
-            sys.stderr.write(f'--- expansion string ---{os.linesep}')
-            sys.stderr.write(f'{pformat(value, indent=2)}{os.linesep}')
-            sys.stderr.write(f'---{os.linesep}')
-            raise StringExpansionError(f'String expansion attribute: {attr_exc}')
-        except KeyError as key_exc:
-            # Strip out surrounding single quotes from exception text to get key name.
-            name = str(key_exc)[1:-1]
-            if not bad_names:
-                symbols = symbols.copy()
-            symbols[name] = '???'
-            bad_names.append(name)
-    return output_string
+    template = compile_template(value)
+    missing_names = [name for name in template.field_names if name not in symbols]
+    if missing_names:
+        for name in dict.fromkeys(missing_names):
+            references.setdefault(name, []).append(value)
+        return None
+    try:
+        return template.expand(symbols)
+    except AttributeError as attr_exc:
+        sys.stderr.write(f'--- expansion string ---{os.linesep}')
+        sys.stderr.write(f'{pformat(value, indent=2)}{os.linesep}')
+        sys.stderr.write(f'---{os.linesep}')
+        raise StringExpansionError(f'String expansion attribute: {attr_exc}')
+    except KeyError as key_exc:
+        # A missing key below a symbol, e.g. "b" for "{a[b]}".
+        references.setdefault(str(key_exc.args[0]), []).append(value)
+        return None
+
+
+def _get_format_spec_field_names(format_spec: str) -> list[str]:
+    field_names: list[str] = []
+    for _literal, field_name, _format_spec, _conversion in _FORMATTER.parse(format_spec):
+        if field_name:
+            first_name = formatter_field_name_split(field_name)[0]
+            if isinstance(first_name, str) and first_name:
+                field_names.append(first_name)
+    return field_names
+
+
+class CompiledTemplate:
+    """Pre-parsed str.format() template.
+
+    Expansion looks up the field values and joins them with the pre-split
+    literal text, without re-parsing the template. Templates with only simple
+    fields, i.e. without attributes, indexes, conversions or format specs, are
+    joined by an equivalent %-format string.
+
+    Results and exceptions are the same as for str.format_map(), which is used
+    for templates having features that aren't pre-parsed, i.e. positional
+    fields and fields nested in format specs. The only exception is that simple
+    fields use str() for values with an unusual __format__() method.
+    """
+
+    def __init__(self, template: str):
+        """Compile a template.
+
+        Args:
+            template: str.format() template
+
+        Raises:
+            ValueError: if the template is malformed
+        """
+        self.template = template
+        # Symbol names referenced by fields, in order, including duplicates.
+        self.field_names: list[str] = []
+        self.parts: list[str] = []
+        # Slots are (part index, name, accessors, conversion, format spec),
+        # with accessors from formatter_field_name_split().
+        self.slots: list[tuple[int, str, list[tuple[bool, Any]], Any, str]] = []
+        self.fallback = False
+        simple = True
+        for literal, field_name, format_spec, conversion in _FORMATTER.parse(template):
+            if literal:
+                self.parts.append(literal)
+            if field_name is None:
+                continue
+            first_name, accessors = formatter_field_name_split(field_name)
+            accessors = list(accessors)
+            # Field names include names nested in format specs, even for
+            # templates that fall back to format_map().
+            if isinstance(first_name, str) and first_name:
+                self.field_names.append(first_name)
+            if '{' in format_spec:
+                self.field_names.extend(_get_format_spec_field_names(format_spec))
+            if (not isinstance(first_name, str)
+                    or not first_name
+                    or '{' in format_spec
+                    or (conversion is not None and conversion not in _CONVERSIONS)):
+                self.fallback = True
+            if self.fallback:
+                continue
+            if accessors or conversion or format_spec:
+                simple = False
+            self.slots.append((len(self.parts),
+                               first_name,
+                               accessors,
+                               _CONVERSIONS[conversion] if conversion else None,
+                               format_spec))
+            self.parts.append('')
+        # Literal-only templates have an expansion that doesn't need symbols.
+        self.literal: str | None = None
+        # %s uses str(), which matches format() with an empty format spec,
+        # except for values with a __format__() that treats it differently.
+        self.percent_format: str | None = None
+        self.values_getter: itemgetter | None = None
+        if not self.fallback:
+            if not self.slots:
+                self.literal = ''.join(self.parts)
+            elif simple:
+                slot_indexes = {slot[0] for slot in self.slots}
+                self.percent_format = ''.join(
+                    '%s' if part_index in slot_indexes else part.replace('%', '%%')
+                    for part_index, part in enumerate(self.parts)
+                )
+                self.values_getter = itemgetter(*[slot[1] for slot in self.slots])
+
+        # Choose the expansion method once, rather than on every expansion.
+        if self.literal is not None:
+            self.expand = self._expand_literal
+        elif self.percent_format is not None:
+            if len(self.slots) == 1:
+                self.expand = self._expand_percent_single
+            else:
+                self.expand = self._expand_percent
+        elif self.fallback:
+            self.expand = self._expand_format_map
+
+    def expand(self, symbols: Mapping) -> str:
+        """Expand the template.
+
+        Args:
+            symbols: substitution symbols
+
+        Returns:
+            expanded text
+
+        Raises:
+            KeyError: if a symbol is missing
+            AttributeError: if a field attribute is missing
+            ValueError: if a value can't be formatted with its format spec
+        """
+        parts = self.parts.copy()
+        for index, name, accessors, conversion, format_spec in self.slots:
+            value = symbols[name]
+            for is_attribute, key in accessors:
+                value = getattr(value, key) if is_attribute else value[key]
+            if conversion is not None:
+                value = conversion(value)
+            parts[index] = format(value, format_spec)
+        return ''.join(parts)
+
+    # noinspection PyUnusedLocal
+    def _expand_literal(self, symbols: Mapping) -> str:
+        return self.literal
+
+    def _expand_percent(self, symbols: Mapping) -> str:
+        return self.percent_format % self.values_getter(symbols)
+
+    def _expand_percent_single(self, symbols: Mapping) -> str:
+        # itemgetter() returns a single value, rather than a tuple, for one field.
+        return self.percent_format % (self.values_getter(symbols),)
+
+    def _expand_format_map(self, symbols: Mapping) -> str:
+        return self.template.format_map(symbols)
+
+
+@lru_cache(maxsize=FORMAT_TEMPLATE_CACHE_SIZE)
+def compile_template(template: str) -> CompiledTemplate:
+    """Get a compiled template from a bounded cache.
+
+    Args:
+        template: str.format() template
+
+    Returns:
+        compiled template
+
+    Raises:
+        ValueError: if the template is malformed
+    """
+    return CompiledTemplate(template)
+
+
+def format_template(template: str, symbols: Mapping) -> str:
+    """Expand a str.format() template using a cached compiled template.
+
+    Equivalent to template.format_map(symbols).
+
+    Args:
+        template: str.format() template
+        symbols: substitution symbols
+
+    Returns:
+        expanded text
+
+    Raises:
+        KeyError: if a symbol is missing
+        AttributeError: if a field attribute is missing
+        ValueError: if the template is malformed or a value can't be formatted
+    """
+    return compile_template(template).expand(symbols)
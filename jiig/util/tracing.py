@@ -0,0 +1,270 @@
+# Copyright (C) 2023, Steven Cooper
+#
+# This file is part of Jiig.
+#
+# Jiig is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Jiig is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Jiig.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Lightweight timeline tracing with Chrome trace event output.
+
+Spans are recorded as complete ("X") events in the Chrome trace event format,
+which can be loaded in chrome://tracing or https://ui.perfetto.dev. Tracing is
+off until start_tracing() is called, and disabled spans cost a function call
+and a global variable check.
+
+Spans yield a dictionary that may be updated with arguments that are only
+known at the end, e.g. exit codes or byte counts.
+
+Complete events on one thread track must nest. Concurrent asyncio tasks share a
+thread, but their spans overlap without nesting, so each asyncio task gets its
+own track, named after the thread and task.
+
+Spans recorded in worker processes are not collected.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+import weakref
+from pathlib import Path
+from typing import Any
+
+from .log import log_error, log_message
+
+
+class TraceRecorder:
+    """Collects trace events and writes Chrome trace event JSON."""
+
+    def __init__(self, start_time: float = None):
+        """Trace recorder constructor.
+
+        Args:
+            start_time: optional time.perf_counter() value for timestamp zero,
+                e.g. to include earlier spans (default: now)
+        """
+        self.events: list[dict] = []
+        self.thread_names: dict[int, str] = {}
+        self.task_track_ids: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self.task_track_count = 0
+        self.pid = os.getpid()
+        self.lock = threading.Lock()
+        self.start_time = start_time if start_time is not None else time.perf_counter()
+
+    def get_timestamp(self, perf_counter_value: float = None) -> float:
+        """Convert a performance counter value to a trace timestamp.
+
+        Args:
+            perf_counter_value: time.perf_counter() value (default: now)
+
+        Returns:
+            timestamp in microseconds since recording started
+        """
+        if perf_counter_value is None:
+            perf_counter_value = time.perf_counter()
+        return (perf_counter_value - self.start_time) * 1000000
+
+    def get_track_id(self) -> int:
+        """Get the track (thread) ID for spans recorded by the caller.
+
+        Returns:
+            asyncio task track ID if called from a task, otherwise thread ID
+        """
+        thread = threading.current_thread()
+        # Only check for a task if asyncio is in use, rather than importing it.
+        asyncio = sys.modules.get('asyncio')
+        if asyncio is not None:
+            try:
+                task = asyncio.current_task()
+            except RuntimeError:
+                task = None
+            if task is not None:
+                with self.lock:
+                    track_id = self.task_track_ids.get(task)
+                    if track_id is None:
+                        # Small numbers can't collide with thread identifiers.
+                        self.task_track_count += 1
+                        track_id = self.task_track_count
+                        self.task_track_ids[task] = track_id
+                        self.thread_names[track_id] = f'{thread.name}: {task.get_name()}'
+                return track_id
+        with self.lock:
+            if thread.ident not in self.thread_names:
+                self.thread_names[thread.ident] = thread.name
+        return thread.ident
+
+    def add_span(self,
+                 name: str,
+                 category: str,
+                 start_time: float,
+                 end_time: float,
+                 args: dict[str, Any] = None,
+                 ):
+        """Add a complete span event.
+
+        Args:
+            name: span name
+            category: span category
+            start_time: time.perf_counter() value at the start
+            end_time: time.perf_counter() value at the end
+            args: optional span arguments
+        """
+        event = {
+            'name': name,
+            'cat': category,
+            'ph': 'X',
+            'ts': self.get_timestamp(start_time),
+            'dur': (end_time - start_time) * 1000000,
+            'pid': self.pid,
+            'tid': self.get_track_id(),
+        }
+        if args:
+            event['args'] = args
+        with self.lock:
+            self.events.append(event)
+
+    def to_json_data(self) -> dict:
+        """Provide Chrome trace event data.
+
+        Returns:
+            trace data dictionary
+        """
+        with self.lock:
+            metadata_events = [
+                {
+                    'name': 'thread_name',
+                    'ph': 'M',
+                    'pid': self.pid,
+                    'tid': thread_id,
+                    'args': {'name': thread_name},
+                }
+                for thread_id, thread_name in self.thread_names.items()
+            ]
+            return {
+                'traceEvents': metadata_events + list(self.events),
+                'displayTimeUnit': 'ms',
+            }
+
+    def save(self, path: str | Path):
+        """Save trace event JSON.
+
+        Args:
+            path: output file path
+        """
+        try:
+            with open(path, 'w', encoding='utf-8') as trace_file:
+                # Non-JSON argument values, e.g. paths, are saved as strings.
+                json.dump(self.to_json_data(), trace_file, default=str)
+                trace_file.write('\n')
+            log_message('Trace saved.', path=path, debug=True)
+        except OSError as exc:
+            log_error('Unable to save trace.', path=path, exception=exc)
+
+
+class _Span:
+
+    __slots__ = ('recorder', 'name', 'category', 'args', 'start_time')
+
+    def __init__(self, recorder: TraceRecorder, name: str, category: str, args: dict[str, Any]):
+        self.recorder = recorder
+        self.name = name
+        self.category = category
+        self.args = args
+        self.start_time = 0.0
+
+    def __enter__(self) -> dict[str, Any]:
+        self.start_time = time.perf_counter()
+        return self.args
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        end_time = time.perf_counter()
+        if exc_type is not None:
+            self.args['error'] = exc_type.__name__
+        self.recorder.add_span(self.name, self.category, self.start_time, end_time, self.args)
+
+
+class _NullSpan:
+
+    __slots__ = ('args',)
+
+    def __init__(self, args: dict[str, Any]):
+        self.args = args
+
+    def __enter__(self) -> dict[str, Any]:
+        return self.args
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+
+_RECORDER: TraceRecorder | None = None
+
+
+def start_tracing(start_time: float = None) -> TraceRecorder:
+    """Start recording spans, if not already recording.
+
+    Args:
+        start_time: optional time.perf_counter() value for timestamp zero
+            (default: now)
+
+    Returns:
+        active trace recorder
+    """
+    global _RECORDER
+    if _RECORDER is None:
+        _RECORDER = TraceRecorder(start_time=start_time)
+    return _RECORDER
+
+
+def stop_tracing() -> TraceRecorder | None:
+    """Stop recording spans.
+
+    Returns:
+        trace recorder that was active or None if not tracing
+    """
+    global _RECORDER
+    recorder = _RECORDER
+    _RECORDER = None
+    return recorder
+
+
+def get_trace_recorder() -> TraceRecorder | None:
+    """Get the active trace recorder.
+
+    Returns:
+        active trace recorder or None if not tracing
+    """
+    return _RECORDER
+
+
+def trace_span(name: str, category: str, **args) -> _Span | _NullSpan:
+    """Context manager for recording a span, if tracing is active.
+
+    Usage:
+        with trace_span('run', 'process', command=command) as span_args:
+            ...
+            span_args['exit_code'] = exit_code
+
+    Args:
+        name: span name
+        category: span category, e.g. "process" or "filesystem"
+        **args: span arguments
+
+    Returns:
+        span context manager that yields the arguments dictionary
+    """
+    recorder = _RECORDER
+    if recorder is None:
+        return _NullSpan(args)
+    return _Span(recorder, name, category, args)
@@ -0,0 +1,105 @@
+# Copyright (C) 2023, Steven Cooper
+#
+# This file is part of Jiig.
+#
+# Jiig is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Jiig is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Jiig.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Adapter caching and batch adapter test suite."""
+
+import os
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from jiig import adapters
+from jiig.adapters import cacheable, path_exists, path_is_file, path_is_folder
+from jiig.internal.field_conversion import compile_field_converters
+from jiig.types import TaskField
+from jiig.util.filesystem import check_paths
+from jiig.util.repetition import Repetition
+
+
+def _make_converter(*field_adapters):
+    field = TaskField('paths', 'paths', str, list, None, Repetition(None, None), None, list(field_adapters))
+    return compile_field_converters([field])[0].convert
+
+
+class TestCheckPaths(unittest.TestCase):
+
+    def test_same_results(self):
+        with TemporaryDirectory() as temporary_folder:
+            folder = Path(temporary_folder)
+            (folder / 'file').write_text('x')
+            (folder / 'sub').mkdir()
+            os.symlink(folder / 'file', folder / 'file_link')
+            os.symlink(folder / 'missing', folder / 'broken_link')
+            paths = [folder / 'file', folder / 'sub', folder / 'file_link', folder / 'broken_link',
+                     folder / 'missing', folder / 'missing' / 'file', folder / 'sub' / '..',
+                     folder / 'file' / 'x', str(folder) + '/', '.', '']
+            for check, path_check in (('exists', os.path.exists),
+                                      ('file', os.path.isfile),
+                                      ('folder', os.path.isdir)):
+                self.assertEqual(check_paths(paths, check), [path_check(path) for path in paths], check)
+            with self.assertRaises(ValueError):
+                check_paths(paths, 'bad')
+
+
+class TestAdapterCaching(unittest.TestCase):
+
+    def test_cached_calls(self):
+        calls: list[str] = []
+
+        @cacheable
+        def _upper(value: str) -> str:
+            calls.append(value)
+            return str(value).upper()
+
+        convert = _make_converter(_upper)
+        self.assertEqual(convert(['a', 'b', 'a', 'a']), ['A', 'B', 'A', 'A'])
+        self.assertEqual(calls, ['a', 'b'])
+        # Caches are per conversion.
+        convert(['a'])
+        self.assertEqual(calls, ['a', 'b', 'a'])
+        # Only strings and paths are cached, since e.g. 1 == 1.0 == True.
+        calls.clear()
+        self.assertEqual(convert([1, 1.0, True, Path('a'), Path('a')]), ['1', '1.0', 'TRUE', 'A', 'A'])
+        self.assertEqual(calls, [1, 1.0, True, Path('a')])
+
+    def test_batch_adapters(self):
+        with TemporaryDirectory() as temporary_folder:
+            folder = Path(temporary_folder)
+            (folder / 'file').write_text('x')
+            (folder / 'sub').mkdir()
+            file_path = str(folder / 'file')
+            folder_path = str(folder / 'sub')
+            self.assertEqual(_make_converter(path_exists)([file_path, folder_path]), [file_path, folder_path])
+            self.assertEqual(_make_converter(path_is_file)([file_path]), [file_path])
+            self.assertEqual(_make_converter(path_is_folder)([folder_path]), [folder_path])
+            for adapter, bad_paths in ((path_exists, [file_path, str(folder / 'x'), str(folder / 'y')]),
+                                       (path_is_file, [file_path, folder_path]),
+                                       (path_is_folder, [folder_path, file_path])):
+                with self.assertRaises(ValueError) as scalar_context:
+                    for bad_path in bad_paths:
+                        adapter(bad_path)
+                with self.assertRaises(ValueError) as batch_context:
+                    _make_converter(adapter)(bad_paths)
+                self.assertEqual(str(batch_context.exception), str(scalar_context.exception))
+
+    def test_declarations(self):
+        self.assertTrue(adapters.is_cacheable(adapters.to_timestamp))
+        self.assertTrue(adapters.is_cacheable(adapters.path_exists))
+        self.assertFalse(adapters.is_cacheable(adapters.path_expand_user))
+        self.assertFalse(adapters.is_cacheable(adapters.to_int))
+        self.assertIs(adapters.get_batch_adapter(adapters.path_is_file), adapters.paths_are_files)
+        self.assertIsNone(adapters.get_batch_adapter(adapters.to_int))
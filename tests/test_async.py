@@ -0,0 +1,118 @@
+# Copyright (C) 2023, Steven Cooper
+#
+# This file is part of Jiig.
+#
+# Jiig is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Jiig is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Jiig.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Async task function and helper test suite."""
+
+import asyncio
+import subprocess
+import sys
+import time
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import jiig
+from jiig.startup import tool_main
+from jiig.task import Task, TaskTree
+from jiig.types import ToolMetadata
+from jiig.util.concurrency import gather_limited
+from jiig.util.process import run_async
+
+RECORDED: list[str] = []
+
+
+@jiig.task
+async def fan_out(
+    runtime: jiig.Runtime,
+    items: jiig.f.text(repeat=()),
+):
+    """Echo items concurrently.
+
+    Args:
+        runtime: jiig Runtime API
+        items: items to echo
+    """
+    async def _done():
+        RECORDED.append('done')
+
+    runtime.when_done(_done)
+    results = await runtime.gather(*[runtime.run_async(['echo', item], capture=True)
+                                     for item in items],
+                                   limit=2)
+    RECORDED.extend(result.stdout.strip() for result in results)
+
+
+class TestAsyncTask(unittest.TestCase):
+
+    def test_async_task(self):
+        RECORDED.clear()
+        with TemporaryDirectory() as temporary_folder:
+            folder = Path(temporary_folder)
+            try:
+                tool_main(
+                    meta=ToolMetadata('jiig', jiig_config_root=folder),
+                    task_tree=TaskTree(sub_tasks=[Task(name='fan_out', impl=fan_out)]),
+                    script_path=folder / 'jiig',
+                    cli_args=['fan_out', 'a', 'b', 'c'],
+                    skip_venv_preparation=True,
+                )
+            except SystemExit as exc:
+                self.fail(f'Exit status: {exc.code}')
+        self.assertEqual(RECORDED, ['a', 'b', 'c', 'done'])
+
+
+class TestAsyncHelpers(unittest.TestCase):
+
+    def test_gather_limited(self):
+        active: list[int] = [0, 0]
+
+        async def _sleep(value: int) -> int:
+            active[0] += 1
+            active[1] = max(active)
+            await asyncio.sleep(0.01)
+            active[0] -= 1
+            return value
+
+        results = asyncio.run(gather_limited(*[_sleep(value) for value in range(6)], limit=2))
+        self.assertEqual(results, list(range(6)))
+        self.assertEqual(active[1], 2)
+
+    def test_run_async_concurrency(self):
+        async def _run_all():
+            return await gather_limited(*[run_async(['sleep', '0.2']) for _idx in range(5)])
+
+        start_time = time.perf_counter()
+        results = asyncio.run(_run_all())
+        self.assertEqual([result.returncode for result in results], [0] * 5)
+        self.assertLess(time.perf_counter() - start_time, 0.8)
+
+    def test_run_async_failure(self):
+        result = asyncio.run(run_async(['false'], unchecked=True))
+        self.assertNotEqual(result.returncode, 0)
+        with self.assertRaises(SystemExit):
+            asyncio.run(run_async(['false']))
+
+
+class TestAsyncImport(unittest.TestCase):
+
+    def test_lazy_import(self):
+        # Synchronous tools shouldn't pay for importing asyncio.
+        proc = subprocess.run([sys.executable, '-c',
+                               'import sys, jiig, jiig.startup, jiig.tasks, jiig.util.network;'
+                               ' print("asyncio" in sys.modules)'],
+                              capture_output=True, encoding='utf-8', check=True)
+        self.assertEqual(proc.stdout.strip(), 'False')
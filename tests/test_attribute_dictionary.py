@@ -0,0 +1,128 @@
+# Copyright (C) 2023, Steven Cooper
+#
+# This file is part of Jiig.
+#
+# Jiig is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Jiig is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Jiig.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Attribute dictionary test suite."""
+
+import json
+import threading
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from jiig.util.collections import AttributeDictionary
+from jiig.util.configuration import load_configuration
+
+NESTED_TOML = '''
+[tool]
+name = "test"
+
+[tool.options]
+debug = true
+paths = ["a", "b"]
+servers = [{host = "x", port = 1}, {host = "y", port = 2}]
+'''
+
+
+class TestAttributeDictionary(unittest.TestCase):
+
+    # noinspection PyPep8Naming
+    def setUp(self) -> None:
+        self.temporary_folder = TemporaryDirectory()
+        self.folder = Path(self.temporary_folder.name)
+        self.config_path = self.folder / 'config.toml'
+        self.config_path.write_text(NESTED_TOML, encoding='utf-8')
+
+    # noinspection PyPep8Naming
+    def tearDown(self) -> None:
+        self.temporary_folder.cleanup()
+
+    def test_identity(self):
+        config = load_configuration(self.config_path)
+        self.assertIs(config.tool, config.tool)
+        self.assertIs(config.tool.options, config.tool.options)
+        self.assertIs(config.tool.options.servers, config.tool.options.servers)
+        self.assertIs(config.tool.options.servers[0], config.tool.options.servers[0])
+        self.assertEqual(config.tool.options.servers[1].host, 'y')
+        self.assertIs(config.tool.options.paths, config.tool.options.paths)
+
+    def test_item_and_attribute_access_agree(self):
+        config = load_configuration(self.config_path)
+        options = config.tool.options
+        self.assertIs(config['tool']['options'], options)
+        self.assertEqual(json.loads(json.dumps(config)), {
+            'tool': {
+                'name': 'test',
+                'options': {
+                    'debug': True,
+                    'paths': ['a', 'b'],
+                    'servers': [{'host': 'x', 'port': 1}, {'host': 'y', 'port': 2}],
+                },
+            },
+        })
+
+    def test_writes_persist(self):
+        config = load_configuration(self.config_path, writeable=True)
+        config.tool.options.debug = False
+        config.tool.options.servers[0].port = 10
+        self.assertFalse(config['tool']['options']['debug'])
+        self.assertEqual(config['tool']['options']['servers'][0]['port'], 10)
+        data = AttributeDictionary.new({'a': {'b': 1}})
+        data.a.c = 2
+        self.assertEqual(data, {'a': {'b': 1, 'c': 2}})
+
+    def test_replaced_value(self):
+        data = AttributeDictionary.new({'a': {'b': 1}})
+        self.assertEqual(data.a.b, 1)
+        data.a = {'b': 2}
+        self.assertEqual(data.a.b, 2)
+        self.assertIs(data.a, data.a)
+
+    def test_read_only(self):
+        config = load_configuration(self.config_path)
+        with self.assertRaises(AttributeError):
+            config.tool.options.debug = False
+        with self.assertRaises(AttributeError) as context:
+            _value = config.tool.options.missing
+        self.assertIn('tool.options.missing', str(context.exception))
+
+    def test_concurrent_first_access(self):
+        thread_count = 8
+        barrier = threading.Barrier(thread_count)
+        configs = [AttributeDictionary.new({'a': {'b': [{'c': 1}]}}) for _idx in range(200)]
+        values: list[list] = [[] for _idx in range(thread_count)]
+
+        def _access(thread_idx: int):
+            barrier.wait()
+            for config in configs:
+                values[thread_idx].append(config.a.b)
+
+        threads = [threading.Thread(target=_access, args=[thread_idx]) for thread_idx in range(thread_count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for config_idx, config in enumerate(configs):
+            for thread_values in values:
+                self.assertIs(thread_values[config_idx], config.a.b)
+
+    def test_key_stack_is_not_data(self):
+        config = load_configuration(self.config_path)
+        options = config.tool.options
+        self.assertEqual(options.__key_stack__, ['tool', 'options'])
+        self.assertNotIn('__key_stack__', options)
+        self.assertNotIn('__key_stack__', config.tool)
+
@@ -0,0 +1,130 @@
+# Copyright (C) 2023, Steven Cooper
+#
+# This file is part of Jiig.
+#
+# Jiig is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Jiig is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Jiig.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Batch task test suite."""
+
+import io
+import unittest
+from contextlib import redirect_stderr
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import jiig
+from jiig.startup import tool_main
+from jiig.task import BuiltinTask, Task, TaskTree
+from jiig.types import ToolMetadata
+from jiig.util.configuration import ConfigurationSnapshot
+from jiig.util.options import OPTIONS
+
+RECORDED: list[tuple[str, list[str]]] = []
+
+
+@jiig.task
+def record(
+    runtime: jiig.Runtime,
+    fail: jiig.f.boolean(),
+    items: jiig.f.text(repeat=()),
+):
+    """Record arguments and clean-up calls.
+
+    Args:
+        runtime: jiig Runtime API
+        fail: fail if True
+        items: items to record
+    """
+    RECORDED.append(('run', items))
+    if runtime.config:
+        RECORDED.append(('config', runtime.config.get('tool.name')))
+    runtime.when_done(lambda: RECORDED.append(('done', items)))
+    if fail:
+        runtime.abort('Failing as requested.')
+
+
+class TestBatch(unittest.TestCase):
+
+    # noinspection PyPep8Naming
+    def setUp(self) -> None:
+        self.temporary_folder = TemporaryDirectory()
+        self.folder = Path(self.temporary_folder.name)
+        RECORDED.clear()
+
+    # noinspection PyPep8Naming
+    def tearDown(self) -> None:
+        self.temporary_folder.cleanup()
+
+    def _run_batch(self, lines: list[str], *options: str, config: ConfigurationSnapshot = None) -> int:
+        batch_path = self.folder / 'commands.txt'
+        batch_path.write_text('\n'.join(lines) + '\n')
+        try:
+            tool_main(
+                meta=ToolMetadata('jiig', jiig_config_root=self.folder),
+                task_tree=TaskTree(
+                    sub_tasks=[
+                        BuiltinTask(name='batch'),
+                        Task(name='record', impl=record, cli_options={'fail': ['-f']}),
+                    ],
+                ),
+                script_path=self.folder / 'jiig',
+                cli_args=['batch', *options, str(batch_path)],
+                config=config,
+                skip_venv_preparation=True,
+            )
+        except SystemExit as exc:
+            return exc.code
+        return 0
+
+    def test_isolation(self):
+        self.assertEqual(self._run_batch(['record a b', '# comment', '', 'record "c d"']), 0)
+        self.assertEqual(RECORDED, [
+            ('run', ['a', 'b']),
+            ('done', ['a', 'b']),
+            ('run', ['c d']),
+            ('done', ['c d']),
+        ])
+
+    def test_failure(self):
+        self.assertNotEqual(self._run_batch(['record a', 'record -f b', 'record c']), 0)
+        self.assertEqual([items for action, items in RECORDED if action == 'run'], [['a'], ['b']])
+
+    def test_keep_going(self):
+        self.assertNotEqual(self._run_batch(['record a', 'bogus', 'record c'], '-k'), 0)
+        self.assertEqual([items for action, items in RECORDED if action == 'run'], [['a'], ['c']])
+
+    def test_configuration(self):
+        config = ConfigurationSnapshot({'tool': {'name': 'batched'}})
+        self.assertEqual(self._run_batch(['record a'], config=config), 0)
+        self.assertEqual(RECORDED, [
+            ('run', ['a']),
+            ('config', 'batched'),
+            ('done', ['a']),
+        ])
+
+    def test_global_options(self):
+        dry_run = OPTIONS.dry_run
+        error_stream = io.StringIO()
+        with redirect_stderr(error_stream):
+            self.assertNotEqual(self._run_batch(['record a', 'record --dry-run b', 'record c'], '-k'), 0)
+        self.assertEqual(OPTIONS.dry_run, dry_run)
+        self.assertEqual([items for action, items in RECORDED if action == 'run'], [['a'], ['c']])
+        self.assertIn('Global options are not supported', error_stream.getvalue())
+        self.assertIn('--dry-run', error_stream.getvalue())
+
+    def test_failure_count(self):
+        error_stream = io.StringIO()
+        with redirect_stderr(error_stream):
+            self.assertNotEqual(self._run_batch(['record "a', 'record b', 'record -f c'], '-k'), 0)
+        self.assertIn('Batch commands failed: 2 of 3', error_stream.getvalue())
@@ -0,0 +1,168 @@
+# Copyright (C) 2023, Steven Cooper
+#
+# This file is part of Jiig.
+#
+# Jiig is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Jiig is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Jiig.  If not, see <https://www.gnu.org/licenses/>.
+
+"""CLI parser test suite."""
+
+import io
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+
+from jiig.driver.cli.cli_driver import CLI_GLOBAL_OPTIONS
+from jiig.driver.cli.cli_parser import Parser, _ArgumentParser
+from jiig.driver.cli.cli_types import (
+    CLICommand,
+    CLIOptionArgument,
+    CLIPositionalArgument,
+)
+from jiig.util.repetition import Repetition
+
+def _make_root_command(group_count: int, commands_per_group: int) -> CLICommand:
+    root_command = CLICommand('tool', 'tool', 0)
+    root_command.options.append(CLIOptionArgument('verbose', 'verbose', ['-v'], is_boolean=True))
+    for group_idx in range(group_count):
+        group_command = CLICommand(f'group{group_idx}', f'group {group_idx}', 0)
+        root_command.sub_commands.append(group_command)
+        for command_idx in range(commands_per_group):
+            command = CLICommand(f'command{command_idx}', f'command {command_idx}', 0)
+            command.options.append(CLIOptionArgument('count', 'count', ['-c', '--count']))
+            command.options.append(CLIOptionArgument('force', 'force', ['-f'], is_boolean=True))
+            command.positionals.append(CLIPositionalArgument('items', 'items', repeat=Repetition(1, None)))
+            group_command.sub_commands.append(command)
+    return root_command
+
+
+def _parse(parser: Parser, root_command: CLICommand, arguments: list[str]):
+    return parser.parse(arguments, 'tool', 'tool', root_command, raise_exceptions=True)
+
+
+class TestParser(unittest.TestCase):
+
+    # noinspection PyPep8Naming
+    def setUp(self) -> None:
+        self.root_command = _make_root_command(3, 3)
+        self.full_parser = Parser('TASK')
+        self.lazy_parser = Parser('TASK', lazy=True)
+
+    def test_command_path(self):
+        def _path_names(arguments: list[str]) -> list[str] | None:
+            path = Parser.get_command_path(self.root_command, arguments)
+            return [command.name for command in path] if path is not None else None
+        self.assertEqual(_path_names(['-v', 'group1', 'command2', 'x']), ['group1', 'command2'])
+        self.assertEqual(_path_names(['group1', '-v', 'command2', '-c', '3']), ['group1', 'command2'])
+        self.assertIsNone(_path_names(['group1']))
+        self.assertIsNone(_path_names(['group9', 'command2']))
+        self.assertIsNone(_path_names(['--', 'group1', 'command2']))
+        self.assertIsNone(_path_names([]))
+
+    def test_same_results(self):
+        for arguments in (
+            ['group0', 'command0', 'a'],
+            ['-v', 'group2', 'command1', '-f', '-c', '5', 'a', 'b'],
+            ['group1', 'command2', '--count=7', 'a'],
+        ):
+            full_args, full_names, full_trailing = _parse(self.full_parser, self.root_command, arguments)
+            lazy_args, lazy_names, lazy_trailing = _parse(self.lazy_parser, self.root_command, arguments)
+            self.assertEqual(vars(full_args), vars(lazy_args))
+            self.assertEqual(full_names, lazy_names)
+            self.assertEqual(full_trailing, lazy_trailing)
+
+    def test_errors(self):
+        for arguments in (
+            ['group1'],
+            ['group1', 'command9', 'a'],
+            ['group1', 'command1'],
+            ['group1', 'command1', '-x', 'a'],
+        ):
+            with self.assertRaises(ValueError) as full_context:
+                _parse(self.full_parser, self.root_command, arguments)
+            with self.assertRaises(ValueError) as lazy_context:
+                _parse(self.lazy_parser, self.root_command, arguments)
+            self.assertEqual(str(full_context.exception), str(lazy_context.exception))
+
+    def test_trailing_capture_errors(self):
+        # Trailing argument capture always reports errors and exits, even when
+        # asked to raise exceptions, but a lazy failure still falls back first.
+        for parser in (self.full_parser, self.lazy_parser):
+            with (redirect_stdout(io.StringIO()),
+                  redirect_stderr(io.StringIO()),
+                  self.assertRaises(SystemExit) as context):
+                parser.parse(['group1', 'command1', 'a', '-c'], 'tool', 'tool', self.root_command,
+                             capture_trailing=True, raise_exceptions=True)
+            self.assertEqual(context.exception.code, 2)
+        _args, names, trailing = self.lazy_parser.parse(['group1', 'command1', 'a', '-x'], 'tool', 'tool',
+                                                        self.root_command, capture_trailing=True,
+                                                        raise_exceptions=True)
+        self.assertEqual(names, ['group1', 'command1'])
+        self.assertEqual(trailing, ['-x'])
+
+    def test_parser_reuse(self):
+        for parser in (self.full_parser, self.lazy_parser):
+            _parse(parser, self.root_command, ['group0', 'command0', 'a'])
+            first_parser = parser.parsers['TASK']
+            _parse(parser, self.root_command, ['group0', 'command0', 'b'])
+            self.assertIs(parser.parsers['TASK'], first_parser)
+            self.root_command.sub_commands[0].sub_commands[0].options.append(
+                CLIOptionArgument('name', 'name', ['-n']))
+            parser.invalidate()
+            args, _names, _trailing = _parse(parser, self.root_command,
+                                             ['group0', 'command0', '-n', 'x', 'a'])
+            self.assertIsNot(parser.parsers['TASK'], first_parser)
+            self.assertEqual(args.NAME, 'x')
+            self.root_command.sub_commands[0].sub_commands[0].options.pop()
+            parser.invalidate()
+
+
+class TestPreParse(unittest.TestCase):
+
+    @staticmethod
+    def _argparse_pre_parse(arguments: list[str]):
+        pre_parser = _ArgumentParser()
+        # noinspection PyProtectedMember
+        Parser._prepare_global_options(pre_parser, CLI_GLOBAL_OPTIONS)
+        return pre_parser.parse_known_args(arguments, raise_exceptions=True)
+
+    def test_fast_path(self):
+        for arguments in (
+            [],
+            ['group', 'command', 'a'],
+            ['-v', 'group', '--debug', 'command', '-c', '3', '--dry-run', 'a'],
+            ['--keep-files', '--pause', 'command', '-', '-5', '-x', '--unknown', 'b'],
+            ['--jobs', '4', 'command', 'a'],
+            ['--trace', 'trace.json', '-v', 'command', 'a'],
+        ):
+            # noinspection PyProtectedMember
+            fast_results = Parser._fast_pre_parse(arguments, CLI_GLOBAL_OPTIONS)
+            self.assertIsNotNone(fast_results)
+            argparse_data, argparse_trailing = self._argparse_pre_parse(arguments)
+            self.assertEqual(vars(fast_results[0]), vars(argparse_data))
+            self.assertEqual(fast_results[1], argparse_trailing)
+
+    def test_fallback(self):
+        for arguments in (
+            ['--verb', 'command'],
+            ['-vx', 'command'],
+            ['command', '--', '-v'],
+            ['command', '--opt=1'],
+            ['command', '--jobs'],
+            ['command', '--jobs', '-v'],
+        ):
+            # noinspection PyProtectedMember
+            self.assertIsNone(Parser._fast_pre_parse(arguments, CLI_GLOBAL_OPTIONS))
+        data, trailing_arguments = Parser.pre_parse(['--verb', 'command'], True, CLI_GLOBAL_OPTIONS)
+        self.assertTrue(data.VERBOSE)
+        self.assertEqual(trailing_arguments, ['command'])
+
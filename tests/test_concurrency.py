@@ -0,0 +1,91 @@
+# Copyright (C) 2023, Steven Cooper
+#
+# This file is part of Jiig.
+#
+# Jiig is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Jiig is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Jiig.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Worker pool test suite."""
+
+import os
+import threading
+import time
+import unittest
+
+from jiig.util.concurrency import WorkerPools
+
+
+def _square(value: int) -> int:
+    return value * value
+
+
+def _get_pid(_value: int) -> int:
+    return os.getpid()
+
+
+class TestWorkerPools(unittest.TestCase):
+
+    # noinspection PyPep8Naming
+    def setUp(self) -> None:
+        self.pools = WorkerPools(jobs=4)
+
+    # noinspection PyPep8Naming
+    def tearDown(self) -> None:
+        self.pools.shutdown(cancel=True)
+
+    def test_ordered(self):
+        def _delayed_square(value: int) -> int:
+            time.sleep(0.01 * (5 - value))
+            return value * value
+        self.assertEqual(list(self.pools.map(_delayed_square, range(5))), [0, 1, 4, 9, 16])
+
+    def test_as_completed(self):
+        def _delayed_square(value: int) -> int:
+            time.sleep(0.05 * (3 - value))
+            return value * value
+        self.assertEqual(list(self.pools.map(_delayed_square, range(3), ordered=False)), [4, 1, 0])
+
+    def test_submit(self):
+        self.assertEqual(self.pools.submit(_square, 7).result(), 49)
+
+    def test_jobs_limit(self):
+        lock = threading.Lock()
+        counts = [0, 0]
+
+        def _count(_value: int):
+            with lock:
+                counts[0] += 1
+                counts[1] = max(counts)
+            time.sleep(0.02)
+            with lock:
+                counts[0] -= 1
+        list(self.pools.map(_count, range(12)))
+        self.assertEqual(counts[1], 4)
+
+    def test_cancel_on_failure(self):
+        started: list[int] = []
+
+        def _fail_first(value: int):
+            started.append(value)
+            if value == 0:
+                raise SystemExit(255)
+            time.sleep(0.05)
+        pools = WorkerPools(jobs=1)
+        with self.assertRaises(SystemExit):
+            list(pools.map(_fail_first, range(10)))
+        pools.shutdown()
+        self.assertLess(len(started), 10)
+
+    def test_processes(self):
+        self.assertEqual(list(self.pools.map(_square, range(5), processes=True)), [0, 1, 4, 9, 16])
+        self.assertNotIn(os.getpid(), list(self.pools.map(_get_pid, range(2), processes=True)))
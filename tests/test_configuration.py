@@ -0,0 +1,165 @@
+# Copyright (C) 2023, Steven Cooper
+#
+# This file is part of Jiig.
+#
+# Jiig is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Jiig is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Jiig.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Configuration snapshot test suite."""
+
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import jiig
+from jiig.startup import _ConfigurationDataExtractor, tool_main
+from jiig.task import Task, TaskTree
+from jiig.types import ToolMetadata
+from jiig.util.configuration import ConfigurationSnapshot, load_configuration
+
+TOOL_TOML = '''
+[tool]
+name = "test"
+pip_packages = ["a", "b"]
+
+[options]
+enable_jobs = true
+
+[params.level]
+value = 3
+comment = "Level"
+
+[tasks.build]
+notes = ["First note."]
+
+[tasks.deploy.sub_tasks.now]
+description = "Deploy now."
+
+[servers]
+"host.name" = "x"
+list = [{name = "a", ports = [1, 2]}]
+'''
+
+# Values seen by the configured task.
+_CONFIG_VALUES: list = []
+
+
+@jiig.task
+def show(runtime: jiig.Runtime):
+    """Record configuration values.
+
+    Args:
+        runtime: jiig Runtime API
+    """
+    _CONFIG_VALUES.append(runtime.config.get('tool.name'))
+    _CONFIG_VALUES.append(runtime.context().config.get('options.enable_jobs'))
+
+
+def _get_by_splitting(raw_data: dict, name: str):
+    # The old dotted name lookup, which split and walked the name every time.
+    name_parts = name.split('.')
+    for name_part in name_parts[:-1]:
+        if name_part not in raw_data:
+            return None
+        raw_data = raw_data[name_part]
+        if not isinstance(raw_data, dict):
+            return None
+    return raw_data.get(name_parts[-1])
+
+
+class TestConfigurationSnapshot(unittest.TestCase):
+
+    # noinspection PyPep8Naming
+    def setUp(self) -> None:
+        self.temporary_folder = TemporaryDirectory()
+        self.folder = Path(self.temporary_folder.name)
+        config_path = self.folder / 'jiig.toml'
+        config_path.write_text(TOOL_TOML, encoding='utf-8')
+        self.data = load_configuration(config_path)
+        self.config = ConfigurationSnapshot(self.data)
+
+    # noinspection PyPep8Naming
+    def tearDown(self) -> None:
+        self.temporary_folder.cleanup()
+
+    def test_lookup(self):
+        self.assertEqual(self.config['tool.name'], 'test')
+        self.assertEqual(self.config['tool.pip_packages'], ('a', 'b'))
+        self.assertEqual(self.config['tasks.deploy.sub_tasks.now.description'], 'Deploy now.')
+        self.assertEqual(self.config['tool']['name'], 'test')
+        self.assertIsNone(self.config.get('tool.missing'))
+        self.assertEqual(self.config.get('tool.name.missing', 'x'), 'x')
+        self.assertIn('params.level', self.config)
+        self.assertEqual(list(self.config)[:3], ['tool', 'tool.name', 'tool.pip_packages'])
+
+    def test_same_as_splitting(self):
+        for name in self.config:
+            frozen_value = self.config.get_copy(name)
+            self.assertEqual(frozen_value, _get_by_splitting(self.data, name))
+
+    def test_dotted_keys(self):
+        self.assertNotIn('servers.host.name', self.config)
+        self.assertEqual(self.config['servers']['host.name'], 'x')
+        self.assertNotIn('servers.list.name', self.config)
+        self.assertEqual(self.config['servers.list'][0]['ports'], (1, 2))
+
+    def test_frozen(self):
+        with self.assertRaises(AttributeError):
+            self.config.extra = 1
+        with self.assertRaises(TypeError):
+            # noinspection PyUnresolvedReferences
+            self.config['tool.name'] = 'x'
+        with self.assertRaises(TypeError):
+            # noinspection PyUnresolvedReferences
+            self.config['tool']['name'] = 'x'
+        with self.assertRaises(AttributeError):
+            # noinspection PyUnresolvedReferences
+            self.config['servers.list'][0]['ports'].append(3)
+        self.assertFalse(hasattr(self.config, '__dict__'))
+
+    def test_copy(self):
+        tasks = self.config.get_copy('tasks')
+        self.assertEqual(tasks, {'build': {'notes': ['First note.']},
+                                 'deploy': {'sub_tasks': {'now': {'description': 'Deploy now.'}}}})
+        tasks['build']['notes'].append('Second note.')
+        self.assertEqual(self.config['tasks.build.notes'], ('First note.',))
+        self.assertIsNone(self.config.get_copy('missing'))
+
+    def test_extractor(self):
+        extractor = _ConfigurationDataExtractor(self.config)
+        self.assertEqual(extractor.string('tool.name', None), 'test')
+        self.assertEqual(extractor.string_list('tool.pip_packages', []), ['a', 'b'])
+        self.assertTrue(extractor.boolean('options.enable_jobs', False))
+        self.assertFalse(extractor.boolean('options.enable_pause', False))
+        self.assertEqual(extractor.params('params'), ({'level': 3}, {'level': 'Level'}))
+        task_tree = extractor.task_tree('tasks')
+        self.assertEqual([task.name for task in task_tree.tasks], ['build'])
+        self.assertEqual([group.name for group in task_tree.groups], ['deploy'])
+
+    def test_runtime(self):
+        (self.folder / 'jiig').mkdir()
+        _CONFIG_VALUES.clear()
+        try:
+            tool_main(
+                meta=ToolMetadata('jiig', jiig_config_root=self.folder),
+                task_tree=TaskTree(sub_tasks=[Task(name='show', impl=show)]),
+                script_path=self.folder / 'jiig',
+                build_folder=self.folder / 'build',
+                cli_args=['show'],
+                config=self.config,
+                skip_venv_preparation=True,
+            )
+        except SystemExit as exc:
+            self.assertEqual(exc.code, 0)
+        self.assertEqual(_CONFIG_VALUES, ['test', True])
+
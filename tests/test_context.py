@@ -0,0 +1,141 @@
+# Copyright (C) 2023, Steven Cooper
+#
+# This file is part of Jiig.
+#
+# Jiig is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Jiig is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Jiig.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Context test suite."""
+
+import unittest
+
+from jiig.context import Context
+from jiig.util.collections import AttributeChainMap
+
+
+class TestContextSymbols(unittest.TestCase):
+
+    def test_inheritance(self):
+        root = Context(None, a='1', b='{a}2')
+        child = root.context(c='{b}3')
+        grandchild = child.context(a='x')
+        self.assertEqual(grandchild.s.c, '123')
+        self.assertEqual(grandchild.s.a, 'x')
+        self.assertEqual(grandchild.format('{a}{b}{c}'), 'x12123')
+        self.assertEqual(child.s.a, '1')
+        self.assertNotIn('c', root.s)
+        self.assertEqual(root.s.nl, grandchild.s.nl)
+        with self.assertRaises(AttributeError):
+            _value = root.s.c
+
+    def test_writes_are_local(self):
+        root = Context(None, a='1')
+        child = root.context()
+        child.s.a = '2'
+        child.copy_symbols(b='3')
+        self.assertEqual(root.s.a, '1')
+        self.assertNotIn('b', root.s)
+        self.assertEqual(dict(child.s)['a'], '2')
+
+    def test_nested_dictionaries(self):
+        root = Context(None)
+        root.copy_symbols(d={'e': {'f': 'g'}})
+        self.assertEqual(root.context().s.d.e.f, 'g')
+
+    def test_deep_chain(self):
+        context = Context(None, a='0')
+        for level in range(1, 100):
+            context = context.context(**{f'level{level % 3}': str(level)})
+        self.assertEqual(context.format('{a} {level0} {level1} {level2}'), '0 99 97 98')
+        self.assertLessEqual(len(context.s.maps), 32)
+
+    def test_deep_chain_siblings(self):
+        context = Context(None, a='0')
+        for level in range(1, 32):
+            context = context.context(**{f'level{level}': str(level)})
+        self.assertEqual(len(context.s.maps), 32)
+        first_child = context.context(b='1')
+        second_child = context.context(b='2')
+        self.assertEqual(len(context.s.maps), 2)
+        self.assertIs(first_child.s.maps[2], second_child.s.maps[2])
+        self.assertEqual(first_child.format('{a} {level1} {level31} {b}'), '0 1 31 1')
+        self.assertEqual(second_child.format('{a} {level1} {level31} {b}'), '0 1 31 2')
+
+    def test_parent_changes_after_child(self):
+        # Children see parent symbols as of their creation at any depth.
+        for depth in (10, 40):
+            context = Context(None, a='0')
+            for level in range(1, depth):
+                context = context.context(**{f'level{level}': str(level)})
+            child = context.context(b='1')
+            context.s.a = 'x'
+            context.s.c = 'y'
+            del context.s[f'level{depth - 1}']
+            self.assertEqual(context.s.a, 'x')
+            self.assertEqual(child.s.a, '0', depth)
+            self.assertNotIn('c', child.s)
+            self.assertIn(f'level{depth - 1}', child.s)
+            self.assertEqual(context.context().s.c, 'y')
+
+    def test_chain_map_attributes(self):
+        symbols = AttributeChainMap({'a': 1})
+        symbols.b = 2
+        self.assertEqual(symbols.maps, [{'a': 1, 'b': 2}])
+        self.assertEqual(symbols.new_child(c=3).c, 3)
+
+
+class TestProvidedSymbols(unittest.TestCase):
+
+    def test_provided_on_first_reference(self):
+        calls: list[str] = []
+
+        def _revision() -> str:
+            calls.append('revision')
+            return 'abc123'
+
+        root = Context(None, a='1').provide_symbols(revision=_revision)
+        child = root.context(b='{a}')
+        self.assertEqual(calls, [])
+        self.assertEqual(child.format('{revision}-{b}'), 'abc123-1')
+        self.assertEqual(root.s.revision, 'abc123')
+        self.assertEqual(root.context().format('{revision}'), 'abc123')
+        self.assertEqual(calls, ['revision'])
+
+    def test_provided_in_deep_chain(self):
+        calls: list[str] = []
+
+        def _revision() -> str:
+            calls.append('revision')
+            return 'abc123'
+
+        root = Context(None).provide_symbols(revision=_revision)
+        context = root.context()
+        for _level in range(40):
+            context = context.context()
+        self.assertEqual(context.format('{revision}'), 'abc123')
+        self.assertEqual(context.context().format('{revision}'), 'abc123')
+        self.assertEqual(root.format('{revision}'), 'abc123')
+        self.assertEqual(root.context().format('{revision}'), 'abc123')
+        self.assertEqual(calls, ['revision'])
+
+    def test_provided_override(self):
+        root = Context(None).provide_symbols(value=lambda: 'root')
+        child = root.context().provide_symbols(value=lambda: 'child')
+        self.assertEqual(child.format('{value}'), 'child')
+        self.assertEqual(root.format('{value}'), 'root')
+        self.assertIn('value', root.s)
+
+    def test_provider_values_not_expanded(self):
+        root = Context(None).provide_symbols(braces=lambda: '{x}')
+        self.assertEqual(root.context(y='[{braces}]').s.y, '[{x}]')
+
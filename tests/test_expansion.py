@@ -0,0 +1,100 @@
+# Copyright (C) 2023, Steven Cooper
+#
+# This file is part of Jiig.
+#
+# Jiig is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Jiig is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Jiig.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Text expansion test suite."""
+
+import unittest
+from pathlib import Path
+
+from jiig.context import Context
+from jiig.util.text.expansion import (
+    StringExpansionError,
+    compile_template,
+    expand_value,
+    expand_values,
+    format_template,
+)
+
+
+class _Item:
+    size = 3
+
+
+class TestFormatTemplate(unittest.TestCase):
+
+    def _check(self, template: str, **symbols):
+        try:
+            expected = template.format_map(symbols)
+        except Exception as exc:
+            with self.assertRaises(type(exc)) as context:
+                format_template(template, symbols)
+            self.assertEqual(str(context.exception), str(exc))
+        else:
+            self.assertEqual(format_template(template, symbols), expected)
+
+    def test_same_results(self):
+        self._check('')
+        self._check('plain text with 100% {{braces}}')
+        self._check('{a}/{b}.{a}', a='x', b=Path('/y'))
+        self._check('%s {a} %d', a=(1, 2))
+        self._check('{a!r:>8}|{b:05.1f}|{c!s}', a='x', b=2.25, c=None)
+        self._check('{item.size} {items[0].size} {mapping[key]}',
+                    item=_Item(), items=[_Item()], mapping={'key': 'value'})
+        self._check('{a:{width}}', a=1, width=5)
+
+    def test_same_errors(self):
+        self._check('{a}{missing}', a='x')
+        self._check('{a.missing}', a='x')
+        self._check('{a:d}', a='x')
+        self._check('{}', a='x')
+        self._check('{a!z}', a='x')
+        self._check('unbalanced }')
+
+    def test_cache(self):
+        self.assertIs(compile_template('{a} {b}'), compile_template('{a} {b}'))
+        self.assertEqual(compile_template('{a} {b.c} {d[0]} {a}').field_names, ['a', 'b', 'd', 'a'])
+
+    def test_context(self):
+        context = Context(None, a='1')
+        context.update(b='{a}2', c=['{a}', '{b}'])
+        self.assertEqual(context.s.b, '12')
+        self.assertEqual(context.s.c, ['1', '12'])
+        self.assertEqual(context.context(d='{b}3').format_path('{d}', '{a}'), '123/1')
+
+
+class TestExpandValue(unittest.TestCase):
+
+    def test_expansion(self):
+        symbols = {'a': 'x', 'b': {'c': 'y'}}
+        self.assertEqual(expand_value('{a}-{b[c]}', symbols), 'x-y')
+        self.assertEqual(expand_value(['{a}', 1, ('{b[c]}', None)], symbols), 'x 1 y None')
+        # Non-string values are converted, but not expanded.
+        self.assertEqual(expand_values(['{a}', Path('/{a}')], symbols), ['x', '/{a}'])
+
+    def test_all_missing_symbols(self):
+        with self.assertRaises(StringExpansionError) as context:
+            expand_value('{a}{m1}{m2:{m3}}{m1}', {'a': 'x'})
+        self.assertEqual(context.exception.missing, ['m1', 'm2', 'm3'])
+        self.assertEqual(context.exception.value, '{a}{m1}{m2:{m3}}{m1}')
+
+    def test_batch_missing_symbols(self):
+        with self.assertRaises(StringExpansionError) as context:
+            expand_values(['{a}', '{m1}', ['{m1}/{m2}'], '{b[m3]}'], {'a': 'x', 'b': {}})
+        self.assertEqual(context.exception.missing, ['m1', 'm2', 'm3'])
+        self.assertEqual(context.exception.references,
+                         {'m1': ['{m1}', '{m1}/{m2}'], 'm2': ['{m1}/{m2}'], 'm3': ['{b[m3]}']})
+
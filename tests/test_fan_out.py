@@ -0,0 +1,211 @@
+# Copyright (C) 2023, Steven Cooper
+#
+# This file is part of Jiig.
+#
+# Jiig is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Jiig is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Jiig.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Task fan-out test suite."""
+
+import asyncio
+import os
+import threading
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Any
+
+import jiig
+from jiig.startup import tool_main
+from jiig.task import Task, TaskTree
+from jiig.types import ToolMetadata, ToolOptions
+from jiig.util.options import OPTIONS
+from jiig.util.process import run
+
+CALLS: list[list[str]] = []
+THREAD_IDS: set[int] = set()
+LOCATIONS: dict[str, str] = {}
+RESULTS: list[list[str]] = []
+# Barriers, by task name, that only pass if all fan-out items run concurrently.
+BARRIERS: dict[str, Any] = {}
+# Barrier timeout, long enough to avoid failing on a slow machine.
+BARRIER_TIMEOUT = 5
+
+
+class _AsyncBarrier:
+    # Minimal asyncio.Barrier substitute, since it requires Python 3.11.
+
+    def __init__(self, parties: int):
+        self.parties = parties
+        self.count = 0
+        self.event: asyncio.Event | None = None
+
+    async def wait(self, timeout: float):
+        if self.event is None:
+            self.event = asyncio.Event()
+        self.count += 1
+        if self.count >= self.parties:
+            self.event.set()
+        await asyncio.wait_for(self.event.wait(), timeout)
+
+
+@jiig.task(fan_out='items')
+def convert(
+    runtime: jiig.Runtime,
+    items: jiig.f.text(repeat=(1, None)),
+):
+    """Convert items.
+
+    Args:
+        runtime: jiig Runtime API
+        items: items to convert
+    """
+    CALLS.append(items)
+    THREAD_IDS.add(threading.get_ident())
+    if 'convert' in BARRIERS:
+        BARRIERS['convert'].wait(BARRIER_TIMEOUT)
+    for item in items:
+        if item.startswith('bad'):
+            runtime.abort(f'Bad item: {item}')
+        if item.startswith('error'):
+            raise ValueError(item)
+
+
+@jiig.task(fan_out='items')
+async def fetch(
+    runtime: jiig.Runtime,
+    items: jiig.f.text(repeat=(1, None)),
+):
+    """Fetch items.
+
+    Args:
+        runtime: jiig Runtime API
+        items: items to fetch
+    """
+    CALLS.append(items)
+    await runtime.run_async(['true'])
+    if 'fetch' in BARRIERS:
+        await BARRIERS['fetch'].wait(BARRIER_TIMEOUT)
+
+
+@jiig.task(fan_out='folders')
+def locate(
+    runtime: jiig.Runtime,
+    change: jiig.f.boolean(),
+    folders: jiig.f.text(repeat=(1, None)),
+):
+    """Record the folders that commands run in.
+
+    Args:
+        runtime: jiig Runtime API
+        change: change the working folder instead of passing it to run()
+        folders: folders to run commands in
+    """
+    for folder in folders:
+        if change:
+            runtime.working_folder(folder)
+        # Both commands are running when the folders are checked.
+        proc = run(['sh', '-c', 'sleep 0.1; pwd -P'], working_folder=folder, capture=True)
+        LOCATIONS[folder] = proc.stdout.strip()
+
+
+@jiig.task(fan_out='items')
+def expand(
+    runtime: jiig.Runtime,
+    items: jiig.f.text(repeat=(1, None)),
+):
+    """Expand items using the runtime worker pool.
+
+    Args:
+        runtime: jiig Runtime API
+        items: items to expand
+    """
+    for item in items:
+        RESULTS.append(list(runtime.parallel_map(str.upper, [item, item])))
+
+
+class TestFanOut(unittest.TestCase):
+
+    # noinspection PyPep8Naming
+    def setUp(self) -> None:
+        CALLS.clear()
+        THREAD_IDS.clear()
+        LOCATIONS.clear()
+        RESULTS.clear()
+        BARRIERS.clear()
+
+    # noinspection PyPep8Naming
+    def tearDown(self) -> None:
+        OPTIONS.set_jobs(None)
+
+    @staticmethod
+    def _run(*arguments: str, options: ToolOptions = None) -> int:
+        with TemporaryDirectory() as temporary_folder:
+            folder = Path(temporary_folder)
+            try:
+                tool_main(
+                    meta=ToolMetadata('jiig', jiig_config_root=folder),
+                    task_tree=TaskTree(sub_tasks=[Task(name='convert', impl=convert),
+                                                  Task(name='fetch', impl=fetch),
+                                                  Task(name='expand', impl=expand),
+                                                  Task(name='locate', impl=locate,
+                                                       cli_options={'change': ['-c']})]),
+                    script_path=folder / 'jiig',
+                    cli_args=list(arguments),
+                    options=options,
+                    skip_venv_preparation=True,
+                )
+            except SystemExit as exc:
+                return exc.code
+        return 0
+
+    def test_threads(self):
+        BARRIERS['convert'] = threading.Barrier(4)
+        self.assertEqual(self._run('convert', 'a', 'b', 'c', 'd'), 0)
+        self.assertEqual(sorted(CALLS), [['a'], ['b'], ['c'], ['d']])
+        self.assertEqual(len(THREAD_IDS), 4)
+
+    def test_async(self):
+        BARRIERS['fetch'] = _AsyncBarrier(4)
+        self.assertEqual(self._run('fetch', 'a', 'b', 'c', 'd'), 0)
+        self.assertEqual(sorted(CALLS), [['a'], ['b'], ['c'], ['d']])
+
+    def test_failures(self):
+        self.assertNotEqual(self._run('convert', 'bad1', 'a', 'error1', 'bad2'), 0)
+        # All items are processed despite failures.
+        self.assertEqual(sorted(CALLS), [['a'], ['bad1'], ['bad2'], ['error1']])
+
+    def test_nested_worker_pool(self):
+        # Items that use the runtime worker pool must not wait for it to be
+        # freed by other items.
+        results: list[int] = []
+        thread = threading.Thread(target=lambda: results.append(
+            self._run('--jobs', '2', 'expand', 'a', 'b', 'c', options=ToolOptions(enable_jobs=True))),
+            daemon=True)
+        thread.start()
+        thread.join(10)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(results, [0])
+        self.assertEqual(sorted(RESULTS), [['A', 'A'], ['B', 'B'], ['C', 'C']])
+
+    def test_working_folders(self):
+        with TemporaryDirectory() as temporary_folder:
+            folders = [os.path.realpath(Path(temporary_folder) / name) for name in ('a', 'b')]
+            for folder in folders:
+                os.mkdir(folder)
+            working_folder = os.getcwd()
+            self.assertEqual(self._run('locate', *folders), 0)
+            self.assertEqual(LOCATIONS, {folder: folder for folder in folders})
+            # Changing the shared working folder is rejected.
+            self.assertNotEqual(self._run('locate', '-c', *folders), 0)
+            self.assertEqual(os.getcwd(), working_folder)
@@ -0,0 +1,111 @@
+# Copyright (C) 2023, Steven Cooper
+#
+# This file is part of Jiig.
+#
+# Jiig is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Jiig is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Jiig.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Field conversion test suite."""
+
+import unittest
+from argparse import Namespace
+
+from jiig.adapters import num_limit, path_expand_user, to_int
+from jiig.internal.execution import _ArgumentDataPreparer
+from jiig.task import RuntimeTask
+from jiig.types import TaskField
+from jiig.util.default import DefaultValue
+from jiig.util.options import OPTIONS
+from jiig.util.repetition import Repetition
+
+def _make_task(field_count: int) -> RuntimeTask:
+    fields: list[TaskField] = []
+    for field_idx in range(field_count):
+        if field_idx % 4 == 0:
+            adapters = [to_int, num_limit(0, None)]
+        elif field_idx % 4 == 1:
+            adapters = [path_expand_user]
+        elif field_idx % 4 == 2:
+            adapters = [int, str]
+        else:
+            adapters = None
+        fields.append(TaskField(f'field{field_idx}', 'field', str, list, None,
+                                Repetition(None, None), None, adapters))
+    fields.append(TaskField('count', 'count', int, int, DefaultValue(3), None, None, [to_int]))
+    fields.append(TaskField('name', 'name', str, str, None, None, None, None))
+    return RuntimeTask('task', 'task', 0, 'task', fields=fields)
+
+
+def _make_data(field_count: int, value_count: int) -> Namespace:
+    data = Namespace(COUNT=None, name='x')
+    for field_idx in range(field_count):
+        setattr(data, f'FIELD{field_idx}', [str(value_idx) for value_idx in range(value_count)])
+    return data
+
+
+def _prepare_reference(task: RuntimeTask, raw_data: object) -> dict:
+    # Straightforward per-field, per-adapter preparation for comparison.
+    prepared_data = {}
+    for field in task.fields:
+        for name in (field.name, field.name.upper()):
+            if hasattr(raw_data, name):
+                value = getattr(raw_data, name)
+                break
+        else:
+            continue
+        if value is None:
+            value = field.default.value if field.default is not None else None
+        else:
+            for adapter in field.adapters or []:
+                if field.repeat is not None:
+                    value = [adapter(item) for item in value]
+                else:
+                    value = adapter(value)
+        prepared_data[field.name] = value
+    return prepared_data
+
+
+def _prepare(task: RuntimeTask, raw_data: object) -> _ArgumentDataPreparer:
+    preparer = _ArgumentDataPreparer(raw_data)
+    preparer.prepare_argument_data(task)
+    return preparer
+
+
+class TestFieldConversion(unittest.TestCase):
+
+    def test_results(self):
+        task = _make_task(4)
+        raw_data = _make_data(4, 10)
+        preparer = _prepare(task, raw_data)
+        self.assertEqual(preparer.errors, [])
+        self.assertEqual(preparer.prepared_data, _prepare_reference(task, raw_data))
+        self.assertEqual(preparer.prepared_data['count'], 3)
+        self.assertEqual(preparer.prepared_data['field0'][:3], [0, 1, 2])
+        self.assertIs(preparer.prepared_data['field3'], raw_data.FIELD3)
+        self.assertIs(preparer.prepared_data['name'], raw_data.name)
+
+    def test_errors(self):
+        task = _make_task(2)
+        raw_data = _make_data(2, 3)
+        raw_data.FIELD0[1] = '-1'
+        raw_data.COUNT = 'x'
+        self.assertEqual(len(_prepare(task, raw_data).errors), 2)
+        saved_debug = OPTIONS.debug
+        OPTIONS.set_debug(True)
+        try:
+            errors = _prepare(task, raw_data).errors
+        finally:
+            OPTIONS.set_debug(saved_debug)
+        self.assertIn('adapter=_number_range_inner', errors[0])
+        self.assertIn('adapter=to_int', errors[1])
+
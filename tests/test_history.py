@@ -0,0 +1,232 @@
+# Copyright (C) 2023, Steven Cooper
+#
+# This file is part of Jiig.
+#
+# Jiig is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Jiig is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Jiig.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Command history test suite."""
+
+import json
+import time
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import jiig
+from jiig.internal.history import (
+    CommandAccounting,
+    HistoryRecord,
+    HistoryStore,
+    get_histogram_bucket,
+    get_histogram_percentile,
+)
+from jiig.startup import tool_main
+from jiig.task import Task, TaskTree
+from jiig.types import ToolMetadata, ToolOptions
+from jiig.util.process import run
+
+DAY = 24 * 60 * 60
+
+
+@jiig.task
+def spawn(
+    runtime: jiig.Runtime,
+    fail: jiig.f.boolean(),
+):
+    """Run a subprocess.
+
+    Args:
+        runtime: jiig Runtime API
+        fail: abort after running the subprocess
+    """
+    run(['true'])
+    if fail:
+        runtime.abort('Failed.')
+
+
+def _make_record(record_time: float, command: str, wall: float, exit_status: int = 0) -> HistoryRecord:
+    return HistoryRecord(time=record_time,
+                         command=command,
+                         arguments=command.split(),
+                         exit_status=exit_status,
+                         wall=wall,
+                         user=wall / 2,
+                         system=0.0,
+                         child_user=0.0,
+                         child_system=0.0,
+                         max_rss=1000,
+                         child_max_rss=0,
+                         subprocesses=0)
+
+
+class TestHistoryStore(unittest.TestCase):
+
+    # noinspection PyPep8Naming
+    def setUp(self) -> None:
+        self.temporary_folder = TemporaryDirectory()
+        self.folder = Path(self.temporary_folder.name)
+        self.store = HistoryStore(self.folder)
+        self.now = time.time()
+
+    # noinspection PyPep8Naming
+    def tearDown(self) -> None:
+        self.temporary_folder.cleanup()
+
+    def assertNearly(self, value: float, expected: float):
+        self.assertAlmostEqual(value, expected, delta=expected * 0.01)
+
+    def test_percentile(self):
+        def _histogram(*values: float) -> dict[str, int]:
+            histogram: dict[str, int] = {}
+            for value in values:
+                bucket = get_histogram_bucket(value)
+                histogram[bucket] = histogram.get(bucket, 0) + 1
+            return histogram
+        self.assertEqual(get_histogram_percentile({}, 50), 0.0)
+        self.assertEqual(get_histogram_percentile(_histogram(0.0), 50), 0.0)
+        self.assertNearly(get_histogram_percentile(_histogram(5.0), 95), 5.0)
+        histogram = _histogram(*(float(value) for value in range(1, 10001)))
+        self.assertNearly(get_histogram_percentile(histogram, 50), 5000.0)
+        self.assertNearly(get_histogram_percentile(histogram, 95), 9500.0)
+        self.assertLess(len(histogram), 500)
+
+    def test_list_records(self):
+        self.store.append(_make_record(self.now - 90 * DAY, 'cache list', 1.0))
+        self.store.append(_make_record(self.now - 2, 'cache prune', 2.0, exit_status=1))
+        self.store.append(_make_record(self.now - 1, 'help', 3.0))
+        self.assertEqual([record.command for record in self.store.list_records()],
+                         ['help', 'cache prune', 'cache list'])
+        self.assertEqual([record.command for record in self.store.list_records(command='cache')],
+                         ['cache prune', 'cache list'])
+        self.assertEqual([record.command for record in self.store.list_records(failed=True)],
+                         ['cache prune'])
+        self.assertEqual([record.command for record in self.store.list_records(since=self.now - DAY)],
+                         ['help', 'cache prune'])
+        self.assertEqual([record.command for record in self.store.list_records(limit=1)], ['help'])
+        self.assertEqual(self.store.list_records(command='cach'), [])
+
+    def test_list_records_limit(self):
+        # Spans several reverse read blocks, with a bad line in the middle.
+        for record_idx in range(2000):
+            self.store.append(_make_record(self.now + record_idx, f'command{record_idx}', 1.0))
+            if record_idx == 1000:
+                with open(self.store._segment_path(self.now), 'a', encoding='utf-8') as segment_file:
+                    segment_file.write('bad\n')
+        records = self.store.list_records(limit=1500)
+        self.assertEqual([record.command for record in records],
+                         [f'command{record_idx}' for record_idx in range(1999, 499, -1)])
+        self.assertEqual(len(self.store.list_records()), 2000)
+
+    def test_incremental_index(self):
+        self.store.append(_make_record(self.now, 'help', 1.0))
+        segments = self.store.get_index()['segments']
+        self.assertEqual(len(segments), 1)
+        segment = list(segments.values())[0]
+        self.assertEqual(segment['commands']['help']['count'], 1)
+        indexed_size = segment['size']
+        self.store.append(_make_record(self.now, 'help', 2.0))
+        segment = list(self.store.get_index()['segments'].values())[0]
+        self.assertEqual(segment['commands']['help']['count'], 2)
+        self.assertGreater(segment['size'], indexed_size)
+        # An incomplete trailing line is left for a later update.
+        segment_path = self.folder / list(segments.keys())[0]
+        with open(segment_path, 'a', encoding='utf-8') as segment_file:
+            segment_file.write('{"time":')
+        segment = list(self.store.get_index()['segments'].values())[0]
+        self.assertEqual(segment['commands']['help']['count'], 2)
+        self.assertLess(segment['size'], segment_path.stat().st_size)
+
+    def test_statistics(self):
+        for wall in range(1, 21):
+            self.store.append(_make_record(self.now - 60 * DAY, 'build sdist', float(wall)))
+        self.store.append(_make_record(self.now, 'build sdist', 100.0, exit_status=2))
+        self.store.append(_make_record(self.now, 'help', 1.0))
+        statistics = {item.command: item for item in self.store.get_statistics()}
+        self.assertEqual(sorted(statistics.keys()), ['build sdist', 'help'])
+        self.assertEqual(statistics['build sdist'].count, 21)
+        self.assertEqual(statistics['build sdist'].failures, 1)
+        self.assertNearly(statistics['build sdist'].wall_p50, 11.0)
+        self.assertNearly(statistics['build sdist'].wall_p95, 20.0)
+        self.assertNearly(statistics['build sdist'].cpu_p50, 5.5)
+        recent_statistics = self.store.get_statistics(command='build', since=self.now - DAY)
+        self.assertEqual(len(recent_statistics), 1)
+        self.assertEqual(recent_statistics[0].count, 1)
+        self.assertNearly(recent_statistics[0].wall_p50, 100.0)
+        failed_statistics = self.store.get_statistics(failed=True)
+        self.assertEqual([(item.command, item.count, item.failures) for item in failed_statistics],
+                         [('build sdist', 1, 1)])
+        self.assertNearly(failed_statistics[0].wall_p50, 100.0)
+        self.assertEqual(self.store.get_statistics(command='help', failed=True), [])
+
+    def test_bounded_index(self):
+        for wall in range(1, 1001):
+            self.store.append(_make_record(self.now, 'help', 1.0 + wall % 10 / 1000))
+        summary = list(self.store.get_index()['segments'].values())[0]['commands']['help']
+        self.assertEqual(summary['count'], 1000)
+        self.assertLessEqual(len(summary['wall']), 2)
+        self.assertEqual(sum(summary['wall'].values()), 1000)
+
+    def test_accounting(self):
+        accounting = CommandAccounting()
+        run(['true'])
+        record = accounting.create_record('x', ['x'], 0)
+        self.assertEqual(record.subprocesses, 1)
+        self.assertGreaterEqual(record.wall, 0.0)
+        self.assertGreaterEqual(record.cpu, 0.0)
+        self.assertGreater(record.max_rss, 0)
+
+
+class TestHistoryRecording(unittest.TestCase):
+
+    # noinspection PyPep8Naming
+    def setUp(self) -> None:
+        self.temporary_folder = TemporaryDirectory()
+        self.folder = Path(self.temporary_folder.name)
+        self.meta = ToolMetadata('jiig', jiig_config_root=self.folder)
+        # Avoid counting the configuration folder creation subprocess.
+        (self.folder / 'jiig').mkdir()
+
+    # noinspection PyPep8Naming
+    def tearDown(self) -> None:
+        self.temporary_folder.cleanup()
+
+    def _run(self, *arguments: str, options: ToolOptions = None) -> int:
+        try:
+            tool_main(
+                meta=self.meta,
+                task_tree=TaskTree(sub_tasks=[Task(name='spawn', impl=spawn, cli_options={'fail': ['--fail']})]),
+                script_path=self.folder / 'jiig',
+                build_folder=self.folder / 'build',
+                cli_args=list(arguments),
+                options=options,
+                skip_venv_preparation=True,
+            )
+        except SystemExit as exc:
+            return exc.code
+        return 0
+
+    def test_recording(self):
+        self.assertEqual(self._run('spawn'), 0)
+        self.assertEqual(self._run('spawn', '--fail'), 255)
+        records = HistoryStore(self.meta.history_folder).list_records()
+        self.assertEqual([(record.command, record.exit_status, record.subprocesses) for record in records],
+                         [('spawn', 255, 1), ('spawn', 0, 1)])
+        self.assertEqual(records[0].arguments, ['spawn', '--fail'])
+        segment_path = list(self.meta.history_folder.glob('*.jsonl'))[0]
+        with open(segment_path, encoding='utf-8') as segment_file:
+            self.assertEqual(len([json.loads(line) for line in segment_file]), 2)
+
+    def test_disabled(self):
+        self.assertEqual(self._run('spawn', options=ToolOptions(disable_history=True)), 0)
+        self.assertFalse(self.meta.history_folder.exists())
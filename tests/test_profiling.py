@@ -0,0 +1,61 @@
+# Copyright (C) 2023, Steven Cooper
+#
+# This file is part of Jiig.
+#
+# Jiig is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Jiig is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Jiig.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Phase profiler test suite."""
+
+import json
+import sys
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from jiig.util.profiling import PhaseProfiler
+
+
+class TestPhaseProfiler(unittest.TestCase):
+
+    def test_phases(self):
+        profiler = PhaseProfiler('test', profiled_phases=['two'])
+        with profiler.phase('one'):
+            sys.modules.pop('colorsys', None)
+            # noinspection PyUnresolvedReferences
+            import colorsys
+        with profiler.phase('two'):
+            sum(range(1000))
+        self.assertEqual([phase.name for phase in profiler.phases], ['one', 'two'])
+        self.assertEqual(profiler.phases[0].imports, 1)
+        self.assertEqual(profiler.phases[1].imports, 0)
+        self.assertLessEqual(profiler.phases[0].start, profiler.phases[1].start)
+        self.assertEqual(list(profiler.phase_stats.keys()), ['two'])
+        lines = profiler.format_report()
+        self.assertTrue(lines[0].startswith('test: '))
+        self.assertIn('cProfile: two', lines)
+
+    def test_json(self):
+        with TemporaryDirectory() as temporary_folder:
+            json_path = Path(temporary_folder) / 'profile.json'
+            profiler = PhaseProfiler('test', json_path=json_path)
+            with profiler.phase('one'):
+                pass
+            profiler.report()
+            self.assertFalse(json_path.exists())
+            profiler.enable()
+            profiler.report()
+            with open(json_path, encoding='utf-8') as json_file:
+                data = json.load(json_file)
+            self.assertEqual(data['name'], 'test')
+            self.assertEqual([phase['name'] for phase in data['phases']], ['one'])
@@ -0,0 +1,149 @@
+# Copyright (C) 2023, Steven Cooper
+#
+# This file is part of Jiig.
+#
+# Jiig is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Jiig is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Jiig.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Task result cache test suite."""
+
+import io
+import os
+import unittest
+from contextlib import redirect_stderr
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+import jiig
+from jiig.internal.task_cache import (
+    TaskCache,
+    get_input_paths,
+    get_input_signatures,
+    get_task_fingerprint,
+)
+from jiig.startup import tool_main
+from jiig.task import Task, TaskTree
+from jiig.types import ToolMetadata
+
+CALLS: list[str] = []
+
+
+@jiig.task(cache='{build_folder}/inputs', cache_outputs='{build_folder}/output.txt')
+def generate(
+    runtime: jiig.Runtime,
+    name: jiig.f.text(),
+):
+    """Generate output.
+
+    Args:
+        runtime: jiig Runtime API
+        name: name to write
+    """
+    CALLS.append(name)
+    with open(runtime.format('{build_folder}/output.txt'), 'w', encoding='utf-8') as output_file:
+        output_file.write(name)
+
+
+class TestTaskCache(unittest.TestCase):
+
+    # noinspection PyPep8Naming
+    def setUp(self) -> None:
+        CALLS.clear()
+        self.temporary_folder = TemporaryDirectory()
+        self.folder = Path(self.temporary_folder.name) / 'build'
+        (self.folder / 'inputs').mkdir(parents=True)
+        (self.folder / 'inputs' / 'a.txt').write_text('a')
+
+    # noinspection PyPep8Naming
+    def tearDown(self) -> None:
+        self.temporary_folder.cleanup()
+
+    def _run(self, *arguments: str) -> int:
+        try:
+            tool_main(
+                meta=ToolMetadata('jiig', jiig_config_root=self.folder.parent),
+                task_tree=TaskTree(sub_tasks=[Task(name='generate', impl=generate)]),
+                script_path=self.folder.parent / 'jiig',
+                build_folder=self.folder,
+                cli_args=list(arguments),
+                skip_venv_preparation=True,
+            )
+        except SystemExit as exc:
+            return exc.code
+        return 0
+
+    def test_task_caching(self):
+        self.assertEqual(self._run('generate', 'x'), 0)
+        self.assertEqual(self._run('generate', 'x'), 0)
+        self.assertEqual(CALLS, ['x'])
+        # Different arguments.
+        self.assertEqual(self._run('generate', 'y'), 0)
+        self.assertEqual(CALLS, ['x', 'y'])
+        # Changed input.
+        (self.folder / 'inputs' / 'b.txt').write_text('b')
+        self.assertEqual(self._run('generate', 'y'), 0)
+        self.assertEqual(CALLS, ['x', 'y', 'y'])
+        # Missing output.
+        (self.folder / 'output.txt').unlink()
+        self.assertEqual(self._run('generate', 'y'), 0)
+        self.assertEqual(CALLS, ['x', 'y', 'y', 'y'])
+        self.assertEqual(self._run('generate', 'y'), 0)
+        self.assertEqual(CALLS, ['x', 'y', 'y', 'y'])
+
+    def test_input_signatures(self):
+        input_folder = str(self.folder / 'inputs')
+        input_paths = get_input_paths([input_folder, str(self.folder / 'missing.txt')])
+        self.assertEqual(input_paths, [os.path.join(input_folder, 'a.txt'), str(self.folder / 'missing.txt')])
+        self.assertEqual(get_input_paths([os.path.join(input_folder, '**', '*.txt')]), input_paths[:1])
+        signatures = get_input_signatures(input_paths, hash_content=True)
+        self.assertIsNone(signatures[input_paths[1]])
+        fingerprint = get_task_fingerprint('task', {'name': 'x'}, signatures)
+        self.assertEqual(fingerprint, get_task_fingerprint('task', {'name': 'x'}, signatures))
+        # Touching a file only matters for modification time signatures.
+        os.utime(input_paths[0], ns=(0, 0))
+        self.assertEqual(get_input_signatures(input_paths, hash_content=True), signatures)
+        self.assertNotEqual(get_input_signatures(input_paths), get_input_signatures(input_paths[:1]))
+
+    def test_pruning(self):
+        task_cache = TaskCache(self.folder / 'cache', maximum_entries=3)
+        for entry_idx in range(5):
+            task_cache.record(f'fingerprint{entry_idx}', f'task{entry_idx % 2}', 'command', 0)
+            os.utime(self.folder / 'cache' / f'fingerprint{entry_idx}.json', (entry_idx, entry_idx))
+        # The least-recently-used entry is pruned each time the cap is exceeded.
+        self.assertEqual([entry.fingerprint for entry in task_cache.list_entries()],
+                         ['fingerprint4', 'fingerprint3', 'fingerprint2'])
+        self.assertTrue(task_cache.check('fingerprint2'))
+        self.assertFalse(task_cache.check('fingerprint0'))
+        self.assertEqual(task_cache.list_entries()[0].fingerprint, 'fingerprint2')
+        self.assertEqual(task_cache.prune(task_name='task0'), 2)
+        self.assertEqual(task_cache.prune(), 1)
+        self.assertEqual(task_cache.list_entries(), [])
+
+    def test_tracked_entry_count(self):
+        task_cache = TaskCache(self.folder / 'cache', maximum_entries=5)
+        with patch.object(TaskCache, '_count_entries', autospec=True,
+                          side_effect=TaskCache._count_entries) as count_entries:
+            for entry_idx in range(10):
+                task_cache.record(f'fingerprint{entry_idx % 8}', 'task', 'command', 0)
+            # Recording another TaskCache for the same folder uses the tracked count.
+            TaskCache(self.folder / 'cache', maximum_entries=5).record('fingerprint9', 'task', 'command', 0)
+        self.assertEqual(count_entries.call_count, 1)
+        self.assertEqual(len(task_cache.list_entries()), 5)
+
+    def test_fan_out_rejected(self):
+        def _fan_out(runtime: jiig.Runtime, names: jiig.f.text(repeat=(1, None))):
+            pass
+        with redirect_stderr(io.StringIO()) as stderr, self.assertRaises(SystemExit):
+            jiig.task(fan_out='names', cache=True)(_fan_out)
+        self.assertIn('caching is not supported for fan-out tasks', stderr.getvalue())
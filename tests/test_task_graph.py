@@ -0,0 +1,257 @@
+# Copyright (C) 2023, Steven Cooper
+#
+# This file is part of Jiig.
+#
+# Jiig is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Jiig is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Jiig.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Task dependency graph test suite."""
+
+import os
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import jiig
+from jiig.internal.task_graph import (
+    TaskGraphCycleError,
+    TaskGraphNode,
+    order_task_graph,
+    run_task_graph,
+)
+from jiig.startup import tool_main
+from jiig.task import Task, TaskTree
+from jiig.types import ToolMetadata
+from jiig.util.process import run
+
+CALLS: list[str] = []
+CALLS_LOCK = threading.Lock()
+LOCATIONS: dict[str, str] = {}
+
+
+def _record_call(name: str):
+    with CALLS_LOCK:
+        CALLS.append(name)
+
+
+@jiig.task
+def prepare(
+    runtime: jiig.Runtime,
+    label: jiig.f.text(),
+):
+    """Prepare.
+
+    Args:
+        runtime: jiig Runtime API
+        label: preparation label
+    """
+    _record_call(f'prepare:{label}')
+
+
+@jiig.task(depends=['prepare shared'])
+def left(
+    runtime: jiig.Runtime,
+):
+    """Left branch.
+
+    Args:
+        runtime: jiig Runtime API
+    """
+    time.sleep(0.2)
+    _record_call('left')
+
+
+@jiig.task(depends=[['prepare', 'shared']])
+async def right(
+    runtime: jiig.Runtime,
+):
+    """Right branch.
+
+    Args:
+        runtime: jiig Runtime API
+    """
+    await runtime.run_async(['sleep', '0.2'])
+    _record_call('right')
+
+
+@jiig.task(depends=['left', 'right', 'prepare other'])
+def top(
+    runtime: jiig.Runtime,
+):
+    """Top task.
+
+    Args:
+        runtime: jiig Runtime API
+    """
+    _record_call('top')
+
+
+@jiig.task(depends=['cycle2'])
+def cycle1(
+    runtime: jiig.Runtime,
+):
+    """Cycle 1.
+
+    Args:
+        runtime: jiig Runtime API
+    """
+
+
+@jiig.task(depends=['cycle1'])
+def cycle2(
+    runtime: jiig.Runtime,
+):
+    """Cycle 2.
+
+    Args:
+        runtime: jiig Runtime API
+    """
+
+
+@jiig.task
+def locate(
+    runtime: jiig.Runtime,
+    change: jiig.f.boolean(),
+    folder: jiig.f.text(),
+):
+    """Record the folder that a command runs in.
+
+    Args:
+        runtime: jiig Runtime API
+        change: change the working folder instead of passing it to run()
+        folder: folder to run the command in
+    """
+    if change:
+        runtime.working_folder(folder)
+    # Both commands are running when the folders are checked.
+    proc = run(['sh', '-c', 'sleep 0.1; pwd -P'], working_folder=folder, capture=True)
+    LOCATIONS[folder] = proc.stdout.strip()
+
+
+@jiig.task(depends=['locate a', 'locate b'])
+def locations(
+    runtime: jiig.Runtime,
+):
+    """Locate in folders a and b.
+
+    Args:
+        runtime: jiig Runtime API
+    """
+
+
+@jiig.task(depends=['locate -c a', 'locate -c b'])
+def relocations(
+    runtime: jiig.Runtime,
+):
+    """Locate in folders a and b by changing the working folder.
+
+    Args:
+        runtime: jiig Runtime API
+    """
+
+
+def _run(*arguments: str) -> int:
+    with TemporaryDirectory() as temporary_folder:
+        folder = Path(temporary_folder)
+        try:
+            tool_main(
+                meta=ToolMetadata('jiig', jiig_config_root=folder),
+                task_tree=TaskTree(sub_tasks=[Task(name='prepare', impl=prepare),
+                                              Task(name='left', impl=left),
+                                              Task(name='right', impl=right),
+                                              Task(name='top', impl=top),
+                                              Task(name='cycle1', impl=cycle1),
+                                              Task(name='cycle2', impl=cycle2),
+                                              Task(name='locate', impl=locate,
+                                                   cli_options={'change': ['-c']}),
+                                              Task(name='locations', impl=locations),
+                                              Task(name='relocations', impl=relocations)]),
+                script_path=folder / 'jiig',
+                build_folder=folder / 'build',
+                cli_args=list(arguments),
+                skip_venv_preparation=True,
+            )
+        except SystemExit as exc:
+            return exc.code
+    return 0
+
+
+class TestTaskGraph(unittest.TestCase):
+
+    def test_order(self):
+        nodes = {
+            'c': TaskGraphNode('c', ['a', 'b'], lambda: None),
+            'b': TaskGraphNode('b', ['a'], lambda: None),
+            'a': TaskGraphNode('a', [], lambda: None),
+        }
+        self.assertEqual(order_task_graph(nodes), ['a', 'b', 'c'])
+        nodes['a'].dependencies.append('c')
+        with self.assertRaises(TaskGraphCycleError) as context:
+            order_task_graph(nodes)
+        self.assertEqual(context.exception.cycle, ['c', 'a', 'c'])
+
+    def test_failure(self):
+        def _fail():
+            raise ValueError('failed')
+        nodes = {
+            'a': TaskGraphNode('a', [], _fail),
+            'b': TaskGraphNode('b', ['a'], lambda: 'b'),
+            'c': TaskGraphNode('c', [], lambda: 'c'),
+        }
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            results = {result.key: result for result in run_task_graph(nodes, executor.submit)}
+        self.assertIsInstance(results['a'].exception, ValueError)
+        self.assertFalse(results['b'].started)
+        self.assertIsNone(results['b'].value)
+
+
+class TestTaskDependencies(unittest.TestCase):
+
+    # noinspection PyPep8Naming
+    def setUp(self) -> None:
+        CALLS.clear()
+        LOCATIONS.clear()
+
+    def test_dependencies(self):
+        start_time = time.perf_counter()
+        self.assertEqual(_run('top'), 0)
+        # Independent branches run concurrently.
+        self.assertLess(time.perf_counter() - start_time, 0.35)
+        self.assertEqual(CALLS.count('prepare:shared'), 1)
+        self.assertEqual(CALLS[-1], 'top')
+        self.assertLess(CALLS.index('prepare:shared'), CALLS.index('left'))
+        self.assertLess(CALLS.index('prepare:shared'), CALLS.index('right'))
+        self.assertEqual(sorted(CALLS), ['left', 'prepare:other', 'prepare:shared', 'right', 'top'])
+
+    def test_cycle(self):
+        self.assertNotEqual(_run('cycle1'), 0)
+
+    def test_working_folders(self):
+        working_folder = os.getcwd()
+        with TemporaryDirectory() as temporary_folder:
+            base_folder = os.path.realpath(temporary_folder)
+            for name in ('a', 'b'):
+                os.mkdir(os.path.join(base_folder, name))
+            # The dependencies use folders relative to the base folder.
+            os.chdir(base_folder)
+            try:
+                self.assertEqual(_run('locations'), 0)
+                self.assertEqual(LOCATIONS, {name: os.path.join(base_folder, name) for name in ('a', 'b')})
+                # Changing the shared working folder is rejected.
+                self.assertNotEqual(_run('relocations'), 0)
+                self.assertEqual(os.getcwd(), base_folder)
+            finally:
+                os.chdir(working_folder)
@@ -0,0 +1,155 @@
+# Copyright (C) 2023, Steven Cooper
+#
+# This file is part of Jiig.
+#
+# Jiig is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Jiig is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Jiig.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Task manifest test suite."""
+
+import json
+import os
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import jiig.util.log
+from jiig.adapters import to_bool, to_int
+from jiig.internal.initialization.task_manifest import (
+    get_loaded_source_paths,
+    get_task_tree_signature,
+    load_task_manifest,
+    save_task_manifest,
+)
+from jiig.task import RuntimeTask, Task, TaskGroup, TaskTree
+from jiig.tasks import help as help_module
+from jiig.types import TaskField
+from jiig.util.default import DefaultValue
+from jiig.util.repetition import Repetition
+
+
+def _make_root_task(adapter=to_int) -> RuntimeTask:
+    fields = [
+        TaskField('all_tasks', 'all tasks', bool, bool, None, None, None, [to_bool]),
+        TaskField('count', 'count', float | int, list[int], DefaultValue(3),
+                  Repetition(1, None), [1, 2, 3], [adapter]),
+    ]
+    help_task = RuntimeTask.new_task(
+        name='help',
+        full_name='group.help',
+        description='help task',
+        task_function=help_module.help_,
+        module=help_module,
+        fields=fields,
+        visibility=1,
+        notes=['note'],
+        footnotes={'x': 'footnote'},
+        hints={'cli_options': {'all_tasks': ['-a']}},
+    )
+    group = RuntimeTask.new_group(
+        name='group',
+        full_name='group',
+        description='group',
+        visibility=0,
+        sub_tasks=[help_task],
+        notes=[],
+        footnotes={},
+        hints={},
+    )
+    return RuntimeTask.new_tree(
+        description='root',
+        sub_tasks=[group],
+        notes=[],
+        footnotes={},
+        hints={},
+    )
+
+
+class TestTaskManifest(unittest.TestCase):
+
+    # noinspection PyPep8Naming
+    def setUp(self) -> None:
+        self.temporary_folder = TemporaryDirectory()
+        self.folder = Path(self.temporary_folder.name)
+        self.manifest_path = self.folder / 'tasks_manifest.json'
+        self.source_path = self.folder / 'source.py'
+        self.source_path.write_text('# source\n')
+
+    # noinspection PyPep8Naming
+    def tearDown(self) -> None:
+        self.temporary_folder.cleanup()
+
+    def test_signature(self):
+        tree1 = TaskTree(sub_tasks=[Task(name='a'), TaskGroup(name='b', sub_tasks=[])])
+        tree2 = TaskTree(sub_tasks=[Task(name='a'), TaskGroup(name='b', sub_tasks=[])])
+        tree3 = TaskTree(sub_tasks=[Task(name='a', cli_options={'x': ['-x']})])
+        self.assertEqual(get_task_tree_signature(tree1, 'p'), get_task_tree_signature(tree2, 'p'))
+        self.assertNotEqual(get_task_tree_signature(tree1, 'p'), get_task_tree_signature(tree3, 'p'))
+        self.assertNotEqual(get_task_tree_signature(tree1, 'p'), get_task_tree_signature(tree1, 'q'))
+
+    def test_round_trip(self):
+        root_task = _make_root_task()
+        save_task_manifest(self.manifest_path, 'sig', root_task, [str(self.source_path)])
+        loaded_root_task = load_task_manifest(self.manifest_path, 'sig')
+        self.assertIsNotNone(loaded_root_task)
+        loaded_task = loaded_root_task.sub_tasks[0].sub_tasks[0]
+        original_task = root_task.sub_tasks[0].sub_tasks[0]
+        self.assertEqual(loaded_task.full_name, 'group.help')
+        self.assertTrue(loaded_task.is_resolved('description', 'fields', 'notes', 'footnotes'))
+        self.assertFalse(loaded_task.is_resolved('task_function'))
+        self.assertEqual(loaded_task.fields, original_task.fields)
+        self.assertEqual(loaded_task.driver_hints, original_task.driver_hints)
+        self.assertIs(loaded_task.task_function, help_module.help_)
+        self.assertTrue(loaded_task.is_resolved())
+
+    def test_invalidation(self):
+        save_task_manifest(self.manifest_path, 'sig', _make_root_task(), [str(self.source_path)])
+        self.assertIsNone(load_task_manifest(self.manifest_path, 'other'))
+        self.assertIsNotNone(load_task_manifest(self.manifest_path, 'sig'))
+        stat_result = os.stat(self.source_path)
+        os.utime(self.source_path, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 1000))
+        self.assertIsNone(load_task_manifest(self.manifest_path, 'sig'))
+        self.source_path.unlink()
+        self.assertIsNone(load_task_manifest(self.manifest_path, 'sig'))
+
+    def test_unsupported_data(self):
+        def _closure_adapter(value):
+            return value
+        save_task_manifest(self.manifest_path,
+                           'sig',
+                           _make_root_task(adapter=_closure_adapter),
+                           [str(self.source_path)])
+        self.assertFalse(self.manifest_path.exists())
+
+    def test_unresolvable_task_function(self):
+        save_task_manifest(self.manifest_path, 'sig', _make_root_task(), [str(self.source_path)])
+        manifest_data = json.loads(self.manifest_path.read_text())
+        manifest_data['root']['sub_tasks'][0]['sub_tasks'][0]['function'] = 'moved_module:help_'
+        self.manifest_path.write_text(json.dumps(manifest_data))
+        rebuilt_root_tasks: list[RuntimeTask] = []
+
+        def _rebuild() -> RuntimeTask:
+            rebuilt_root_tasks.append(_make_root_task())
+            return rebuilt_root_tasks[-1]
+
+        loaded_root_task = load_task_manifest(self.manifest_path, 'sig', rebuild=_rebuild)
+        self.assertIsNotNone(loaded_root_task)
+        loaded_task = loaded_root_task.sub_tasks[0].sub_tasks[0]
+        self.assertIs(loaded_task.task_function, help_module.help_)
+        self.assertEqual(len(rebuilt_root_tasks), 1)
+        self.assertFalse(self.manifest_path.exists())
+
+    def test_loaded_source_paths(self):
+        source_paths = get_loaded_source_paths(Path(jiig.util.log.__file__).parent)
+        self.assertIn(os.path.realpath(jiig.util.log.__file__), source_paths)
+        self.assertNotIn(os.path.realpath(json.__file__), source_paths)
@@ -0,0 +1,68 @@
+# Copyright (C) 2023, Steven Cooper
+#
+# This file is part of Jiig.
+#
+# Jiig is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Jiig is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Jiig.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Tool test suite."""
+
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+from jiig.task import TaskTree
+from jiig.tool import Tool
+from jiig.types import ToolMetadata, ToolOptions, ToolPaths
+from jiig.util.options import OPTIONS
+
+
+def _make_tool() -> Tool:
+    folder = Path('/tmp/tool')
+    return Tool(
+        meta=ToolMetadata('tool'),
+        task_tree=TaskTree(sub_tasks=[]),
+        paths=ToolPaths(venv=folder / 'venv',
+                        base_folder=folder,
+                        aliases_catalog_path=folder / 'aliases.json',
+                        params_catalog_path=folder / 'params.json',
+                        build=folder / 'build',
+                        doc=folder / 'doc',
+                        test=folder / 'test'),
+        options=ToolOptions(enable_jobs=True),
+    )
+
+
+def _make_runtime_data(jobs: object) -> SimpleNamespace:
+    return SimpleNamespace(DEBUG=False, DRY_RUN=False, VERBOSE=False, JOBS=jobs, TRACE=None)
+
+
+class TestToolOptions(unittest.TestCase):
+
+    # noinspection PyPep8Naming
+    def tearDown(self) -> None:
+        OPTIONS.set_jobs(None)
+
+    def test_jobs(self):
+        _make_tool().apply_options(_make_runtime_data('3'))
+        self.assertEqual(OPTIONS.jobs, 3)
+
+    def test_no_jobs(self):
+        _make_tool().apply_options(_make_runtime_data(None))
+        self.assertIsNone(OPTIONS.jobs)
+
+    def test_bad_jobs(self):
+        for jobs in ('0', '-1', 'x', '2.5', ''):
+            with self.assertRaises(SystemExit):
+                _make_tool().apply_options(_make_runtime_data(jobs))
+        self.assertIsNone(OPTIONS.jobs)
@@ -0,0 +1,127 @@
+# Copyright (C) 2023, Steven Cooper
+#
+# This file is part of Jiig.
+#
+# Jiig is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Jiig is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Jiig.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Tracing test suite."""
+
+import asyncio
+import json
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import jiig
+from jiig.startup import tool_main
+from jiig.task import Task, TaskTree
+from jiig.types import ToolMetadata
+from jiig.util.filesystem import copy_file
+from jiig.util.options import OPTIONS
+from jiig.util.process import run
+from jiig.util.tracing import get_trace_recorder, start_tracing, stop_tracing, trace_span
+
+
+@jiig.task
+def work(
+    runtime: jiig.Runtime,
+    folder: jiig.f.text(),
+):
+    """Do traced work.
+
+    Args:
+        runtime: jiig Runtime API
+        folder: work folder
+    """
+    Path(folder, 'source.txt').write_text('12345')
+    copy_file(Path(folder, 'source.txt'), Path(folder, 'target.txt'), quiet=True)
+    run(['true'])
+
+
+class TestTracing(unittest.TestCase):
+
+    # noinspection PyPep8Naming
+    def tearDown(self) -> None:
+        stop_tracing()
+        OPTIONS.set_trace_path(None)
+
+    def test_spans(self):
+        with trace_span('inactive', 'test') as span_args:
+            span_args['value'] = 1
+        self.assertIsNone(get_trace_recorder())
+        recorder = start_tracing()
+        with trace_span('outer', 'test', label='x') as span_args:
+            span_args['value'] = 2
+            with self.assertRaises(ValueError):
+                with trace_span('inner', 'test'):
+                    raise ValueError('inner')
+        self.assertIs(stop_tracing(), recorder)
+        events = recorder.to_json_data()['traceEvents']
+        self.assertEqual(events[0]['ph'], 'M')
+        spans = {event['name']: event for event in events if event['ph'] == 'X'}
+        self.assertEqual(spans['outer']['args'], {'label': 'x', 'value': 2})
+        self.assertEqual(spans['inner']['args'], {'error': 'ValueError'})
+        self.assertGreaterEqual(spans['outer']['dur'], spans['inner']['dur'])
+
+    def test_trace_option(self):
+        with TemporaryDirectory() as temporary_folder:
+            folder = Path(temporary_folder)
+            trace_path = folder / 'trace.json'
+            try:
+                tool_main(
+                    meta=ToolMetadata('jiig', jiig_config_root=folder),
+                    task_tree=TaskTree(sub_tasks=[Task(name='work', impl=work)]),
+                    script_path=folder / 'jiig',
+                    build_folder=folder / 'build',
+                    cli_args=['--trace', str(trace_path), 'work', str(folder)],
+                    skip_venv_preparation=True,
+                )
+            except SystemExit as exc:
+                self.assertEqual(exc.code, 0)
+            with open(trace_path, encoding='utf-8') as trace_file:
+                events = json.load(trace_file)['traceEvents']
+        spans = {event['name']: event for event in events if event['ph'] == 'X'}
+        self.assertEqual(spans['run true']['args']['exit_code'], 0)
+        self.assertEqual(spans['copy_file']['args']['bytes'], 5)
+        self.assertEqual(spans['work']['cat'], 'task')
+        self.assertEqual(spans['execution']['cat'], 'startup')
+        self.assertLessEqual(spans['execution']['ts'], spans['work']['ts'])
+
+    def test_async_tracks(self):
+        recorder = start_tracing()
+
+        async def _work(name: str):
+            with trace_span(name, 'test'):
+                await asyncio.sleep(0.02)
+                with trace_span(f'{name}.inner', 'test'):
+                    await asyncio.sleep(0.02)
+
+        async def _main():
+            with trace_span('main', 'test'):
+                await asyncio.gather(_work('a'), _work('b'))
+
+        asyncio.run(_main())
+        with trace_span('sync', 'test'):
+            pass
+        events = {event['name']: event for event in recorder.to_json_data()['traceEvents']
+                  if event['ph'] == 'X'}
+        # Overlapping task spans are on separate tracks, and nested spans are
+        # on the same track as their parent.
+        self.assertNotEqual(events['a']['tid'], events['b']['tid'])
+        self.assertNotEqual(events['a']['tid'], events['main']['tid'])
+        self.assertEqual(events['a.inner']['tid'], events['a']['tid'])
+        self.assertEqual(events['b.inner']['tid'], events['b']['tid'])
+        thread_names = {event['tid']: event['args']['name'] for event in recorder.to_json_data()['traceEvents']
+                        if event['ph'] == 'M'}
+        self.assertEqual(set(thread_names), {event['tid'] for event in events.values()})
@@ -0,0 +1,110 @@
+# Copyright (C) 2023, Steven Cooper
+#
+# This file is part of Jiig.
+#
+# Jiig is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Jiig is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Jiig.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Virtual environment utility test suite."""
+
+import os
+import sys
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from jiig.util import python
+from jiig.util.python import (
+    activate_virtual_environment,
+    check_virtual_environment_stamp,
+    install_missing_pip_packages,
+)
+
+
+class TestVirtualEnvironmentStamp(unittest.TestCase):
+
+    # noinspection PyPep8Naming
+    def setUp(self) -> None:
+        self.temporary_folder = TemporaryDirectory()
+        self.venv_folder = Path(self.temporary_folder.name)
+        (self.venv_folder / 'bin').mkdir()
+        os.symlink(sys.executable, self.venv_folder / 'bin' / 'python')
+        self.site_packages = self.venv_folder / 'lib' / 'python3.99' / 'site-packages'
+        self.site_packages.mkdir(parents=True)
+        (self.site_packages / 'foo-1.0.dist-info').mkdir()
+
+    # noinspection PyPep8Naming
+    def tearDown(self) -> None:
+        self.temporary_folder.cleanup()
+
+    def _install(self, packages: list[str]) -> int:
+        # Returns the number of installed package scans.
+        with patch.object(python,
+                          'virtual_environment_installed_packages',
+                          wraps=python.virtual_environment_installed_packages) as scan:
+            install_missing_pip_packages(packages, venv_folder=self.venv_folder)
+        return scan.call_count
+
+    def test_stamp(self):
+        self.assertFalse(check_virtual_environment_stamp(self.venv_folder, ['foo']))
+        self.assertEqual(self._install(['foo']), 1)
+        self.assertTrue(check_virtual_environment_stamp(self.venv_folder, ['foo']))
+        self.assertEqual(self._install(['foo']), 0)
+        self.assertFalse(check_virtual_environment_stamp(self.venv_folder, ['foo', 'bar']))
+
+    def test_site_packages_change(self):
+        self._install(['foo'])
+        stat_result = os.stat(self.site_packages)
+        os.utime(self.site_packages, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 1000))
+        self.assertFalse(check_virtual_environment_stamp(self.venv_folder, ['foo']))
+        self.assertEqual(self._install(['foo']), 1)
+        self.assertTrue(check_virtual_environment_stamp(self.venv_folder, ['foo']))
+
+
+class TestVirtualEnvironmentActivation(unittest.TestCase):
+
+    def test_version_mismatch(self):
+        with TemporaryDirectory() as temporary_folder:
+            venv_folder = Path(temporary_folder)
+            (venv_folder / 'pyvenv.cfg').write_text('version = 2.7.18\n')
+            saved_state = (sys.prefix, sys.executable, list(sys.path))
+            self.assertFalse(activate_virtual_environment(venv_folder))
+            self.assertEqual((sys.prefix, sys.executable, sys.path), saved_state)
+
+    def test_missing_configuration(self):
+        with TemporaryDirectory() as temporary_folder:
+            self.assertFalse(activate_virtual_environment(temporary_folder))
+
+    def test_activation(self):
+        with TemporaryDirectory() as temporary_folder:
+            venv_folder = Path(temporary_folder)
+            python_version = '.'.join(str(part) for part in sys.version_info[:3])
+            (venv_folder / 'pyvenv.cfg').write_text(f'version = {python_version}\n'
+                                                    f'include-system-site-packages = true\n')
+            site_packages = venv_folder / 'lib' / f'python{sys.version_info[0]}.{sys.version_info[1]}' / 'site-packages'
+            site_packages.mkdir(parents=True)
+            system_site_packages = os.path.join(temporary_folder, 'system-site-packages')
+            saved_state = (sys.prefix, sys.exec_prefix, sys.executable, list(sys.path), dict(os.environ))
+            try:
+                sys.path.append(system_site_packages)
+                with patch.object(python.site, 'getsitepackages', return_value=[system_site_packages]):
+                    self.assertTrue(activate_virtual_environment(venv_folder))
+                self.assertEqual(sys.prefix, str(venv_folder))
+                self.assertEqual(os.environ['VIRTUAL_ENV'], str(venv_folder))
+                self.assertLess(sys.path.index(str(site_packages)), sys.path.index(system_site_packages))
+                self.assertEqual(sys.path.count(str(site_packages)), 1)
+            finally:
+                sys.prefix, sys.exec_prefix, sys.executable, sys.path[:], environment = saved_state
+                os.environ.clear()
+                os.environ.update(environment)
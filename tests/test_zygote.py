@@ -0,0 +1,208 @@
+# Copyright (C) 2023, Steven Cooper
+#
+# This file is part of Jiig.
+#
+# Jiig is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Jiig is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Jiig.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Zygote server test suite."""
+
+import json
+import os
+import signal
+import socket
+import struct
+import subprocess
+import sys
+import time
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from jiig.internal import zygote
+
+CLIENT_PATH = Path(__file__).parent.parent / 'bin' / 'jiigclient'
+
+
+def _get_open_fds() -> set[int]:
+    return set(int(name) for name in os.listdir('/proc/self/fd'))
+
+
+def _wait_for_process_exit(pid: int, timeout: float = 5.0) -> bool:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return True
+        time.sleep(0.05)
+    return False
+
+
+class TestZygote(unittest.TestCase):
+
+    def test_socket_path(self):
+        path1 = zygote.get_zygote_socket_path(Path('/config'), '/a/b/tool')
+        path2 = zygote.get_zygote_socket_path(Path('/config'), '/a/b/../b/tool')
+        path3 = zygote.get_zygote_socket_path(Path('/config'), '/a/b/other')
+        self.assertEqual(path1, path2)
+        self.assertNotEqual(path1, path3)
+        self.assertEqual(path1.parent, Path('/config/zygote'))
+
+    def test_request(self):
+        server_socket, client_socket = socket.socketpair(socket.AF_UNIX, socket.SOCK_STREAM)
+        read_fd, write_fd = os.pipe()
+        try:
+            message = {'argv': ['tool', 'a'], 'cwd': '/tmp', 'env': {'X': 'y' * 50000}}
+            data = json.dumps(message).encode()
+            data = struct.pack('!I', len(data)) + data
+            sent = socket.send_fds(client_socket, [data], [read_fd, write_fd, write_fd])
+            client_socket.sendall(data[sent:])
+            # noinspection PyProtectedMember
+            request = zygote._receive_request(server_socket)
+            self.assertIsNotNone(request)
+            self.assertEqual(request.argv, ['tool', 'a'])
+            self.assertEqual(request.cwd, '/tmp')
+            self.assertEqual(request.env, message['env'])
+            self.assertEqual(len(request.fds), 3)
+            os.write(request.fds[1], b'x')
+            self.assertEqual(os.read(read_fd, 1), b'x')
+            # noinspection PyProtectedMember
+            zygote._close_fds(request.fds)
+        finally:
+            for fd in (read_fd, write_fd):
+                os.close(fd)
+            server_socket.close()
+            client_socket.close()
+
+    @unittest.skipUnless(os.path.isdir('/proc/self/fd'), 'requires /proc/self/fd')
+    def test_bad_request(self):
+        server_socket, client_socket = socket.socketpair(socket.AF_UNIX, socket.SOCK_STREAM)
+        read_fd, write_fd = os.pipe()
+        try:
+            open_fds = _get_open_fds()
+            data = b'not json'
+            socket.send_fds(client_socket, [struct.pack('!I', len(data)) + data], [read_fd, write_fd, write_fd])
+            # noinspection PyProtectedMember
+            self.assertIsNone(zygote._receive_request(server_socket))
+            self.assertEqual(_get_open_fds(), open_fds)
+        finally:
+            for fd in (read_fd, write_fd):
+                os.close(fd)
+            server_socket.close()
+            client_socket.close()
+
+
+class TestZygoteServer(unittest.TestCase):
+
+    # noinspection PyPep8Naming
+    def setUp(self) -> None:
+        self.temporary_folder = TemporaryDirectory()
+        self.folder = Path(self.temporary_folder.name)
+        self.source_path = self.folder / 'task.py'
+        self.source_path.write_text('pass')
+        self.socket_path = zygote.get_zygote_socket_path(self.folder, self.folder / 'tool')
+        self.server_pid = os.fork()
+        if self.server_pid == 0:
+            try:
+                zygote.serve_zygote(self.socket_path,
+                                    [str(self.source_path)],
+                                    lambda _cli_args: None,
+                                    idle_timeout=10)
+            finally:
+                os._exit(0)
+        while not self.socket_path.exists():
+            time.sleep(0.01)
+
+    # noinspection PyPep8Naming
+    def tearDown(self) -> None:
+        os.kill(self.server_pid, signal.SIGTERM)
+        os.waitpid(self.server_pid, 0)
+        self.temporary_folder.cleanup()
+
+    def test_permissions(self):
+        self.assertEqual(self.socket_path.parent.stat().st_mode & 0o777, 0o700)
+        self.assertEqual(self.socket_path.stat().st_mode & 0o777, 0o600)
+
+    def test_deleted_source(self):
+        self.source_path.unlink()
+        client_socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            client_socket.connect(str(self.socket_path))
+            data = json.dumps({'argv': ['tool'], 'cwd': '/', 'env': {}}).encode()
+            socket.send_fds(client_socket, [struct.pack('!I', len(data)) + data], [0, 1, 2])
+            reply = client_socket.makefile('rb').read()
+        finally:
+            client_socket.close()
+        self.assertEqual(json.loads(reply[4:]), {'stale': True})
+        # A stale server exits and removes its socket.
+        deadline = time.time() + 5
+        while self.socket_path.exists() and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertFalse(self.socket_path.exists())
+
+
+class TestZygoteClient(unittest.TestCase):
+
+    # noinspection PyPep8Naming
+    def setUp(self) -> None:
+        self.temporary_folder = TemporaryDirectory()
+        self.folder = Path(self.temporary_folder.name)
+        self.script_path = self.folder / 'tool'
+        self.script_path.touch()
+        self.pid_path = self.folder / 'pid'
+        socket_path = zygote.get_zygote_socket_path(self.folder, self.script_path)
+        self.server_pid = os.fork()
+        if self.server_pid == 0:
+            try:
+                zygote.serve_zygote(socket_path, [], self._run_request, idle_timeout=10)
+            finally:
+                os._exit(0)
+        while not socket_path.exists():
+            time.sleep(0.01)
+
+    # noinspection PyPep8Naming
+    def tearDown(self) -> None:
+        os.kill(self.server_pid, signal.SIGTERM)
+        os.waitpid(self.server_pid, 0)
+        self.temporary_folder.cleanup()
+
+    def _run_request(self, cli_args: list[str]):
+        self.pid_path.write_text(str(os.getpid()))
+        time.sleep(float(cli_args[0]))
+
+    def _start_client(self, duration: float) -> tuple[subprocess.Popen, int]:
+        # Returns the client process and the forked child pid.
+        client = subprocess.Popen([sys.executable, str(CLIENT_PATH), str(self.script_path), str(duration)],
+                                  env={**os.environ, 'JIIG_CONFIG_ROOT': str(self.folder)})
+        while not self.pid_path.exists() or not self.pid_path.read_text():
+            time.sleep(0.01)
+        # Give the client time to receive the pid and install signal handlers.
+        time.sleep(0.2)
+        return client, int(self.pid_path.read_text())
+
+    def test_exit_code(self):
+        client, _pid = self._start_client(0)
+        self.assertEqual(client.wait(timeout=5), 0)
+
+    def test_forwarded_signal(self):
+        client, pid = self._start_client(30)
+        client.send_signal(signal.SIGTERM)
+        self.assertEqual(client.wait(timeout=5), 128 + signal.SIGTERM)
+        self.assertTrue(_wait_for_process_exit(pid))
+
+    def test_dropped_connection(self):
+        client, pid = self._start_client(30)
+        client.kill()
+        client.wait(timeout=5)
+        self.assertTrue(_wait_for_process_exit(pid))